@@ -0,0 +1,243 @@
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from QtModels.ParameterListModel import issue_data
+
+
+# 数据组中数据项的列表操作，撤销与重做的 Insert、Remove 命令通过它修改数据项
+class _GroupItems:
+    def __init__(self, model, group):
+        self._model = model
+        self._group = group
+
+    def __len__(self):
+        return len(self._group.data)
+
+    def __getitem__(self, row):
+        return self._group.data[row]
+
+    def insert(self, row, item):
+        self._model.insert_item(self._group, row, item)
+
+    def append(self, item):
+        self.insert(len(self._group.data), item)
+
+    def __delitem__(self, row):
+        self.pop(row)
+
+    def pop(self, row):
+        return self._model.pop_item(self._group, row)
+
+
+# 响应数据的树模型：第一层为数据组，第二层为数据项。
+# 数据组的数据项在首次展开或选择时才加入模型，增删改时只通知受影响的行。
+# 数据组的索引不带指针，数据项的索引以所属数据组为指针
+class DataGroupTreeModel(QAbstractItemModel):
+    def __init__(self, issues_for=None, parent=None):
+        super().__init__(parent)
+        self._groups = []
+        # 返回节点的验证问题；数据项的问题记录在所属数据组上
+        self._issues_for = issues_for or (lambda node: [])
+        # 数据项已加入模型的数据组：id -> 数据组
+        self._fetched = {}
+        # 数据组所在行的缓存，数据组增删后重建
+        self._rows = None
+
+    def set_groups(self, groups):
+        # 打开、新建文件时替换全部数据组
+        self.beginResetModel()
+        self._groups = groups
+        self._fetched = {}
+        self._rows = None
+        self.endResetModel()
+
+    # 以下列表操作修改数据组并通知视图，撤销与重做的 Insert、Remove 命令也通过它们修改
+    def __len__(self):
+        return len(self._groups)
+
+    def __getitem__(self, row):
+        return self._groups[row]
+
+    def insert(self, row, group):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._groups.insert(row, group)
+        self._rows = None
+        self.endInsertRows()
+        self._renumber(QModelIndex(), row + 1, len(self._groups))
+
+    def append(self, group):
+        self.insert(len(self._groups), group)
+
+    def __delitem__(self, row):
+        self.pop(row)
+
+    def pop(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        group = self._groups.pop(row)
+        self._fetched.pop(id(group), None)
+        self._rows = None
+        self.endRemoveRows()
+        self._renumber(QModelIndex(), row, len(self._groups))
+        return group
+
+    def items_of(self, group):
+        return _GroupItems(self, group)
+
+    def insert_item(self, group, row, item):
+        if not self._is_fetched(group):
+            group.data.insert(row, item)
+            return
+        parent = self.group_index(group)
+        self.beginInsertRows(parent, row, row)
+        group.data.insert(row, item)
+        self.endInsertRows()
+        self._renumber(parent, row + 1, len(group.data))
+
+    def pop_item(self, group, row):
+        if not self._is_fetched(group):
+            return group.data.pop(row)
+        parent = self.group_index(group)
+        self.beginRemoveRows(parent, row, row)
+        item = group.data.pop(row)
+        self.endRemoveRows()
+        self._renumber(parent, row, len(group.data))
+        return item
+
+    def row_of(self, group) -> int:
+        if self._rows is None:
+            self._rows = {id(node): row for row, node in enumerate(self._groups)}
+        row = self._rows.get(id(group), -1)
+        return row if row >= 0 and self._groups[row] is group else -1
+
+    def group_index(self, group):
+        row = self.row_of(group)
+        return self.createIndex(row, 0) if row >= 0 else QModelIndex()
+
+    def item_index(self, group, row):
+        parent = self.group_index(group)
+        if parent.isValid() and self.canFetchMore(parent):
+            self.fetchMore(parent)
+        return self.index(row, 0, parent)
+
+    @staticmethod
+    def group_row(index) -> int:
+        """index 为数据组时返回其行号，为数据项时返回 -1"""
+        return index.row() if index.isValid() and index.internalPointer() is None else -1
+
+    def refresh_group(self, group):
+        """数据组或其中的数据项被修改、验证结果变化后重新绘制"""
+        parent = self.group_index(group)
+        if not parent.isValid():
+            return
+        self.dataChanged.emit(parent, parent)
+        if self._is_fetched(group) and group.data:
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(len(group.data) - 1, 0, parent))
+
+    def refresh_nodes(self, groups):
+        """重新绘制 groups；打开文件后全部数据组的验证结果一起到达时只通知一次数据组的范围"""
+        if len(groups) == 1:
+            self.refresh_group(groups[0])
+            return
+        rows = sorted(row for row in map(self.row_of, groups) if row >= 0)
+        if not rows:
+            return
+        self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]))
+        for row in rows:
+            group = self._groups[row]
+            if self._fetched.get(id(group)) is group and group.data:
+                parent = self.index(row)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(len(group.data) - 1, 0, parent))
+
+    def refresh_item(self, group, row):
+        if self._is_fetched(group):
+            index = self.index(row, 0, self.group_index(group))
+            self.dataChanged.emit(index, index)
+
+    # QAbstractItemModel
+    def index(self, row, column=0, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, 0) if row < len(self._groups) else QModelIndex()
+        if parent.internalPointer() is not None:
+            return QModelIndex()
+        group = self._groups[parent.row()]
+        if not self._is_fetched(group) or row >= len(group.data):
+            return QModelIndex()
+        return self.createIndex(row, 0, group)
+
+    def parent(self, index=None):
+        if index is None:
+            # QObject.parent()
+            return super().parent()
+        group = index.internalPointer() if index.isValid() else None
+        if group is None:
+            return QModelIndex()
+        return self.group_index(group)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._groups)
+        if parent.internalPointer() is not None:
+            return 0
+        group = self._groups[parent.row()]
+        return len(group.data) if self._is_fetched(group) else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._groups)
+        if parent.internalPointer() is not None:
+            return False
+        return bool(self._groups[parent.row()].data)
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.internalPointer() is not None:
+            return False
+        return not self._is_fetched(self._groups[parent.row()])
+
+    def fetchMore(self, parent):
+        group = self._groups[parent.row()]
+        if self._is_fetched(group):
+            return
+        self.beginInsertRows(parent, 0, len(group.data) - 1)
+        self._fetched[id(group)] = group
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        group = index.internalPointer()
+        if group is None:
+            if row >= len(self._groups):
+                return None
+            group = self._groups[row]
+            if role == Qt.DisplayRole:
+                return f"{row + 1}. {group.friendly_name}"
+            return issue_data(self._issues_for(group), role)
+        if row >= len(group.data):
+            return None
+        if role == Qt.DisplayRole:
+            return f"{row + 1}. {group.data[row].friendly_name}"
+        if role not in (Qt.DecorationRole, Qt.ForegroundRole, Qt.ToolTipRole):
+            return None
+        # 数据项的问题按位置前缀区分
+        prefix = f"/data/{row}/"
+        return issue_data([issue for issue in self._issues_for(group) if issue.pointer.startswith(prefix)], role)
+
+    def _is_fetched(self, group) -> bool:
+        # 空的数据组不需要读取，之后添加的数据项直接通知视图
+        if self._fetched.get(id(group)) is group:
+            return True
+        if not group.data:
+            self._fetched[id(group)] = group
+            return True
+        return False
+
+    def _renumber(self, parent, first, count):
+        # 显示的序号从 first 开始变化
+        if first < count:
+            self.dataChanged.emit(self.index(first, 0, parent), self.index(count - 1, 0, parent),
+                                  [Qt.DisplayRole])
@@ -0,0 +1,103 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QStyle
+
+from apicore import ERROR
+
+
+def issue_data(issues, role):
+    # 根据验证问题返回列表项的图标、颜色和提示
+    if not issues:
+        return None
+    has_error = any(issue.severity == ERROR for issue in issues)
+    if role == Qt.DecorationRole:
+        icon = QStyle.SP_MessageBoxCritical if has_error else QStyle.SP_MessageBoxWarning
+        return QApplication.style().standardIcon(icon)
+    if role == Qt.ForegroundRole:
+        return QColor("#c0392b") if has_error else QColor("#d68910")
+    if role == Qt.ToolTipRole:
+        return "\n".join(issue.message for issue in issues)
+    return None
+
+
+# 参数列表的模型：直接引用编辑器的参数列表，增删改时只通知受影响的行，视图只绘制可见的行
+class ParameterListModel(QAbstractListModel):
+    def __init__(self, issues_for=None, parent=None):
+        super().__init__(parent)
+        self._parameters = []
+        # 返回节点的验证问题，用于图标、颜色与提示
+        self._issues_for = issues_for or (lambda node: [])
+
+    def set_parameters(self, parameters):
+        # 打开、新建文件时替换整个列表
+        self.beginResetModel()
+        self._parameters = parameters
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._parameters)
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        if not index.isValid() or row >= len(self._parameters):
+            return None
+        param = self._parameters[row]
+        if role == Qt.DisplayRole:
+            return f"{row + 1}. {param.friendly_name} ({param.type})"
+        if role not in (Qt.DecorationRole, Qt.ForegroundRole, Qt.ToolTipRole):
+            return None
+        return issue_data(self._issues_for(param), role)
+
+    # 以下列表操作修改参数并通知视图，撤销与重做的 Insert、Remove 命令也通过它们修改
+    def __len__(self):
+        return len(self._parameters)
+
+    def __getitem__(self, row):
+        return self._parameters[row]
+
+    def insert(self, row, param):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._parameters.insert(row, param)
+        self.endInsertRows()
+        self._renumber(row + 1)
+
+    def append(self, param):
+        self.insert(len(self._parameters), param)
+
+    def __delitem__(self, row):
+        self.pop(row)
+
+    def pop(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        param = self._parameters.pop(row)
+        self.endRemoveRows()
+        self._renumber(row)
+        return param
+
+    def row_of(self, param) -> int:
+        # 模型对象未定义 __eq__，按对象身份查找
+        for row, node in enumerate(self._parameters):
+            if node is param:
+                return row
+        return -1
+
+    def refresh(self, row):
+        """参数被修改或验证结果变化后重新绘制该行"""
+        if 0 <= row < len(self._parameters):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def refresh_nodes(self, params):
+        """重新绘制 params 所在的行；打开文件后全部参数的验证结果一起到达时只遍历一次列表"""
+        if len(params) == 1:
+            self.refresh(self.row_of(params[0]))
+            return
+        ids = {id(param) for param in params}
+        rows = [row for row, node in enumerate(self._parameters) if id(node) in ids]
+        if rows:
+            self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]))
+
+    def _renumber(self, first):
+        # 显示的序号从 first 开始变化
+        if first < len(self._parameters):
+            self.dataChanged.emit(self.index(first), self.index(len(self._parameters) - 1), [Qt.DisplayRole])
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from apicore import serialize
+from apicore.io import write_atomic
+
+
+# 在后台线程中序列化并原子地写入配置文件
+# 写入期间对同一文件的多次保存请求合并为最后一次，只写入最新的内容
+class ConfigSaver(QThread):
+    # 路径, 调用方的标记, 用时(秒), 被合并的请求数
+    saved = pyqtSignal(str, object, float, int)
+    # 路径, 调用方的标记, 错误信息
+    save_failed = pyqtSignal(str, object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        # 路径 -> (配置字典, 标记, 请求时间, 被合并的请求数)
+        self._pending = {}
+        self._active = False
+        # 最近一次写入失败的文件及错误信息
+        self.errors = {}
+
+    def save(self, data, path, token=None):
+        """提交保存请求；data 为 Config.to_dict() 的结果，提交后调用方不应再修改"""
+        with self._lock:
+            previous = self._pending.pop(path, None)
+            coalesced = previous[3] + 1 if previous is not None else 0
+            # 合并时保留最早的请求时间，完成时报告的用时包含等待
+            requested = previous[2] if previous is not None else time.perf_counter()
+            self._pending[path] = (data, token, requested, coalesced)
+            start = not self._active
+            self._active = True
+        if start:
+            # 上一轮可能刚取完请求、尚未退出
+            self.wait()
+            self.start()
+
+    def flush(self, path=None) -> bool:
+        """等待全部保存完成，返回 path（为 None 时为全部文件）是否保存成功"""
+        self.wait()
+        return path not in self.errors if path is not None else not self.errors
+
+    def _take(self):
+        with self._lock:
+            if not self._pending:
+                self._active = False
+                return None
+            path = next(iter(self._pending))
+            return (path,) + self._pending.pop(path)
+
+    def run(self):
+        while True:
+            request = self._take()
+            if request is None:
+                return
+            path, data, token, requested, coalesced = request
+            try:
+                write_atomic(path, serialize.dumps(data))
+            except Exception as e:
+                self.errors[path] = str(e)
+                self.save_failed.emit(path, token, str(e))
+                continue
+            self.errors.pop(path, None)
+            self.saved.emit(path, token, time.perf_counter() - requested, coalesced)
@@ -0,0 +1,134 @@
+import os
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from apicore.dirindex import DirectoryIndex, inspect_all, scan
+
+
+# 启动时在线程池中扫描整个目录
+class _ScanTask(QRunnable):
+    def __init__(self, root, pattern, generation, signals):
+        super().__init__()
+        self.root = root
+        self.pattern = pattern
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        paths, directories = scan(self.root, self.pattern)
+        self.signals.inspected.emit(self.generation, inspect_all((path, None) for path in paths), directories)
+
+
+# 在线程池中检查发生变化的文件
+class _InspectTask(QRunnable):
+    def __init__(self, candidates, generation, signals):
+        super().__init__()
+        self.candidates = candidates
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        self.signals.inspected.emit(self.generation, inspect_all(self.candidates), [])
+
+
+class _TaskSignals(QObject):
+    inspected = pyqtSignal(int, list, list)
+
+
+# 目录监视器：启动时扫描一次，之后合并一段时间内的文件系统通知，只检查变化的目录与文件
+class DirectoryWatcher(QObject):
+    # 启动时的扫描完成
+    scanned = pyqtSignal()
+    # 参数为内容、验证结果有变化或被删除的文件路径
+    updated = pyqtSignal(list)
+
+    def __init__(self, root, parent=None, delay_ms=200):
+        super().__init__(parent)
+        self.index = DirectoryIndex(root)
+        # 完成启动时的扫描之前 index 为空
+        self.ready = False
+        self._generation = 0
+        self._running = False
+        self._pending_directories = set()
+        self._pending_files = set()
+        self._signals = _TaskSignals()
+        self._signals.inspected.connect(self._on_inspected)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        # 防抖定时器，批量复制、解压或保存时连续的通知只处理一次
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    @property
+    def root(self):
+        return self.index.root
+
+    @property
+    def unwatched(self) -> int:
+        """超出系统监视数量上限、无法监视修改的文件数"""
+        return len(self.index.files) - len(self._watcher.files())
+
+    def start(self):
+        self._running = True
+        task = _ScanTask(self.index.root, self.index.pattern, self._generation, self._signals)
+        QThreadPool.globalInstance().start(task)
+
+    def stop(self):
+        # 丢弃正在进行的检查结果
+        self._generation += 1
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _on_directory_changed(self, directory):
+        self._pending_directories.add(directory)
+        self._timer.start()
+
+    def _on_file_changed(self, path):
+        self._pending_files.add(path)
+        self._timer.start()
+
+    def _start(self):
+        if self._running or not self.ready or not (self._pending_directories or self._pending_files):
+            return
+        candidates = self.index.candidates(self._pending_directories, self._pending_files)
+        self._pending_directories.clear()
+        self._pending_files.clear()
+        if not candidates:
+            self._update_watches()
+            return
+        self._running = True
+        task = _InspectTask(candidates, self._generation, self._signals)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_inspected(self, generation, results, directories):
+        self._running = False
+        if generation != self._generation:
+            return
+        changed = self.index.apply(results, directories)
+        self._update_watches()
+        # 检查期间又有新的通知
+        if self._pending_directories or self._pending_files:
+            self._timer.start()
+        if not self.ready:
+            self.ready = True
+            self.scanned.emit()
+        elif changed:
+            self.updated.emit(changed)
+
+    def _update_watches(self):
+        # 改名替换保存的文件会从监视中移除，文件重新出现后再次添加
+        watched = set(self._watcher.directories()) | set(self._watcher.files())
+        wanted = self.index.directories | set(self.index.files)
+        removed = list(watched - wanted)
+        if removed:
+            self._watcher.removePaths(removed)
+        added = [path for path in wanted - watched if os.path.exists(path)]
+        if added:
+            self._watcher.addPaths(added)
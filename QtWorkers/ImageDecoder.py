@@ -0,0 +1,42 @@
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from apicore.imagedata import decode_file_thumbnail, decode_thumbnail
+
+
+# 在后台线程中解码二进制或 base64 图像响应，只生成缩略图，界面线程不会持有完整图像
+class ImageDecoder(QThread):
+    image_ready = pyqtSignal(str, QImage, str)
+    decode_complete = pyqtSignal(int, float)
+
+    def __init__(self, sources, thumbnail_size=96):
+        super().__init__()
+        # [(名称, 文件路径或 base64 字符串, 是否 base64, 是否文件路径)]，见 sample_image_sources
+        self.sources = list(sources)
+        self.thumbnail_size = thumbnail_size
+
+    @staticmethod
+    def to_qimage(image):
+        image = image.convert("RGBA")
+        data = image.tobytes("raw", "RGBA")
+        # QImage 不复制 data，copy() 之后才能脱离 data 的生命周期
+        return QImage(data, image.width, image.height, image.width * 4, QImage.Format_RGBA8888).copy()
+
+    def run(self):
+        start = time.perf_counter()
+        decoded = 0
+        for name, source, is_base64, is_file in self.sources:
+            if self.isInterruptionRequested():
+                break
+            try:
+                if is_file:
+                    image, size = decode_file_thumbnail(source, is_base64, self.thumbnail_size)
+                else:
+                    image, size = decode_thumbnail(source, is_base64, self.thumbnail_size)
+                self.image_ready.emit(name, self.to_qimage(image), f"{size[0]}x{size[1]}")
+                decoded += 1
+            except Exception as e:
+                self.image_ready.emit(name, QImage(), str(e))
+        self.decode_complete.emit(decoded, time.perf_counter() - start)
@@ -0,0 +1,45 @@
+import asyncio
+
+from PyQt5.QtCore import QSize, Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+from apicore.fetch import DEFAULT_CACHE_DIR, fetch_images
+
+
+# 在后台线程中并发下载样例响应引用的图像，每完成一张就发出缩略图
+class ImageFetcher(QThread):
+    image_ready = pyqtSignal(object, QImage)
+    fetch_complete = pyqtSignal(object)
+    fetch_error = pyqtSignal(str)
+
+    def __init__(self, urls, thumbnail_size=96, cache_dir=DEFAULT_CACHE_DIR, workers=8, per_host=4):
+        super().__init__()
+        self.urls = list(urls)
+        self.thumbnail_size = thumbnail_size
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.per_host = per_host
+
+    def load_thumbnail(self, path):
+        # 解码时直接缩小（JPEG 等格式只解码所需的分辨率），界面线程只需转换为 QPixmap
+        reader = QImageReader(path)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > self.thumbnail_size:
+            reader.setScaledSize(size.scaled(QSize(self.thumbnail_size, self.thumbnail_size), Qt.KeepAspectRatio))
+        return reader.read()
+
+    def emit_thumbnail(self, result):
+        image = self.load_thumbnail(result.path) if result.ok else QImage()
+        self.image_ready.emit(result, image)
+
+    def on_result(self, result):
+        # 缩略图在线程池中解码，不阻塞其余下载
+        asyncio.get_running_loop().run_in_executor(None, self.emit_thumbnail, result)
+
+    def run(self):
+        try:
+            report = asyncio.run(fetch_images(self.urls, self.cache_dir, self.workers, self.per_host,
+                                              on_result=self.on_result))
+            self.fetch_complete.emit(report)
+        except Exception as e:
+            self.fetch_error.emit(str(e))
@@ -0,0 +1,79 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from apicore.live import IncrementalValidator, check_nodes
+
+
+# 在线程池中验证一批脏节点
+class _CheckTask(QRunnable):
+    def __init__(self, nodes, generation, signals):
+        super().__init__()
+        self.nodes = nodes
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        self.signals.checked.emit(self.generation, check_nodes(self.nodes))
+
+
+class _TaskSignals(QObject):
+    checked = pyqtSignal(int, list)
+
+
+# 实时验证器：编辑时标记脏节点，停顿片刻后只在后台重新验证这些节点
+class LiveValidator(QObject):
+    # 参数为结果有变化的 (类型, 节点) 列表
+    updated = pyqtSignal(list)
+
+    def __init__(self, parent=None, delay_ms=300):
+        super().__init__(parent)
+        self.state = IncrementalValidator()
+        self._generation = 0
+        self._running = False
+        self._signals = _TaskSignals()
+        self._signals.checked.connect(self._on_checked)
+
+        # 防抖定时器，连续编辑时只在最后一次编辑后验证
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    @property
+    def error_count(self):
+        return self.state.error_count
+
+    @property
+    def warning_count(self):
+        return self.state.warning_count
+
+    def issues_for(self, node):
+        return self.state.issues_for(node)
+
+    def reset(self):
+        # 丢弃正在进行的验证结果
+        self._generation += 1
+        self.state.reset()
+
+    def mark_dirty(self, kind, node):
+        self.state.mark_dirty(kind, node)
+        self._timer.start()
+
+    def forget(self, node):
+        self.state.forget(node)
+        self._timer.start()
+
+    def _start(self):
+        if self._running or not self.state.has_dirty():
+            return
+        self._running = True
+        task = _CheckTask(self.state.take_dirty(), self._generation, self._signals)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_checked(self, generation, results):
+        self._running = False
+        changed = self.state.apply(results) if generation == self._generation else []
+        # 验证期间又有新的编辑
+        if self.state.has_dirty():
+            self._timer.start()
+        if generation == self._generation:
+            self.updated.emit(changed)
@@ -0,0 +1,30 @@
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from apicore.simulate import run_samples
+
+
+# 在后台线程中从样例响应提取数据，避免大文件阻塞界面
+class SampleExtractor(QThread):
+    extraction_complete = pyqtSignal(list, list, float)
+    extraction_error = pyqtSignal(str)
+
+    def __init__(self, config, samples, cache):
+        super().__init__()
+        self.config = config
+        self.samples = list(samples)
+        self.cache = cache
+
+    def run(self):
+        # 一一对应检查使用 numpy，导入较慢，在后台线程中首次测试时才导入
+        from apicore.alignment import check_samples
+
+        try:
+            start = time.perf_counter()
+            results = run_samples(self.config, self.samples, self.cache)
+            # 提取结果已在缓存中，一一对应检查不会再次读取样例
+            alignment = check_samples(self.config, self.samples, self.cache)
+            self.extraction_complete.emit(results, alignment, time.perf_counter() - start)
+        except Exception as e:
+            self.extraction_error.emit(str(e))
@@ -0,0 +1,27 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from apicore.workspace import WorkspaceError, WorkspaceIndex
+
+
+# 在后台线程中增量地重新索引工作区目录，数据库连接只在本线程中使用
+class WorkspaceIndexer(QThread):
+    # 目录, IndexStats
+    indexed = pyqtSignal(str, object)
+    # 目录, 错误信息
+    index_failed = pyqtSignal(str, str)
+
+    # paths 为 None 时遍历整个目录，否则只处理其中的文件
+    def __init__(self, index_path, root, paths=None, parent=None):
+        super().__init__(parent)
+        self.index_path = index_path
+        self.root = root
+        self.paths = paths
+
+    def run(self):
+        try:
+            with WorkspaceIndex(self.index_path) as index:
+                stats = index.update(self.root, paths=self.paths)
+        except (OSError, WorkspaceError) as e:
+            self.index_failed.emit(self.root, str(e))
+            return
+        self.indexed.emit(self.root, stats)
@@ -0,0 +1,22 @@
+"""APICORE 配置文件核心库
+
+不依赖 Qt，可在构建流水线等无界面环境中加载、验证与保存配置文件。
+"""
+
+from .model import (
+    APICORE_VERSIONS, CONTENT_TYPES, HTTP_METHODS, ITEM_TYPES, PARAM_TYPES,
+    Config, DataGroup, DataItem, ImageSpec, Parameter,
+)
+from .io import dump, dumps, load, loads
+from .jsonpath import CompiledPath, PathSyntaxError, compile as compile_path
+from .paths import get_config_dir
+from .validate import ERROR, WARNING, Issue, ValidationError, check, validate
+
+__all__ = [
+    "APICORE_VERSIONS", "CONTENT_TYPES", "HTTP_METHODS", "ITEM_TYPES", "PARAM_TYPES",
+    "Config", "DataGroup", "DataItem", "ImageSpec", "Parameter",
+    "dump", "dumps", "load", "loads",
+    "CompiledPath", "PathSyntaxError", "compile_path",
+    "get_config_dir",
+    "ERROR", "WARNING", "Issue", "ValidationError", "check", "validate",
+]
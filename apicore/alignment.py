@@ -0,0 +1,155 @@
+"""一一对应检查
+
+勾选了 one-to-one-mapping 的列表数据项（如 data.image.data、.h、.w）应与图像列表逐元素对应。
+检查时先用样例响应求出图像列表和一个数据组内全部需要对应的列表，再把它们的“有值”位置
+排成一个布尔矩阵，与图像列表的那一行整体比较：长度不同或空值位置不同的下标一次性找出，
+十万元素的列表也不需要逐个元素在 Python 中比较。
+"""
+
+import numpy as np
+
+from .jsonpath import PathSyntaxError, compile as compile_path
+from .simulate import SampleCache, select_image_values, select_item_values
+
+# 每个数据项最多报告的不对应下标数
+MAX_REPORTED_INDICES = 20
+
+
+class AlignmentResult:
+    """一个一一对应数据项的检查结果"""
+
+    __slots__ = ("sample", "group", "name", "path", "image_length", "length", "mismatched", "error")
+
+    def __init__(self, sample, group, name, path, image_length, length, mismatched, error=""):
+        self.sample = sample
+        self.group = group
+        self.name = name
+        self.path = path
+        self.image_length = image_length
+        self.length = length
+        # 不对应的下标（numpy 整数数组）：一方有值而另一方缺失或为 null
+        self.mismatched = mismatched
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and len(self.mismatched) == 0
+
+    def message(self, limit=MAX_REPORTED_INDICES) -> str:
+        if self.error:
+            return self.error
+        if self.ok:
+            return f"与图像列表一一对应（{self.length} 项）"
+        parts = []
+        if self.length != self.image_length:
+            parts.append(f"长度 {self.length} 与图像数量 {self.image_length} 不同")
+        indices = ", ".join(str(i) for i in self.mismatched[:limit].tolist())
+        if len(self.mismatched) > limit:
+            indices += f" …（共 {len(self.mismatched)} 个）"
+        parts.append(f"不对应的下标: {indices}")
+        return "；".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "sample": self.sample,
+            "group": self.group,
+            "name": self.name,
+            "path": self.path,
+            "image_length": self.image_length,
+            "length": self.length,
+            "mismatched": self.mismatched.tolist(),
+            "error": self.error,
+        }
+
+
+def presence(values) -> np.ndarray:
+    """返回每个位置是否有值（不是 null）的布尔数组"""
+    array = np.empty(len(values), dtype=object)
+    # 逐元素赋值，避免嵌套列表被 numpy 展开成多维数组
+    array[:] = values
+    return np.not_equal(array, None).astype(bool, copy=False)
+
+
+def compare(image_values, lists) -> list:
+    """比较多个列表与图像列表的有值位置，返回每个列表不对应的下标数组"""
+    if not lists:
+        return []
+    width = max(len(image_values), max(len(values) for values in lists))
+    # 第 0 行为图像列表，超出各自长度的位置视为缺失
+    mask = np.zeros((len(lists) + 1, width), dtype=bool)
+    for row, values in enumerate([image_values] + list(lists)):
+        mask[row, :len(values)] = presence(values)
+    rows, columns = np.nonzero(mask[1:] != mask[0])
+    # np.nonzero 按行排序，按每行的数量切分即可得到各列表的下标
+    counts = np.bincount(rows, minlength=len(lists))
+    return np.split(columns, np.cumsum(counts)[:-1])
+
+
+def mapped_items(config) -> list:
+    """返回 (数据组, 数据项) 列表，只包含需要与图像一一对应的列表数据项"""
+    return [(group, item) for group in config.others for item in group.data
+            if item.one_to_one_mapping and item.type == "list"]
+
+
+def check_sample(config, sample, cache=None) -> list:
+    """用单个样例文件检查配置中全部一一对应数据项"""
+    cache = cache if cache is not None else SampleCache()
+    targets = mapped_items(config)
+    if not targets:
+        return []
+    spec = config.image
+    if not spec.is_list:
+        return [AlignmentResult(sample, group.friendly_name, item.friendly_name, item.path, 0, 0,
+                                np.empty(0, dtype=np.intp), "图像不是列表，无法一一对应")
+                for group, item in targets]
+
+    expressions = []
+    errors = {}
+    for expression in [spec.path] + [item.path for _, item in targets]:
+        if not expression:
+            errors[expression] = "未设置路径"
+            continue
+        try:
+            compile_path(expression)
+            expressions.append(expression)
+        except PathSyntaxError as e:
+            errors[expression] = str(e)
+    found = cache.matches_many(sample, list(dict.fromkeys(expressions)))
+
+    if spec.path in errors:
+        return [AlignmentResult(sample, group.friendly_name, item.friendly_name, item.path, 0, 0,
+                                np.empty(0, dtype=np.intp), f"图像路径无效: {errors[spec.path]}")
+                for group, item in targets]
+    image_values = select_image_values(spec, found[spec.path])
+
+    results = []
+    # 同一数据组的列表放在一个矩阵中比较
+    groups = {}
+    for group, item in targets:
+        groups.setdefault(id(group), (group, []))[1].append(item)
+    for group, items in groups.values():
+        valid = [item for item in items if item.path not in errors]
+        values = [select_item_values(item, found[item.path]) for item in valid]
+        mismatched = dict(zip(map(id, valid), compare(image_values, values)))
+        lengths = dict(zip(map(id, valid), map(len, values)))
+        for item in items:
+            if item.path in errors:
+                results.append(AlignmentResult(sample, group.friendly_name, item.friendly_name, item.path,
+                                               len(image_values), 0, np.empty(0, dtype=np.intp),
+                                               errors[item.path]))
+            else:
+                results.append(AlignmentResult(sample, group.friendly_name, item.friendly_name, item.path,
+                                               len(image_values), lengths[id(item)], mismatched[id(item)]))
+    return results
+
+
+def check_samples(config, samples, cache=None) -> list:
+    """用多个样例文件检查一一对应，无法读取的文件跳过（提取结果中已记录错误）"""
+    cache = cache if cache is not None else SampleCache()
+    results = []
+    for sample in samples:
+        try:
+            results.extend(check_sample(config, sample, cache))
+        except (OSError, ValueError):
+            continue
+    return results
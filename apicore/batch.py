@@ -0,0 +1,150 @@
+"""批量验证目录中的 APICORE 配置文件
+
+使用进程池并行验证，并输出 JSON 与 JUnit XML 格式的报告。
+"""
+
+import fnmatch
+import json
+import os
+import time
+
+from . import serialize
+from .model import Config
+from .validate import ERROR, check
+
+DEFAULT_PATTERN = "*.api.json"
+
+
+class FileResult:
+    """单个文件的验证结果，status 为 passed、failed 或 error"""
+
+    __slots__ = ("path", "status", "message", "seconds", "issues")
+
+    def __init__(self, path, status, message="", seconds=0.0, issues=()):
+        self.path = path
+        self.status = status
+        self.message = message
+        self.seconds = seconds
+        self.issues = list(issues)
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "status": self.status,
+            "message": self.message,
+            "seconds": round(self.seconds, 6),
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+def find_config_files(root, pattern=DEFAULT_PATTERN) -> list:
+    """递归查找目录中匹配 pattern 的文件，按路径排序"""
+    files = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names.sort()
+        for name in fnmatch.filter(file_names, pattern):
+            files.append(os.path.join(dir_path, name))
+    files.sort()
+    return files
+
+
+def validate_file(path) -> FileResult:
+    start = time.perf_counter()
+    issues = []
+    try:
+        with open(path, "rb") as f:
+            config = Config.from_dict(serialize.loads(f.read()))
+        issues = check(config)
+        found = [issue for issue in issues if issue.severity == ERROR]
+        if found:
+            status, message = "failed", "\n".join(str(issue) for issue in found)
+        else:
+            status, message = "passed", ""
+    except Exception as e:
+        status, message = "error", f"{type(e).__name__}: {e}"
+    return FileResult(path, status, message, time.perf_counter() - start, issues)
+
+
+def _validate_chunk(paths) -> list:
+    # 在子进程中验证一批文件，减少进程间通信次数
+    return [validate_file(path) for path in paths]
+
+
+def validate_files(paths, jobs=None) -> list:
+    """并行验证文件列表，返回与输入顺序一致的 FileResult 列表"""
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        return _validate_chunk(paths)
+
+    # 每个进程分到若干批，既能均衡负载又不会让调度开销压过验证本身
+    chunk_size = max(1, min(256, len(paths) // (jobs * 8)))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    # 导入 multiprocessing 较慢，只在需要进程池时导入；编辑器启动时只用到本模块的文件查找
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        for chunk_results in executor.map(_validate_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+class BatchReport:
+    """一次批量验证的汇总"""
+
+    def __init__(self, root, results, seconds):
+        self.root = root
+        self.results = results
+        self.seconds = seconds
+
+    def count(self, status) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status == "passed" for r in self.results)
+
+    def to_dict(self) -> dict:
+        return {
+            "root": self.root,
+            "total": len(self.results),
+            "passed": self.count("passed"),
+            "failed": self.count("failed"),
+            "errors": self.count("error"),
+            "seconds": round(self.seconds, 6),
+            "files": [r.to_dict() for r in self.results],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_junit_xml(self) -> str:
+        from xml.etree import ElementTree
+
+        suite = ElementTree.Element("testsuite", {
+            "name": "apicore.validate",
+            "tests": str(len(self.results)),
+            "failures": str(self.count("failed")),
+            "errors": str(self.count("error")),
+            "time": f"{self.seconds:.6f}",
+        })
+        for result in self.results:
+            rel_path = os.path.relpath(result.path, self.root)
+            case = ElementTree.SubElement(suite, "testcase", {
+                "classname": os.path.dirname(rel_path).replace(os.sep, ".") or ".",
+                "name": os.path.basename(rel_path),
+                "time": f"{result.seconds:.6f}",
+            })
+            if result.status == "failed":
+                first_line = result.message.split("\n", 1)[0]
+                ElementTree.SubElement(case, "failure", {"message": first_line}).text = result.message
+            elif result.status == "error":
+                ElementTree.SubElement(case, "error", {"message": result.message}).text = result.message
+        return ElementTree.tostring(suite, encoding="unicode")
+
+
+def validate_directory(root, pattern=DEFAULT_PATTERN, jobs=None) -> BatchReport:
+    start = time.perf_counter()
+    results = validate_files(find_config_files(root, pattern), jobs)
+    return BatchReport(root, results, time.perf_counter() - start)
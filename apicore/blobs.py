@@ -0,0 +1,125 @@
+"""大字段的内容寻址存储
+
+配置中的 icon 通常是完整的 data:image/...;base64,... 字符串，可能有数百 KB。编辑器把这类值
+按内容的 sha256 保存在 BlobStore 中，内容相同的图标只保留一份；表单只显示缩略图与大小、摘要，
+保存时才把字符串放回配置。content_key 按对象缓存摘要，同一个字符串对象只计算一次。
+
+    store = BlobStore()
+    icon = store.put(config.icon)      # 内容相同时返回已保存的同一个对象
+    info = describe(icon)
+"""
+
+import base64
+import binascii
+import hashlib
+import mimetypes
+import re
+
+# 不超过该长度且不是 data URI 的值（例如图标地址）直接在文本框中编辑
+INLINE_LIMIT = 2048
+
+_DATA_URI = re.compile(r"data:([^,;]*)((?:;[^,;]*)*?)(;base64)?,", re.IGNORECASE)
+_KEY_CACHE_SIZE = 64
+# id(字符串) -> (字符串, 摘要)；保留字符串引用以保证 id 不被复用
+_keys = {}
+
+
+def content_key(text) -> str:
+    """字符串内容的 sha256"""
+    entry = _keys.get(id(text))
+    if entry is not None and entry[0] is text:
+        return entry[1]
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if len(_keys) >= _KEY_CACHE_SIZE:
+        _keys.clear()
+    _keys[id(text)] = (text, key)
+    return key
+
+
+def is_data_uri(text) -> bool:
+    return text[:5].lower() == "data:"
+
+
+def is_inline(text) -> bool:
+    """值是否适合直接显示在单行文本框中"""
+    return len(text) <= INLINE_LIMIT and not is_data_uri(text)
+
+
+def encode_data_uri(data, mime_type) -> str:
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def guess_mime_type(path) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def decode_data_uri(text):
+    """返回 (MIME 类型, 数据)；不是 data URI 或无法解码时返回 None"""
+    match = _DATA_URI.match(text)
+    if match is None:
+        return None
+    payload = text[match.end():]
+    try:
+        if match.group(3):
+            data = binascii.a2b_base64(payload)
+        else:
+            data = payload.encode("utf-8")
+    except (binascii.Error, ValueError):
+        return None
+    return match.group(1) or "text/plain", data
+
+
+class BlobInfo:
+    """表单中显示的大字段摘要"""
+
+    __slots__ = ("key", "length", "mime_type", "data_size")
+
+    def __init__(self, key, length, mime_type="", data_size=0):
+        self.key = key
+        self.length = length
+        self.mime_type = mime_type
+        self.data_size = data_size
+
+    def describe(self) -> str:
+        if self.mime_type:
+            return f"{self.mime_type}，{self.data_size / 1024:.1f} KB，sha256 {self.key[:12]}"
+        return f"{self.length} 个字符，sha256 {self.key[:12]}"
+
+
+def describe(text) -> BlobInfo:
+    """只解析 data URI 的头部，不解码数据"""
+    key = content_key(text)
+    match = _DATA_URI.match(text)
+    if match is None:
+        return BlobInfo(key, len(text))
+    payload = len(text) - match.end()
+    # base64 每 4 个字符对应 3 字节
+    size = payload * 3 // 4 - text.endswith("=") - text.endswith("==") if match.group(3) else payload
+    return BlobInfo(key, len(text), match.group(1) or "text/plain", size)
+
+
+class BlobStore:
+    """按内容去重保存字符串"""
+
+    def __init__(self):
+        self._blobs = {}
+
+    def put(self, text) -> str:
+        """保存 text，返回内容相同的已保存对象"""
+        if not text:
+            return ""
+        return self._blobs.setdefault(content_key(text), text)
+
+    def get(self, key, default=None):
+        return self._blobs.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._blobs
+
+    def __len__(self):
+        return len(self._blobs)
+
+    @property
+    def size(self) -> int:
+        """已保存内容的总字符数"""
+        return sum(len(text) for text in self._blobs.values())
@@ -0,0 +1,159 @@
+"""APICORE 命令行工具
+
+用法: python -m apicore validate [DIR] [--json PATH] [--junit PATH] [--jobs N]
+      python -m apicore loadtest CONFIG [--sample RESPONSE] [--requests N] [--concurrency N] [--json PATH]
+      python -m apicore stub RESPONSE [--port PORT] [--delay SECONDS]
+      python -m apicore importtime [MODULE] [--top N] [--repeat N] [--budget-ms MS] [--json PATH]
+"""
+
+import argparse
+import sys
+
+from .paths import get_config_dir
+
+
+def _write_report(text, path):
+    if path == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def cmd_validate(args) -> int:
+    from .batch import validate_directory
+
+    root = args.directory or get_config_dir()
+    if not root:
+        print("未指定目录，且找不到默认的 EnterPoint 配置目录", file=sys.stderr)
+        return 2
+
+    report = validate_directory(root, args.pattern, args.jobs)
+    if args.json:
+        _write_report(report.to_json(), args.json)
+    if args.junit:
+        _write_report(report.to_junit_xml(), args.junit)
+
+    if args.json != "-" and args.junit != "-":
+        for result in report.results:
+            if result.status != "passed":
+                print(f"{result.status.upper()}: {result.path}")
+                for line in result.message.splitlines():
+                    print(f"    {line}")
+        print(f"共 {len(report.results)} 个文件，通过 {report.count('passed')}，"
+              f"失败 {report.count('failed')}，错误 {report.count('error')}，"
+              f"耗时 {report.seconds:.3f}s")
+    return 0 if report.ok else 1
+
+
+def cmd_loadtest(args) -> int:
+    from .io import load
+    from .loadtest import LoadTestError, run_load_test
+
+    try:
+        report = run_load_test(load(args.config), args.requests, args.concurrency, args.timeout,
+                               args.base_url, args.sample, args.delay, args.seed)
+    except (OSError, ValueError, LoadTestError) as e:
+        print(f"压力测试失败: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        _write_report(report.to_json(), args.json)
+
+    if args.json != "-":
+        data = report.to_dict()
+        latency = data["latency_ms"]
+        print(f"目标: {data['target']}  并发: {data['concurrency']}  连接: {data['connections_opened']}")
+        print(f"完成 {data['completed']}/{data['total']}，失败 {data['failed']}，"
+              f"耗时 {data['seconds']:.3f}s，吞吐量 {data['throughput']:.1f} 请求/秒")
+        print(f"延迟 p50 {latency['p50']:.2f} ms  p95 {latency['p95']:.2f} ms  p99 {latency['p99']:.2f} ms")
+        for bucket in data["histogram_ms"]:
+            if bucket["count"]:
+                label = f"<= {bucket['le']} ms" if bucket["le"] is not None else "更慢"
+                print(f"    {label:>12}  {bucket['count']}")
+        for kind, count in data["errors"].items():
+            print(f"    错误 {kind}: {count}")
+    return 0 if not report.errors else 1
+
+
+def cmd_stub(args) -> int:
+    from .stub import run_stub
+
+    run_stub(args.sample, args.host, args.port, args.delay)
+    return 0
+
+
+def cmd_importtime(args) -> int:
+    from .importtime import ImportTimeError, profile
+
+    try:
+        report = profile(args.module, args.repeat)
+    except (OSError, ImportTimeError) as e:
+        print(f"导入 {args.module} 失败: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        _write_report(report.to_json(args.top, args.sort), args.json)
+
+    over_budget = args.budget_ms is not None and report.total_ms > args.budget_ms
+    if args.json != "-":
+        print(f"{'累计 ms':>10} {'自身 ms':>10}  模块")
+        for entry in report.slowest(args.top, args.sort):
+            print(f"{entry.cumulative_ms:>10.1f} {entry.self_ms:>10.1f}  {'  ' * entry.depth}{entry.name}")
+        print(f"导入 {report.module} 共 {report.total_ms:.1f} ms（{len(report.entries)} 个模块）")
+        if args.budget_ms is not None:
+            print(f"{'超出' if over_budget else '未超出'}预算 {args.budget_ms:.0f} ms")
+    return 1 if over_budget else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="apicore", description="APICORE 配置文件命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = subparsers.add_parser("validate", help="批量验证目录中的配置文件")
+    validate_parser.add_argument("directory", nargs="?", help="要验证的目录，默认为 EnterPoint 配置目录")
+    validate_parser.add_argument("--pattern", default="*.api.json", help="文件名匹配模式 (默认: *.api.json)")
+    validate_parser.add_argument("--jobs", "-j", type=int, default=None, help="并行进程数，默认为 CPU 核心数")
+    validate_parser.add_argument("--json", metavar="PATH", help="写入 JSON 报告，- 表示标准输出")
+    validate_parser.add_argument("--junit", metavar="PATH", help="写入 JUnit XML 报告，- 表示标准输出")
+    validate_parser.set_defaults(func=cmd_validate)
+
+    loadtest_parser = subparsers.add_parser("loadtest", help="按配置并发发送请求，统计吞吐量与延迟")
+    loadtest_parser.add_argument("config", help="配置文件路径")
+    loadtest_parser.add_argument("--sample", metavar="RESPONSE", help="启动返回该样例响应的本地模拟服务器并向其发送请求")
+    loadtest_parser.add_argument("--base-url", help="把请求发往该地址（替换配置链接中的协议与主机）")
+    loadtest_parser.add_argument("--requests", "-n", type=int, default=100, help="请求总数 (默认: 100)")
+    loadtest_parser.add_argument("--concurrency", "-c", type=int, default=10, help="并发数与连接数上限 (默认: 10)")
+    loadtest_parser.add_argument("--timeout", type=float, default=10.0, help="单个请求的超时秒数 (默认: 10)")
+    loadtest_parser.add_argument("--delay", type=float, default=0.0, help="模拟服务器每个响应的延迟秒数")
+    loadtest_parser.add_argument("--seed", type=int, default=None, help="参数抽样的随机种子")
+    loadtest_parser.add_argument("--json", metavar="PATH", help="写入 JSON 报告，- 表示标准输出")
+    loadtest_parser.set_defaults(func=cmd_loadtest)
+
+    stub_parser = subparsers.add_parser("stub", help="启动返回样例响应的本地模拟服务器")
+    stub_parser.add_argument("sample", help="响应样例文件")
+    stub_parser.add_argument("--host", default="127.0.0.1", help="监听地址 (默认: 127.0.0.1)")
+    stub_parser.add_argument("--port", type=int, default=8000, help="监听端口 (默认: 8000)")
+    stub_parser.add_argument("--delay", type=float, default=0.0, help="每个响应的延迟秒数")
+    stub_parser.set_defaults(func=cmd_stub)
+
+    importtime_parser = subparsers.add_parser("importtime", help="测量启动时导入模块的耗时，列出最慢的导入")
+    importtime_parser.add_argument("module", nargs="?", default="apicore_editor",
+                                   help="要导入的模块 (默认: apicore_editor)")
+    importtime_parser.add_argument("--top", "-n", type=int, default=20, help="列出最慢的导入数量 (默认: 20)")
+    importtime_parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative",
+                                   help="按累计耗时（包括其导入的模块）或自身耗时排序 (默认: cumulative)")
+    importtime_parser.add_argument("--repeat", "-r", type=int, default=3, help="测量次数，取总耗时最短的一次 (默认: 3)")
+    importtime_parser.add_argument("--budget-ms", type=float, default=None,
+                                   help="导入总耗时的预算，超出时退出码为 1")
+    importtime_parser.add_argument("--json", metavar="PATH", help="写入 JSON 报告，- 表示标准输出")
+    importtime_parser.set_defaults(func=cmd_importtime)
+
+    return parser
+
+
+# 可由 python apicore_editor.py <命令> 直接调用的子命令
+COMMANDS = ("validate", "loadtest", "stub", "importtime")
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,180 @@
+"""配置目录的内存索引
+
+保存目录中每个配置文件的名称、内容摘要与验证结果。启动时扫描一次整个目录，之后只根据
+文件系统通知处理变化的目录与文件：目录变化时只列出该目录（不递归）与索引比较，修改时间与
+大小都未变化的文件不再读取，内容摘要未变化的文件不再解析与验证。
+
+scan()、inspect_all() 只读取文件系统、不修改索引，可以在后台线程中调用；DirectoryIndex 的
+读取与修改应在同一个线程中进行：
+
+    index = DirectoryIndex(get_config_dir())
+    paths, directories = scan(index.root)
+    index.apply(inspect_all((path, None) for path in paths), directories)
+    changed = index.apply(inspect_all(index.candidates(directories=[...], files=[...])))
+"""
+
+import fnmatch
+import hashlib
+import os
+
+from . import serialize
+from .batch import DEFAULT_PATTERN, find_config_files
+from .model import Config
+from .validate import ERROR, WARNING, check
+
+PASSED = "passed"
+FAILED = "failed"
+# 无法读取或解析
+BROKEN = "error"
+
+
+class FileInfo:
+    """索引中的一个配置文件"""
+
+    __slots__ = ("path", "friendly_name", "hash", "stamp", "status", "errors", "warnings", "message")
+
+    def __init__(self, path, friendly_name="", hash="", stamp=None, status=PASSED, errors=0, warnings=0,
+                 message=""):
+        self.path = path
+        self.friendly_name = friendly_name
+        self.hash = hash
+        # (修改时间, 大小)
+        self.stamp = stamp
+        self.status = status
+        self.errors = errors
+        self.warnings = warnings
+        # 第一个错误或无法解析的原因
+        self.message = message
+
+    @property
+    def name(self) -> str:
+        return self.friendly_name or os.path.basename(self.path)
+
+    def __repr__(self):
+        return f"FileInfo({self.path!r}, {self.status!r})"
+
+
+def inspect(path, previous=None):
+    """读取并验证 path，返回 FileInfo；文件不存在时返回 None
+
+    修改时间与大小与 previous 相同时直接返回 previous，内容摘要相同时只更新 stamp。
+    """
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if previous is not None and previous.stamp == stamp:
+                return previous
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        return FileInfo(path, status=BROKEN, message=f"{type(e).__name__}: {e}")
+    file_hash = hashlib.sha256(data).hexdigest()
+    if previous is not None and previous.hash == file_hash:
+        return FileInfo(path, previous.friendly_name, file_hash, stamp, previous.status, previous.errors,
+                        previous.warnings, previous.message)
+    try:
+        config = Config.from_dict(serialize.loads(data))
+        issues = check(config)
+    except Exception as e:
+        return FileInfo(path, hash=file_hash, stamp=stamp, status=BROKEN, message=f"{type(e).__name__}: {e}")
+    errors = [issue for issue in issues if issue.severity == ERROR]
+    warnings = sum(1 for issue in issues if issue.severity == WARNING)
+    return FileInfo(path, str(config.friendly_name), file_hash, stamp, FAILED if errors else PASSED,
+                    len(errors), warnings, str(errors[0]) if errors else "")
+
+
+def inspect_all(candidates) -> list:
+    """处理 [(路径, 索引中的 FileInfo 或 None)]，返回 [(路径, 新的 FileInfo 或 None)]"""
+    return [(path, inspect(path, previous)) for path, previous in candidates]
+
+
+def scan(root, pattern=DEFAULT_PATTERN):
+    """启动时的完整扫描，返回 (匹配的文件, 全部目录)"""
+    directories = [dir_path for dir_path, _, _ in os.walk(root)]
+    return find_config_files(root, pattern), directories
+
+
+def list_directory(directory, pattern=DEFAULT_PATTERN):
+    """目录中直接包含的 (匹配的文件, 子目录)；目录不存在时均为空"""
+    files, directories = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        directories.append(entry.path)
+                    elif fnmatch.fnmatch(entry.name, pattern):
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, directories
+
+
+class DirectoryIndex:
+    """目录中全部配置文件的 FileInfo，键为文件路径"""
+
+    def __init__(self, root, pattern=DEFAULT_PATTERN):
+        self.root = os.path.abspath(root)
+        self.pattern = pattern
+        self.files = {}
+        # 已知的目录（包括 root），用于添加文件系统监视
+        self.directories = {self.root}
+
+    def candidates(self, directories=(), files=()) -> list:
+        """发生变化的目录与文件需要检查的 (路径, 索引中的 FileInfo)
+
+        只列出 directories 中的各个目录本身（不递归），与索引比较得到新出现与消失的文件；
+        新出现的子目录整个加入。已索引的文件的修改由 files 报告。消失的文件也作为候选，
+        inspect 返回 None 后由 apply 移除。
+        """
+        paths = set(files)
+        for directory in directories:
+            if not os.path.isdir(directory):
+                # 目录被删除：其中已索引的文件全部需要检查
+                prefix = directory + os.sep
+                paths.update(path for path in self.files if path.startswith(prefix))
+                self.directories = {d for d in self.directories if d != directory and not d.startswith(prefix)}
+                continue
+            found, subdirectories = list_directory(directory, self.pattern)
+            found = set(found)
+            paths.update(path for path in found if path not in self.files)
+            paths.update(path for path in self.files if os.path.dirname(path) == directory and path not in found)
+            for subdirectory in subdirectories:
+                if subdirectory not in self.directories:
+                    # 新出现（例如整体移入）的子目录需要完整遍历
+                    for dir_path, dir_names, _ in os.walk(subdirectory):
+                        self.directories.add(dir_path)
+                    paths.update(find_config_files(subdirectory, self.pattern))
+        return [(path, self.files.get(path)) for path in sorted(paths)]
+
+    def apply(self, results, directories=()) -> list:
+        """写入 inspect_all 的结果与 scan 找到的目录，返回内容或状态有变化的文件路径"""
+        self.directories.update(directories)
+        changed = []
+        for path, info in results:
+            previous = self.files.get(path)
+            if info is None:
+                if previous is not None:
+                    del self.files[path]
+                    changed.append(path)
+                continue
+            self.files[path] = info
+            if previous is None or previous.hash != info.hash or previous.status != info.status:
+                changed.append(path)
+        return changed
+
+    def count(self, status) -> int:
+        return sum(1 for info in self.files.values() if info.status == status)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, path):
+        return path in self.files
+
+    def get(self, path, default=None):
+        return self.files.get(path, default)
@@ -0,0 +1,164 @@
+"""并发下载图像
+
+response.image.content_type 为 URL 时，一个响应可能引用几十张图像。fetch_images 用固定数量的
+asyncio 工作协程并发下载，总连接数与每个主机的连接数都有上限；响应体边下载边写入磁盘缓存，
+不会整体保存在内存中。每张图像完成时立即回调，调用方可以随即显示缩略图。
+
+    report = run_fetch(urls, on_result=print)
+    print(report.first_image_seconds, report.bytes_per_second)
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from urllib.parse import urljoin, urlsplit
+
+from . import http
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "apicore_image_cache")
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class FetchResult:
+    """一张图像的下载结果，path 为缓存文件路径"""
+
+    __slots__ = ("url", "path", "status", "size", "seconds", "cached", "error")
+
+    def __init__(self, url, path="", status=0, size=0, seconds=0.0, cached=False, error=""):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.size = size
+        self.seconds = seconds
+        self.cached = cached
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "path": self.path,
+            "status": self.status,
+            "size": self.size,
+            "seconds": round(self.seconds, 6),
+            "cached": self.cached,
+            "error": self.error,
+        }
+
+
+class FetchReport:
+    """一次下载的汇总"""
+
+    def __init__(self, results, seconds, first_image_seconds):
+        self.results = results
+        self.seconds = seconds
+        # 从开始到第一张图像可以显示所用的时间，没有成功的图像时为 None
+        self.first_image_seconds = first_image_seconds
+
+    @property
+    def bytes_downloaded(self) -> int:
+        return sum(r.size for r in self.results if r.ok and not r.cached)
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_downloaded / self.seconds if self.seconds else 0.0
+
+    def count(self, ok=True) -> int:
+        return sum(1 for r in self.results if r.ok == ok)
+
+    def to_dict(self) -> dict:
+        return {
+            "total": len(self.results),
+            "succeeded": self.count(True),
+            "failed": self.count(False),
+            "seconds": round(self.seconds, 6),
+            "first_image_seconds": (round(self.first_image_seconds, 6)
+                                    if self.first_image_seconds is not None else None),
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_per_second": round(self.bytes_per_second, 3),
+            "images": [r.to_dict() for r in self.results],
+        }
+
+
+def cache_path(cache_dir, url) -> str:
+    """按地址的 sha256 命名缓存文件，保留原扩展名便于识别格式"""
+    ext = os.path.splitext(urlsplit(url).path)[1].lower()
+    if not ext.isascii() or len(ext) > 6:
+        ext = ""
+    return os.path.join(cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ext)
+
+
+async def _download(pool, url, path, timeout):
+    # 写入临时文件，完成后再改名，中断的下载不会留下不完整的缓存；
+    # 重复的地址会同时下载到同一缓存文件，临时文件名各不相同
+    fd, part = tempfile.mkstemp(suffix=".part", dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            with open(part, "wb") as f:
+                response = await http.request(pool, "GET", url, timeout=timeout, sink=f.write,
+                                              headers={"Accept": "image/*"})
+            location = response.headers.get("location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if response.status != 200:
+                raise http.HttpError(f"HTTP {response.status}")
+            os.replace(part, path)
+            return response
+        raise http.HttpError("重定向次数过多")
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+
+
+async def fetch_images(urls, cache_dir=DEFAULT_CACHE_DIR, workers=8, per_host=4, timeout=30.0,
+                       on_result=None) -> FetchReport:
+    """并发下载 urls，每完成一张调用 on_result(FetchResult)，返回与 urls 顺序一致的结果"""
+    os.makedirs(cache_dir, exist_ok=True)
+    urls = list(urls)
+    results = [None] * len(urls)
+    queue = iter(enumerate(urls))
+    pool = http.ConnectionPool(workers, per_host)
+    start = time.perf_counter()
+    first_image = None
+
+    async def worker():
+        nonlocal first_image
+        for index, url in queue:
+            begin = time.perf_counter()
+            path = cache_path(cache_dir, url) if isinstance(url, str) else ""
+            if not isinstance(url, str):
+                result = FetchResult(str(url), error="图像地址不是字符串")
+            elif os.path.exists(path):
+                result = FetchResult(url, path, 200, os.path.getsize(path), 0.0, cached=True)
+            else:
+                try:
+                    response = await _download(pool, url, path, timeout)
+                    result = FetchResult(url, path, response.status, response.size, time.perf_counter() - begin)
+                except asyncio.TimeoutError:
+                    result = FetchResult(url, error="下载超时")
+                except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        http.HttpError) as e:
+                    result = FetchResult(url, error=str(e) or type(e).__name__)
+            if result.ok and first_image is None:
+                first_image = time.perf_counter() - start
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(urls))))))
+    finally:
+        pool.close()
+    return FetchReport(results, time.perf_counter() - start, first_image)
+
+
+def run_fetch(urls, cache_dir=DEFAULT_CACHE_DIR, workers=8, per_host=4, timeout=30.0, on_result=None) -> FetchReport:
+    return asyncio.run(fetch_images(urls, cache_dir, workers, per_host, timeout, on_result))
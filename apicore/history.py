@@ -0,0 +1,204 @@
+"""撤销与重做
+
+历史记录由可逆的命令组成，命令只保存被改动的部分：插入与删除保存节点本身，修改保存节点
+各字段修改前后的值。字段的值直接引用模型中的对象而不复制，未改动的字段（例如 1 MB 的图标）
+在每一级历史中共享同一个对象，数百级历史只占用几 KB。
+
+历史占用的内存按命令保存的旧值估算，超过 memory_limit 时丢弃最早的历史。
+
+    history = History()
+    history.push(Insert(PARAMETER, config.parameters, len(config.parameters), param))
+    command = history.undo()     # 参数被移除，command.node 为受影响的节点
+"""
+
+import sys
+from collections import deque
+
+from .live import BASIC
+
+DEFAULT_MEMORY_LIMIT = 16 * 1024 * 1024
+
+
+def sizeof(obj) -> int:
+    """估算对象及其包含的对象占用的内存"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return size + sum(sizeof(v) for v in obj)
+    slots = getattr(type(obj), "__slots__", ())
+    return size + sum(sizeof(getattr(obj, name)) for name in slots)
+
+
+def state(node) -> tuple:
+    """节点全部字段的当前值，只引用不复制"""
+    return tuple(getattr(node, name) for name in type(node).__slots__)
+
+
+class Command:
+    """可逆的修改；kind 与 node 指出受影响的节点（数据项的修改以所在数据组为节点）"""
+
+    kind = BASIC
+    node = None
+    cost = 0
+
+    def undo(self):
+        raise NotImplementedError
+
+    def redo(self):
+        raise NotImplementedError
+
+    def merge(self, command) -> bool:
+        """把紧随其后的 command 合并到本命令中，成功时返回 True"""
+        return False
+
+
+class Insert(Command):
+    """在 items 的 index 处插入 node"""
+
+    def __init__(self, kind, items, index, node, owner=None):
+        self.kind = kind
+        self.items = items
+        self.index = index
+        self.inserted = node
+        # 插入到数据组中的数据项以数据组为受影响的节点
+        self.node = owner if owner is not None else node
+        # 节点仍在模型中，历史不额外占用内存
+        self.cost = sys.getsizeof(self)
+
+    def undo(self):
+        del self.items[self.index]
+
+    def redo(self):
+        self.items.insert(self.index, self.inserted)
+
+
+class Remove(Insert):
+    """删除 items 中 index 处的 node"""
+
+    def __init__(self, kind, items, index, node, owner=None):
+        super().__init__(kind, items, index, node, owner)
+        # 被删除的节点只被历史引用
+        self.cost += sizeof(node)
+
+    def undo(self):
+        Insert.redo(self)
+
+    def redo(self):
+        Insert.undo(self)
+
+
+class Update(Command):
+    """节点的字段从 before 变为 after，两者由 state() 取得"""
+
+    def __init__(self, kind, target, before, after, owner=None):
+        self.kind = kind
+        self.target = target
+        self.before = before
+        self.after = after
+        self.node = owner if owner is not None else target
+        # 只有被替换掉的旧值由历史独占，未改动的字段与模型共享
+        self.cost = sys.getsizeof(self) + sum(sizeof(old) for old, new in zip(before, after) if old is not new)
+
+    def _apply(self, values):
+        for name, value in zip(type(self.target).__slots__, values):
+            setattr(self.target, name, value)
+
+    def undo(self):
+        self._apply(self.before)
+
+    def redo(self):
+        self._apply(self.after)
+
+
+class SetField(Command):
+    """基本信息字段的修改，通过 setter(name, value) 写回"""
+
+    def __init__(self, setter, name, before, after):
+        self.setter = setter
+        self.name = name
+        self.before = before
+        self.after = after
+        self.cost = sys.getsizeof(self) + sizeof(before)
+
+    def undo(self):
+        self.setter(self.name, self.before)
+
+    def redo(self):
+        self.setter(self.name, self.after)
+
+    def merge(self, command) -> bool:
+        # 连续修改同一字段（例如逐字输入）只算一步
+        if not isinstance(command, SetField) or command.name != self.name:
+            return False
+        self.after = command.after
+        return True
+
+
+class History:
+    """撤销与重做栈"""
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self._undo = deque()
+        self._redo = []
+        self.memory = 0
+        # 撤销或重做之后的第一条命令不与之前的命令合并
+        self._can_merge = False
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.memory = 0
+        self._can_merge = False
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self):
+        return len(self._undo)
+
+    def push(self, command):
+        """记录已经执行的修改"""
+        for undone in self._redo:
+            self.memory -= undone.cost
+        self._redo.clear()
+        if self._can_merge and self._undo and self._undo[-1].merge(command):
+            return
+        self._undo.append(command)
+        self.memory += command.cost
+        self._can_merge = True
+        self._evict()
+
+    def undo(self):
+        """撤销最近的修改，返回被撤销的命令；没有可撤销的修改时返回 None"""
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.undo()
+        self._redo.append(command)
+        self._can_merge = False
+        return command
+
+    def redo(self):
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.redo()
+        self._undo.append(command)
+        self._can_merge = False
+        return command
+
+    def break_merge(self):
+        """之后的命令不再与当前命令合并"""
+        self._can_merge = False
+
+    def _evict(self):
+        # 至少保留最近一级历史
+        while self.memory > self.memory_limit and len(self._undo) > 1:
+            self.memory -= self._undo.popleft().cost
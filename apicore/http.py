@@ -0,0 +1,190 @@
+"""基于 asyncio 的最小 HTTP/1.1 客户端
+
+只依赖标准库，供压力测试 (apicore.loadtest) 与图像下载 (apicore.fetch) 共用。
+连接按 (协议, 主机, 端口) 保持长连接复用，总连接数与每个主机的连接数都可以限制；
+响应体按块交给回调处理，不会整体保存在内存中。
+"""
+
+import asyncio
+import ssl
+from urllib.parse import urlsplit
+
+# 读取响应体的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+class HttpError(Exception):
+    """请求无法完成"""
+
+
+class ConnectionPool:
+    """按主机复用的 HTTP/1.1 连接池
+
+    limit 限制同时使用的连接总数，per_host 限制单个主机同时使用的连接数。
+    """
+
+    def __init__(self, limit, per_host=None):
+        self.limit = limit
+        self.per_host = per_host
+        # (协议, 主机, 端口) -> 空闲连接列表
+        self._idle = {}
+        self._semaphore = asyncio.Semaphore(limit)
+        self._host_semaphores = {}
+        self._ssl = None
+        self.opened = 0
+
+    def _host_semaphore(self, key):
+        if self.per_host is None:
+            return None
+        semaphore = self._host_semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._host_semaphores[key] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def acquire(self, key):
+        host_semaphore = self._host_semaphore(key)
+        if host_semaphore is not None:
+            await host_semaphore.acquire()
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            if host_semaphore is not None:
+                host_semaphore.release()
+            raise
+        try:
+            idle = self._idle.get(key)
+            while idle:
+                reader, writer = idle.pop()
+                if not writer.is_closing() and not reader.at_eof():
+                    return reader, writer
+                writer.close()
+            scheme, host, port = key
+            if scheme == "https" and self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            connection = await asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None)
+            self.opened += 1
+            return connection
+        except BaseException:
+            self._release_slot(key)
+            raise
+
+    def _release_slot(self, key):
+        self._semaphore.release()
+        host_semaphore = self._host_semaphores.get(key)
+        if host_semaphore is not None:
+            host_semaphore.release()
+
+    def release(self, key, connection, reusable):
+        if reusable:
+            self._idle.setdefault(key, []).append(connection)
+        else:
+            connection[1].close()
+        self._release_slot(key)
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class Response:
+    """响应状态与头字段，响应体已交给回调处理"""
+
+    __slots__ = ("url", "status", "headers", "size")
+
+    def __init__(self, url, status, headers, size):
+        self.url = url
+        self.status = status
+        # 头字段名均为小写
+        self.headers = headers
+        self.size = size
+
+
+async def _read_body(reader, headers, sink):
+    # 把响应体逐块交给 sink，返回 (字节数, 连接能否复用)
+    size = 0
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            remaining = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+            if remaining == 0:
+                # 跳过尾部头字段
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                return size, True
+            while remaining:
+                data = await reader.readexactly(min(remaining, CHUNK_SIZE))
+                remaining -= len(data)
+                size += len(data)
+                if sink is not None:
+                    sink(data)
+            await reader.readexactly(2)
+    if "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            data = await reader.readexactly(min(remaining, CHUNK_SIZE))
+            remaining -= len(data)
+            size += len(data)
+            if sink is not None:
+                sink(data)
+        return size, True
+    # 没有长度信息时读到连接关闭
+    while True:
+        data = await reader.read(CHUNK_SIZE)
+        if not data:
+            return size, False
+        size += len(data)
+        if sink is not None:
+            sink(data)
+
+
+async def request(pool, method, url, body=b"", timeout=10.0, sink=None, headers=None) -> Response:
+    """发送一个请求，响应体逐块交给 sink(bytes)，sink 为 None 时丢弃
+
+    timeout 限制从获取连接到读完响应体的总时间，超时抛出 asyncio.TimeoutError。
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise HttpError(f"不支持的协议: {parts.scheme or '(无)'}")
+    if not parts.hostname:
+        raise HttpError(f"地址缺少主机名: {url}")
+    key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    head = (f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            f"Connection: keep-alive\r\n"
+            f"User-Agent: apicore\r\n")
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    if body:
+        head += f"Content-Length: {len(body)}\r\n"
+
+    async def exchange():
+        connection = await pool.acquire(key)
+        reusable = False
+        try:
+            reader, writer = connection
+            writer.write(head.encode("ascii") + b"\r\n" + body)
+            await writer.drain()
+            status_line = await reader.readuntil(b"\r\n")
+            try:
+                status = int(status_line.split(b" ", 2)[1])
+            except (IndexError, ValueError):
+                raise HttpError(f"无效的状态行: {status_line[:80]!r}")
+            response_headers = {}
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+            if method == "HEAD" or status in (204, 304):
+                size, keep = 0, True
+            else:
+                size, keep = await _read_body(reader, response_headers, sink)
+            reusable = keep and response_headers.get("connection", "").lower() != "close"
+            return Response(url, status, response_headers, size)
+        finally:
+            pool.release(key, connection, reusable)
+
+    return await asyncio.wait_for(exchange(), timeout)
@@ -0,0 +1,206 @@
+"""二进制与 base64 图像响应的解码
+
+response.image.content_type 为 BINARY 时，图像数据直接包含在响应中：没有设置路径时整个响应体
+就是图像（is_base64 时为 base64 文本），设置了路径时路径处的字符串是 base64 编码的图像。
+
+解码过程尽量不复制数据：
+    - 样例文件通过 mmap 映射为 memoryview，不读入内存
+    - base64 文本按块解码，解码结果直接交给图像解码器逐块读取，不会生成完整的解码副本
+    - 生成缩略图时使用 PIL 的 draft 在解码阶段缩小（JPEG 按 DCT 比例只解码所需分辨率）
+
+    with map_file("response.bin") as view:
+        thumbnail = decode_thumbnail(view, is_base64=True, max_size=256)
+"""
+
+import binascii
+import io
+import mmap
+import re
+from contextlib import contextmanager
+
+# 每次解码的 base64 字符数，必须是 4 的倍数
+BASE64_CHUNK = 256 * 1024
+DEFAULT_THUMBNAIL_SIZE = 256
+
+_DATA_URI = re.compile(rb"^\s*data:[^,]{0,200}?;base64,")
+_DATA_URI_TEXT = re.compile(r"^\s*data:[^,]{0,200}?;base64,")
+# base64 文本中允许出现的换行与空白
+_WHITESPACE = b" \t\r\n\x0b\x0c"
+_WHITESPACE_TABLE = dict.fromkeys(_WHITESPACE)
+
+
+@contextmanager
+def map_file(path):
+    """把文件映射为只读 memoryview，离开上下文后释放"""
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            yield memoryview(b"")
+            return
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            mapped.close()
+
+
+class BufferReader(io.RawIOBase):
+    """以文件接口读取 memoryview，每次只复制调用方请求的部分"""
+
+    def __init__(self, view):
+        super().__init__()
+        self._view = memoryview(view).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._view[self._position:self._position + len(buffer)]
+        size = len(data)
+        buffer[:size] = data
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+class Base64Reader(io.RawIOBase):
+    """按块解码 base64 文本的只读文件对象
+
+    source 可以是 memoryview、bytes 或 str，开头的 data URI 前缀会被跳过。
+    向前定位通过解码并丢弃实现，向后定位从头重新解码；图像解码器只会在读取文件头时少量回退。
+    """
+
+    def __init__(self, source, chunk_size=BASE64_CHUNK):
+        super().__init__()
+        if isinstance(source, str):
+            self._source = source
+            match = _DATA_URI_TEXT.match(source, 0, 256)
+        else:
+            self._source = memoryview(source).cast("B")
+            match = _DATA_URI.match(self._source[:256])
+        self._start = match.end() if match else 0
+        self._chunk_size = chunk_size - chunk_size % 4
+        self._rewind()
+
+    def _rewind(self):
+        self._offset = self._start
+        self._carry = "" if isinstance(self._source, str) else b""
+        self._pending = b""
+        self._pending_pos = 0
+        self._position = 0
+
+    def _strip(self, chunk):
+        # 去掉换行等空白（每块只复制一次），解码时有效字符数必须是 4 的倍数
+        if isinstance(chunk, str):
+            return chunk.translate(_WHITESPACE_TABLE)
+        return chunk.tobytes().translate(None, _WHITESPACE)
+
+    def _decode_next(self):
+        # 解码下一块，返回 False 表示已到结尾
+        if self._offset < len(self._source):
+            end = self._offset + self._chunk_size
+            chunk = self._carry + self._strip(self._source[self._offset:end])
+            self._offset = end
+            # 不足 4 个字符的部分留到下一块
+            usable = len(chunk) - len(chunk) % 4
+            chunk, self._carry = chunk[:usable], chunk[usable:]
+        elif self._carry:
+            # 末尾补上省略的填充
+            chunk, self._carry = self._carry, self._carry[:0]
+            chunk += ("=" if isinstance(chunk, str) else b"=") * (-len(chunk) % 4)
+        else:
+            return False
+        self._pending = binascii.a2b_base64(chunk)
+        self._pending_pos = 0
+        return True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._pending_pos >= len(self._pending):
+            if not self._decode_next():
+                return 0
+        size = min(len(buffer), len(self._pending) - self._pending_pos)
+        buffer[:size] = self._pending[self._pending_pos:self._pending_pos + size]
+        self._pending_pos += size
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            raise io.UnsupportedOperation("base64 数据流不支持从结尾定位")
+        if offset < self._position:
+            self._rewind()
+        scratch = bytearray(min(64 * 1024, max(1, offset - self._position)))
+        while self._position < offset:
+            if not self.readinto(memoryview(scratch)[:offset - self._position]):
+                break
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+def open_stream(source, is_base64=False):
+    """返回读取图像字节的缓冲文件对象"""
+    raw = Base64Reader(source) if is_base64 or isinstance(source, str) else BufferReader(source)
+    return io.BufferedReader(raw, 64 * 1024)
+
+
+def decode_thumbnail(source, is_base64=False, max_size=DEFAULT_THUMBNAIL_SIZE):
+    """解码图像并缩小到 max_size 以内，返回 (缩略图, 原始尺寸)"""
+    # 导入 PIL 较慢，解码时才导入，不影响编辑器启动
+    from PIL import Image
+
+    with open_stream(source, is_base64) as stream:
+        image = Image.open(stream)
+        original_size = image.size
+        # 在解码前设置目标尺寸，支持的格式只解码到接近目标的分辨率
+        image.draft("RGB", (max_size, max_size))
+        image.thumbnail((max_size, max_size))
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    return image, original_size
+
+
+def decode_file_thumbnail(path, is_base64=False, max_size=DEFAULT_THUMBNAIL_SIZE):
+    """解码整个文件为图像（BINARY 响应），文件通过 mmap 读取"""
+    with map_file(path) as view:
+        return decode_thumbnail(view, is_base64, max_size)
+
+
+def sample_image_sources(spec, sample, values):
+    """返回样例中需要解码的图像 [(名称, 来源, 是否 base64, 来源是否为文件路径)]
+
+    values 为按图像路径提取到的值；没有设置路径时整个样例文件就是图像。
+    """
+    if spec.content_type != "BINARY":
+        return []
+    if not spec.path:
+        return [(sample, sample, spec.is_base64, True)]
+    # JSON 中的二进制数据只能是 base64 字符串
+    return [(f"{sample}#{i}", value, True, False) for i, value in enumerate(values) if isinstance(value, str)]
@@ -0,0 +1,131 @@
+"""启动时的模块导入耗时
+
+在新的解释器进程中以 python -X importtime 导入模块，解析其输出，列出最慢的导入，并检查
+导入总耗时是否超出预算。导入耗时受磁盘缓存等因素影响，多次测量时取总耗时最短的一次：
+
+    report = profile("apicore_editor", repeat=3)
+    for entry in report.slowest(20):
+        print(entry.name, entry.cumulative_ms)
+    report.total_ms <= 400
+"""
+
+import json
+import subprocess
+import sys
+
+DEFAULT_MODULE = "apicore_editor"
+PREFIX = "import time:"
+
+
+class ImportTimeError(Exception):
+    """子进程导入模块失败"""
+
+
+class ImportEntry:
+    """-X importtime 输出中的一行，depth 为导入的嵌套层数（0 为顶层）"""
+
+    __slots__ = ("name", "self_us", "cumulative_us", "depth")
+
+    def __init__(self, name, self_us, cumulative_us, depth=0):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+    @property
+    def self_ms(self) -> float:
+        return self.self_us / 1000
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "self_ms": round(self.self_ms, 3),
+            "cumulative_ms": round(self.cumulative_ms, 3),
+            "depth": self.depth,
+        }
+
+    def __repr__(self):
+        return f"ImportEntry({self.name!r}, {self.cumulative_us})"
+
+
+def parse(text) -> list:
+    """解析 -X importtime 的输出（标准错误），返回 [ImportEntry]，顺序与输出相同"""
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith(PREFIX):
+            continue
+        fields = line[len(PREFIX):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # 表头
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        entries.append(ImportEntry(stripped, self_us, cumulative_us, (len(name) - len(stripped) - 1) // 2))
+    return entries
+
+
+class ImportReport:
+    """一次导入的全部模块；total_ms 为目标模块（包括其导入的全部模块）的累计耗时"""
+
+    def __init__(self, module, entries):
+        self.module = module
+        self.entries = entries
+
+    @property
+    def root(self):
+        # 目标模块最后完成导入，是最后一个同名的顶层条目
+        for entry in reversed(self.entries):
+            if entry.depth == 0 and entry.name == self.module:
+                return entry
+        return None
+
+    @property
+    def total_ms(self) -> float:
+        root = self.root
+        return root.cumulative_ms if root is not None else 0.0
+
+    def slowest(self, count=20, key="cumulative") -> list:
+        """除目标模块本身外最慢的 count 个导入，key 为 cumulative（包括其导入的模块）或 self"""
+        root = self.root
+        entries = [entry for entry in self.entries if entry is not root]
+        attribute = "self_us" if key == "self" else "cumulative_us"
+        entries.sort(key=lambda entry: getattr(entry, attribute), reverse=True)
+        return entries[:count]
+
+    def to_dict(self, count=20, key="cumulative") -> dict:
+        return {
+            "module": self.module,
+            "total_ms": round(self.total_ms, 3),
+            "imports": len(self.entries),
+            "slowest": [entry.to_dict() for entry in self.slowest(count, key)],
+        }
+
+    def to_json(self, count=20, key="cumulative") -> str:
+        return json.dumps(self.to_dict(count, key), ensure_ascii=False, indent=2)
+
+
+def profile(module=DEFAULT_MODULE, repeat=1, python=None, cwd=None) -> ImportReport:
+    """在 cwd 中启动 repeat 次新的解释器导入 module，返回总耗时最短的一次"""
+    best = None
+    for _ in range(max(1, repeat)):
+        process = subprocess.run([python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                 cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if process.returncode != 0:
+            # 错误信息在 importtime 输出之后
+            lines = [line for line in process.stderr.splitlines() if not line.startswith(PREFIX)]
+            raise ImportTimeError("\n".join(lines[-5:]) or f"退出码 {process.returncode}")
+        report = ImportReport(module, parse(process.stderr))
+        if report.root is None:
+            # 模块已在解释器启动时导入，无法测量
+            raise ImportTimeError(f"输出中没有 {module} 的导入记录")
+        if best is None or report.total_ms < best.total_ms:
+            best = report
+    return best
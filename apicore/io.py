@@ -0,0 +1,76 @@
+"""APICORE 配置文件读写
+
+JSON 的解析与生成由 apicore.serialize 中的后端完成。
+写入时先写同目录下的临时文件，fsync 后改名替换目标文件，写入中途失败或崩溃不会留下不完整的配置。
+"""
+
+import os
+
+from . import serialize
+from .model import Config
+
+# 与 tempfile.mkstemp 相同的标志；权限 0o666 由系统按 umask 收窄，新文件的权限与 open() 创建的文件一致
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+
+
+def loads(text) -> Config:
+    return Config.from_dict(serialize.loads(text))
+
+
+def dumps(config: Config) -> str:
+    return serialize.dumps(config.to_dict())
+
+
+def load(path) -> Config:
+    with open(path, "rb") as f:
+        return Config.from_dict(serialize.loads(f.read()))
+
+
+def write_atomic(path, text):
+    """原子地把 text 写入 path：目标文件要么保持原样，要么是完整的新内容"""
+    path = os.path.abspath(path)
+    directory, name = os.path.split(path)
+    # 临时文件与目标在同一目录，保证改名不跨文件系统
+    fd, tmp = _create_temp(directory, name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # 保留原文件的权限
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def _create_temp(directory, name):
+    while True:
+        tmp = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(tmp, _TMP_FLAGS, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _fsync_dir(directory):
+    # 改名写入目录项，目录也需要 fsync 才能在断电后保留（Windows 不支持打开目录）
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def dump(config: Config, path):
+    write_atomic(path, dumps(config))
@@ -0,0 +1,523 @@
+"""编辑日志（崩溃恢复）
+
+编辑器把每次对模型的修改记录为一行紧凑的 JSON 追加到日志文件，异常退出后下次启动时可以
+从日志重放出未保存的编辑。日志的第一条记录是基准，之后是按顺序执行的操作：
+
+    {"op":"base","file":"a.api.json","stamp":[...]}       从该文件开始编辑（新建时 file 为 null）
+    {"op":"snapshot","file":...,"config":{...}}            压缩后的完整配置
+    {"op":"snapshot",...,"pending":["parameter"],"source":"a.api.json","stamp":[...]}
+                                                           按需打开的文件中尚未读取的部分从 source 读取
+    {"op":"field","name":"image.path","value":"..."}      基本信息与图像配置字段
+    {"op":"param.add","data":{...}}   {"op":"param.set","index":0,"data":{...}}   {"op":"param.del","index":0}
+    {"op":"group.add","data":{...}}   {"op":"group.set","index":0,"name":"..."}   {"op":"group.del","index":0}
+    {"op":"item.add","group":0,"data":{...}}   {"op":"item.set","group":0,"index":0,"data":{...}}
+    {"op":"item.del","group":0,"index":0}
+
+添加操作可以带有 index（撤销删除时在原位置插入），没有 index 时添加到末尾。
+
+记录操作只是把字典放入队列，编码与写入在后台线程中按批进行。写入失败的一批操作留在队列中，
+与之后的操作一起重试，日志中不会缺少中间的操作；失败时在写入线程中调用 on_error(错误信息)。自上一个基准以来的操作数达到
+compact_every 时，通过 snapshot 回调取得完整配置写入快照，日志被原子地替换为只包含快照的文件。
+写入快照时只复制列表并取出各节点字段的引用，序列化同样在后台线程中进行。
+
+每个编辑器进程使用自己的日志 recovery-<pid>.journal，运行期间持有同名 .lock 文件的锁；
+进程退出（包括崩溃）后系统释放该锁，其他进程才能取得锁并恢复该日志：
+
+    journal = Journal(snapshot=lambda: (config, path))
+    journal.start()
+    journal.reset(path)
+    journal.set_parameter(0, config.parameters[0])
+    for path in find_orphans():
+        recovery = replay(path)
+"""
+
+import gc
+import glob
+import os
+import sys
+import threading
+from operator import attrgetter
+from pathlib import Path
+
+from . import serialize
+from .history import state
+from .io import load, write_atomic
+from .live import DATA_GROUP, PARAMETER
+from .model import Config, DataGroup, DataItem, ImageSpec, Parameter
+from .snapshot import file_stamp
+
+JOURNAL_DIR = str(Path.home() / ".apicore_editor")
+# 后台写入的间隔（秒）
+WRITE_INTERVAL = 0.2
+COMPACT_EVERY = 10000
+
+BASES = ("base", "snapshot")
+_IMAGE_PREFIX = "image."
+
+
+class JournalError(Exception):
+    """日志无法重放，或正在被其他进程使用"""
+
+
+def session_path(directory=JOURNAL_DIR, pid=None) -> str:
+    """进程 pid（默认为当前进程）的日志路径"""
+    return os.path.join(directory, f"recovery-{os.getpid() if pid is None else pid}.journal")
+
+
+class JournalLock:
+    """日志所属进程持有的锁，进程退出（包括崩溃）后由系统释放"""
+
+    def __init__(self, journal_path):
+        self.path = journal_path + ".lock"
+        self._file = None
+
+    @property
+    def locked(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """不等待；锁被其他进程持有时返回 False"""
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "a+b")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self, remove=True):
+        """释放锁；remove 为 False 时保留锁文件（只是检查其他进程是否持有锁）"""
+        if self._file is None:
+            return
+        if remove:
+            try:
+                # Windows 上不能删除被打开的文件，删除失败时保留锁文件
+                os.remove(self.path)
+            except OSError:
+                pass
+        self._file.close()
+        self._file = None
+
+
+def find_orphans(directory=JOURNAL_DIR) -> list:
+    """目录中所属进程已退出的日志，按修改时间从新到旧
+
+    只检查锁是否被持有，不取得锁；恢复前应再用 JournalLock 取得锁，避免同时启动的编辑器
+    恢复同一个日志。
+    """
+    orphans = []
+    for path in glob.glob(os.path.join(directory, "recovery*.journal")):
+        lock = JournalLock(path)
+        if lock.acquire():
+            # 只是检查，保留锁文件：删除后其他进程可能在新的文件上取得锁
+            lock.release(remove=False)
+            orphans.append(path)
+    orphans.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0, reverse=True)
+    return orphans
+
+
+def remove_journal(path):
+    """删除已恢复或被放弃的日志"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+_PARAMETER_STATE = attrgetter(*Parameter.__slots__)
+_ITEM_STATE = attrgetter(*DataItem.__slots__)
+
+
+def _restore(cls, values):
+    node = cls.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        setattr(node, name, value)
+    return node
+
+
+class _Snapshot:
+    """写入快照时配置的副本，在写入线程中序列化
+
+    修改节点时整体替换字段的值（撤销历史同样依赖这一点），只有参数、数据组与数据项的列表
+    原地增删，因此复制这些列表并取出每个节点的字段即可，不需要复制字段的值。
+    """
+
+    __slots__ = ("config", "image", "parameters", "groups")
+
+    def __init__(self, config):
+        self.config = state(config)
+        self.image = state(config.image)
+        self.parameters = list(map(_PARAMETER_STATE, config.parameters))
+        self.groups = [(group.friendly_name, list(map(_ITEM_STATE, group.data)), group.extra)
+                       for group in config.others]
+
+    def to_dict(self) -> dict:
+        config = _restore(Config, self.config)
+        config.image = _restore(ImageSpec, self.image)
+        config.parameters = [_restore(Parameter, values) for values in self.parameters]
+        config.others = [DataGroup(name, [_restore(DataItem, values) for values in items], extra)
+                         for name, items, extra in self.groups]
+        return config.to_dict()
+
+
+def _encodable(op):
+    if isinstance(op.get("config"), _Snapshot):
+        return dict(op, config=op["config"].to_dict())
+    return op
+
+
+def _add(op, index):
+    if index is not None:
+        op["index"] = index
+    return op
+
+
+class Journal:
+    """追加写入的编辑日志；path 为 None 时使用当前进程的日志"""
+
+    def __init__(self, path=None, snapshot=None, interval=WRITE_INTERVAL, compact_every=COMPACT_EVERY,
+                 on_error=None):
+        self.path = path or session_path()
+        self.lock = JournalLock(self.path)
+        # 返回 write_snapshot 参数 (Config, 文件路径[, pending, source]) 的回调，用于压缩
+        self.snapshot = snapshot
+        self.interval = interval
+        self.compact_every = compact_every
+        # 写入开始失败时调用，连续失败只调用一次
+        self.on_error = on_error
+        # 自上一个基准以来的操作数
+        self.operations = 0
+        # 最近一次写入失败的原因，写入成功后为 None
+        self.error = None
+        # 日志末尾可能有写了一半的记录，之后只能从新的基准开始写入
+        self._rewrite = False
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closing = False
+        self._file = None
+        self._thread = None
+
+    def start(self):
+        """取得日志的锁并启动后台写入线程；启动前记录的操作会在第一次写入时写出"""
+        if not self.lock.acquire():
+            raise JournalError(f"日志正在被其他进程使用: {self.path}")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="apicore-journal", daemon=True)
+            self._thread.start()
+
+    def record(self, op):
+        with self._lock:
+            self._pending.append(op)
+            self._idle.clear()
+        if op["op"] in BASES:
+            self.operations = 0
+            return
+        self.operations += 1
+        if self.snapshot is not None and (self.operations >= self.compact_every or self._rewrite):
+            self.write_snapshot(*self.snapshot())
+
+    def reset(self, file=None):
+        """以 file 的当前内容（None 为新建的空配置）作为基准重新开始记录"""
+        self.record({"op": "base", "file": file, "stamp": file_stamp(file) if file else None})
+
+    def write_snapshot(self, config, file=None, pending=(), source=None):
+        """以完整配置作为基准，之前的操作不再需要
+
+        pending 为按需打开的文件 source 中尚未读取的部分（PARAMETER、DATA_GROUP），config 中对应
+        的部分为空，重放时从 source 读取，不需要为写入快照而解析。
+        """
+        op = {"op": "snapshot", "file": file, "config": _Snapshot(config)}
+        if pending:
+            op.update(pending=list(pending), source=source, stamp=file_stamp(source))
+        self.record(op)
+
+    def field(self, name, value):
+        """基本信息字段，图像配置字段名加 image. 前缀"""
+        self.record({"op": "field", "name": name, "value": value})
+
+    def add_parameter(self, param, index=None):
+        self.record(_add({"op": "param.add", "data": param.to_dict()}, index))
+
+    def set_parameter(self, index, param):
+        self.record({"op": "param.set", "index": index, "data": param.to_dict()})
+
+    def delete_parameter(self, index):
+        self.record({"op": "param.del", "index": index})
+
+    def add_group(self, group, index=None):
+        self.record(_add({"op": "group.add", "data": group.to_dict()}, index))
+
+    def rename_group(self, index, name):
+        self.record({"op": "group.set", "index": index, "name": name})
+
+    def delete_group(self, index):
+        self.record({"op": "group.del", "index": index})
+
+    def add_item(self, group, item, index=None):
+        self.record(_add({"op": "item.add", "group": group, "data": item.to_dict()}, index))
+
+    def set_item(self, group, index, item):
+        self.record({"op": "item.set", "group": group, "index": index, "data": item.to_dict()})
+
+    def delete_item(self, group, index):
+        self.record({"op": "item.del", "group": group, "index": index})
+
+    def flush(self, timeout=None) -> bool:
+        """等待已记录的操作全部写入；写入失败时不再等待，返回 False"""
+        if self._thread is None:
+            return not self._pending
+        self._wake.set()
+        return self._idle.wait(timeout) and self.error is None
+
+    def close(self, remove=False):
+        """写出剩余的操作并停止后台线程；remove 为 True 时删除日志（编辑已保存或被放弃）"""
+        if self._thread is not None:
+            self._closing = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        if remove:
+            with self._lock:
+                self._pending.clear()
+            remove_journal(self.path)
+        # 未删除的日志在下次启动时可以恢复
+        self.lock.release()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if batch and not self._write_batch(batch) and not self._closing:
+                # 留在队列最前面，下次与之后的操作一起重试
+                with self._lock:
+                    self._pending[:0] = batch
+            with self._lock:
+                if not self._pending or self.error is not None:
+                    self._idle.set()
+            if self._closing and not batch:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write_batch(self, batch) -> bool:
+        if self._rewrite and not any(op["op"] in BASES for op in batch):
+            # 等待新的基准（下一次记录操作时写入快照）
+            return False
+        try:
+            self._write(batch)
+        except OSError as e:
+            first = self.error is None
+            self.error = str(e)
+            if first and self.on_error is not None:
+                self.on_error(self.error)
+            return False
+        self.error = None
+        self._rewrite = False
+        return True
+
+    def _write(self, batch):
+        # 批中最后一个基准之前的操作已包含在基准中
+        start = 0
+        for i in range(len(batch) - 1, -1, -1):
+            if batch[i]["op"] in BASES:
+                start = i
+                break
+        data = b"".join(serialize.dumps_canonical(_encodable(op)) + b"\n" for op in batch[start:])
+        if batch[start]["op"] in BASES:
+            # 打开的文件会妨碍替换（Windows），替换后重新打开新文件
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            write_atomic(self.path, data.decode("utf-8"))
+        else:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            offset = self._file.tell()
+            try:
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError:
+                # 去掉可能写了一半的记录，重试时从原来的位置写入
+                file, self._file = self._file, None
+                try:
+                    file.close()
+                except OSError:
+                    pass
+                try:
+                    os.truncate(self.path, offset)
+                except OSError:
+                    self._rewrite = True
+                raise
+
+
+class Recovery:
+    """重放日志得到的配置"""
+
+    def __init__(self, file, config, operations, base_changed):
+        # 编辑开始时的文件，新建的配置为 None
+        self.file = file
+        self.config = config
+        self.operations = operations
+        # 基准文件在记录日志之后被修改或删除，重放结果可能与预期不同
+        self.base_changed = base_changed
+
+
+# 重放在 Config.to_dict() 形式的字典上进行，只在最后转换为模型对象，
+# 被后续操作覆盖或删除的参数与数据项不需要创建对象
+
+def _field(document, op):
+    name = op["name"]
+    if name.startswith(_IMAGE_PREFIX) and name[len(_IMAGE_PREFIX):] in ImageSpec.FIELDS:
+        document["response"]["image"][name[len(_IMAGE_PREFIX):]] = op["value"]
+    elif name in Config.FIELDS:
+        document[name] = op["value"]
+    else:
+        raise JournalError(f"未知的字段: {name}")
+
+
+def _groups(document):
+    return document["response"]["others"]
+
+
+def _items(document, op):
+    return document["response"]["others"][op["group"]]["data"]
+
+
+def _insert(items, op):
+    if "index" in op:
+        items.insert(op["index"], op["data"])
+    else:
+        items.append(op["data"])
+
+
+def _set_parameter(document, op):
+    document["parameters"][op["index"]] = op["data"]
+
+
+def _set_group(document, op):
+    _groups(document)[op["index"]]["friendly_name"] = op["name"]
+
+
+def _set_item(document, op):
+    _items(document, op)[op["index"]] = op["data"]
+
+
+_APPLY = {
+    "field": _field,
+    "param.add": lambda document, op: _insert(document["parameters"], op),
+    "param.set": _set_parameter,
+    "param.del": lambda document, op: document["parameters"].pop(op["index"]),
+    "group.add": lambda document, op: _insert(_groups(document), op),
+    "group.set": _set_group,
+    "group.del": lambda document, op: _groups(document).pop(op["index"]),
+    "item.add": lambda document, op: _insert(_items(document, op), op),
+    "item.set": _set_item,
+    "item.del": lambda document, op: _items(document, op).pop(op["index"]),
+}
+
+
+def read(path) -> list:
+    """读取日志中的全部记录；崩溃时未写完的最后一行被忽略"""
+    with open(path, "rb") as f:
+        data = f.read()
+    lines = data.split(b"\n")
+    # 没有换行结尾的最后一行是未写完的记录
+    if lines[-1]:
+        lines.pop()
+    lines = [line for line in lines if line]
+    try:
+        # 整个文件一次解析，比逐行解析快得多
+        return serialize.loads(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        pass
+    for number, line in enumerate(lines):
+        try:
+            serialize.loads(line)
+        except ValueError:
+            raise JournalError(f"日志第 {number + 1} 条记录已损坏") from None
+    raise JournalError("日志已损坏")
+
+
+def apply(document, op):
+    """在 Config.to_dict() 形式的 document 上执行一条操作记录"""
+    handler = _APPLY.get(op.get("op"))
+    if handler is None:
+        raise JournalError(f"未知的操作: {op.get('op')}")
+    try:
+        handler(document, op)
+    except (IndexError, KeyError, TypeError):
+        raise JournalError(f"无效的操作记录: {op}") from None
+
+
+def replay(path):
+    """重放日志，没有日志或基准之后没有任何操作时返回 None"""
+    if not os.path.exists(path):
+        return None
+    # 解析时一次创建大量小对象，会反复触发循环垃圾回收，重放期间暂停
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _replay(path)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _load_pending(config, base) -> bool:
+    # 快照中尚未读取的部分从打开的文件中读取，返回该文件是否在写入快照之后被修改
+    source = base.get("source")
+    stamp = file_stamp(source) if source else None
+    if stamp is None:
+        raise JournalError(f"快照引用的文件已不存在: {source}")
+    loaded = load(source)
+    if PARAMETER in base["pending"]:
+        config.parameters = loaded.parameters
+    if DATA_GROUP in base["pending"]:
+        config.others = loaded.others
+    return list(stamp) != base.get("stamp")
+
+
+def _replay(path):
+    ops = read(path)
+    if not ops or ops[0].get("op") not in BASES:
+        raise JournalError("日志缺少基准记录")
+    base = ops[0]
+    if len(ops) == 1 and base["op"] == "base":
+        return None
+    file = base.get("file")
+    base_changed = False
+    if base["op"] == "snapshot":
+        config = Config.from_dict(base["config"])
+        if base.get("pending"):
+            base_changed = _load_pending(config, base)
+    elif file is None:
+        config = Config()
+    else:
+        stamp = file_stamp(file)
+        if stamp is None:
+            raise JournalError(f"日志的基准文件已不存在: {file}")
+        base_changed = list(stamp) != base.get("stamp")
+        config = load(file)
+    # 先规范化为 to_dict() 的结构，保证 response.image 等键存在
+    document = config.to_dict()
+    for op in ops[1:]:
+        apply(document, op)
+    return Recovery(file, Config.from_dict(document), len(ops) - 1, base_changed)
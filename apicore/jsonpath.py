@@ -0,0 +1,132 @@
+"""APICORE 路径表达式
+
+配置中的 response.image.path 与数据项 path 使用如下语法:
+
+    data.image.raw[*]     键访问，[*] 或 [] 展开列表中的所有元素
+    data.list[0].url      [n] 按下标取元素，支持负数下标
+    data["key.with.dot"]  方括号中的引号字符串按原样作为键
+
+compile() 将表达式解析一次并按表达式字符串缓存，得到的 CompiledPath 可以反复求值。
+求值时每一步都作用于当前的全部节点（一批），展开通配符时不会逐元素递归。
+"""
+
+import json
+import re
+from functools import lru_cache
+from itertools import chain
+
+KEY = "key"
+INDEX = "index"
+WILDCARD = "wildcard"
+
+# 键名、方括号内容
+_TOKEN = re.compile(r'\s*(?:([^.\[\]"\s][^.\[\]]*)|\[\s*(\*|-?\d+|"(?:[^"\\]|\\.)*")?\s*\])')
+
+
+class PathSyntaxError(ValueError):
+    """路径表达式语法错误"""
+
+
+def parse(expression) -> tuple:
+    """解析表达式，返回 ((类型, 参数), ...) 步骤元组"""
+    steps = []
+    pos = 0
+    length = len(expression)
+    expect_key = True
+    while pos < length:
+        if expression[pos] == ".":
+            if expect_key:
+                raise PathSyntaxError(f"路径 {expression!r} 在位置 {pos} 处缺少键名")
+            pos += 1
+            expect_key = True
+            continue
+        match = _TOKEN.match(expression, pos)
+        if match is None or match.end() == pos:
+            raise PathSyntaxError(f"路径 {expression!r} 在位置 {pos} 处无法解析")
+        key, bracket = match.group(1), match.group(2)
+        if key is not None:
+            if not expect_key:
+                raise PathSyntaxError(f"路径 {expression!r} 在位置 {pos} 处缺少分隔符 .")
+            steps.append((KEY, key.strip()))
+        elif bracket is None or bracket == "*":
+            steps.append((WILDCARD, None))
+        elif bracket.startswith('"'):
+            steps.append((KEY, json.loads(bracket)))
+        else:
+            steps.append((INDEX, int(bracket)))
+        expect_key = False
+        pos = match.end()
+    if expect_key and steps:
+        raise PathSyntaxError(f"路径 {expression!r} 以 . 结尾")
+    return tuple(steps)
+
+
+# 每种步骤对应一个作用于整批节点的函数
+
+def _key_step(key):
+    def step(nodes):
+        return [node[key] for node in nodes if type(node) is dict and key in node]
+    return step
+
+
+def _index_step(index):
+    def step(nodes):
+        return [node[index] for node in nodes
+                if type(node) is list and -len(node) <= index < len(node)]
+    return step
+
+
+def _wildcard_step(nodes):
+    # 一次性拼接所有列表，不逐个元素递归
+    return list(chain.from_iterable(node for node in nodes if type(node) is list))
+
+
+class CompiledPath:
+    """编译后的路径表达式"""
+
+    __slots__ = ("expression", "steps", "_program", "is_multi")
+
+    def __init__(self, expression, steps):
+        self.expression = expression
+        self.steps = steps
+        program = []
+        for kind, arg in steps:
+            if kind == KEY:
+                program.append(_key_step(arg))
+            elif kind == INDEX:
+                program.append(_index_step(arg))
+            else:
+                program.append(_wildcard_step)
+        self._program = tuple(program)
+        # 包含通配符时可能匹配多个值
+        self.is_multi = any(kind == WILDCARD for kind, _ in steps)
+
+    def evaluate(self, document) -> list:
+        """返回全部匹配的值，找不到时返回空列表"""
+        nodes = [document]
+        for step in self._program:
+            nodes = step(nodes)
+            if not nodes:
+                break
+        return nodes
+
+    def evaluate_many(self, documents) -> list:
+        """对多个文档求值，返回每个文档的匹配列表"""
+        return [self.evaluate(document) for document in documents]
+
+    def first(self, document, default=None):
+        nodes = self.evaluate(document)
+        return nodes[0] if nodes else default
+
+    def __repr__(self):
+        return f"CompiledPath({self.expression!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile(expression) -> CompiledPath:
+    """编译路径表达式，相同的表达式字符串只解析一次"""
+    return CompiledPath(expression, parse(expression))
+
+
+def evaluate(expression, document) -> list:
+    return compile(expression).evaluate(document)
@@ -0,0 +1,200 @@
+"""按需读取的大配置文件
+
+打开时只把文件映射到内存并建立索引：按编辑器写出的格式（两个空格缩进，见 apicore.serialize）
+查找顶层与 response 中各个键的值所在的字节范围，不解析参数列表与 response.others。
+基本信息、图标与图像配置在打开时从各自的范围读取，参数与数据组在首次需要时才解析：
+
+    lazy = LazyConfig(path)
+    config = lazy.config               # parameters 与 others 为空列表
+    params = lazy.load(PARAMETER)      # 只解析参数列表所在的字节范围
+
+缩进不同的文件（例如压缩为一行的 JSON）无法建立索引，打开时抛出 LazyLoadError，
+调用方应改用 apicore.load。
+"""
+
+import gc
+import mmap
+import os
+
+from . import serialize
+from .live import DATA_GROUP, PARAMETER
+from .model import Config, DataGroup, Parameter
+
+# 超过该大小的文件按需读取
+LAZY_THRESHOLD = 8 * 1024 * 1024
+
+_SECTIONS = {PARAMETER: Parameter, DATA_GROUP: DataGroup}
+_BRACKETS = {b"{"[0]: b"}"[0], b"["[0]: b"]"[0]}
+
+
+class LazyLoadError(Exception):
+    """文件无法按需读取"""
+
+
+class LazyConfig:
+    """已建立索引的配置文件，pending 为尚未读取的部分（PARAMETER、DATA_GROUP）"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._stamp = self._fstat()
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise LazyLoadError("文件为空") from None
+            try:
+                self.config, self._spans = self._index()
+            except BaseException:
+                self._map.close()
+                raise
+        except BaseException:
+            self._file.close()
+            raise
+
+    @property
+    def pending(self) -> tuple:
+        return tuple(self._spans)
+
+    def size(self, kind) -> int:
+        """尚未读取的部分的字节数"""
+        start, end = self._spans.get(kind, (0, 0))
+        return end - start
+
+    def load(self, kind) -> list:
+        """解析并返回 kind 对应的节点列表，每个部分只能读取一次；读取失败时该部分仍未读取"""
+        start, end = self._spans[kind]
+        # 文件被其他程序原地改写后映射的内容不再可靠；改名替换的文件不影响已打开的文件
+        if self._fstat() != self._stamp:
+            raise LazyLoadError("文件在打开后被其他程序修改")
+        # 一次创建大量小对象会反复触发循环垃圾回收，解析期间暂停
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            data = serialize.loads(self._map[start:end])
+            cls = _SECTIONS[kind]
+            items = [cls.from_dict(item) for item in data]
+        except ValueError as e:
+            raise LazyLoadError(f"无法解析: {e}") from None
+        except (AttributeError, TypeError) as e:
+            raise LazyLoadError(f"无效的配置: {e}") from None
+        finally:
+            if enabled:
+                gc.enable()
+        del self._spans[kind]
+        return items
+
+    def close(self):
+        self._spans.clear()
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fstat(self):
+        stat = os.fstat(self._file.fileno())
+        return stat.st_mtime_ns, stat.st_size
+
+    def _index(self):
+        data = self._map
+        start = 3 if data[:3] == b"\xef\xbb\xbf" else 0
+        # Windows 上以文本模式写出的文件使用 \r\n
+        newline = b"\r\n" if data[start + 1:start + 3] == b"\r\n" else b"\n"
+        if data[start:start + 1] != b"{" or data[start + 1:start + 1 + len(newline) + 3] != newline + b'  "':
+            raise LazyLoadError("文件不是编辑器写出的格式")
+        end = data.rfind(newline + b"}")
+        if end < 0 or data[end + len(newline) + 1:].strip():
+            raise LazyLoadError("文件不是编辑器写出的格式")
+
+        members = self._members(start + 1, end, 1, newline)
+        spans = {}
+        document = {}
+        for key, span in members.items():
+            if key == "parameters":
+                spans[PARAMETER] = self._array(span)
+            elif key != "response":
+                document[key] = self._value(span)
+        document["parameters"] = []
+
+        response = members.get("response")
+        if response is not None:
+            value_start, value_end = response
+            if data[value_start:value_end] == b"{}":
+                document["response"] = {}
+            elif data[value_start:value_start + 1] == b"{":
+                # 最后一个成员之后是缩进 2 的右括号
+                closing = value_end - 1 - len(newline) - 2
+                if data[closing:value_end] != newline + b"  }":
+                    raise LazyLoadError("response 不是编辑器写出的格式")
+                document["response"] = {}
+                for key, span in self._members(value_start + 1, closing, 2, newline).items():
+                    if key == "others":
+                        spans[DATA_GROUP] = self._array(span)
+                    else:
+                        document["response"][key] = self._value(span)
+            else:
+                document["response"] = self._value(response)
+        try:
+            config = Config.from_dict(document)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise LazyLoadError(f"无效的配置: {e}") from None
+        return config, spans
+
+    def _members(self, start, end, depth, newline) -> dict:
+        """对象 (start, end) 中深度为 depth 的成员：键 -> 值的字节范围"""
+        data = self._map
+        prefix = newline + b"  " * depth + b'"'
+        # JSON 字符串中不会出现未转义的换行，以该缩进开头的行只能是这一层的键
+        position = data.find(prefix, start, end)
+        members = {}
+        while position >= 0:
+            key_start = position + len(prefix) - 1
+            separator = data.find(b'": ', key_start + 1, end)
+            if separator < 0:
+                raise LazyLoadError("文件不是编辑器写出的格式")
+            try:
+                key = serialize.loads(data[key_start:separator + 1])
+            except ValueError:
+                raise LazyLoadError("无法解析键") from None
+            value_start = separator + 3
+            if data[value_start] in _BRACKETS and data[value_start + 1:value_start + 1 + len(newline)] == newline:
+                # 跨越多行的值中更深的缩进不会匹配，下一个该缩进的键即值的结尾；不能假定紧随其后的键
+                # （例如手工加入的多行的键可能在参数与 response 之间），查找在内存映射上进行，不解析内容
+                position = data.find(prefix, value_start, end)
+            else:
+                # 单行的值（图标等长字符串）之后的换行即下一个键的开头
+                position = data.find(newline, value_start, end)
+                if position >= 0 and data[position:position + len(prefix)] != prefix:
+                    raise LazyLoadError("文件不是编辑器写出的格式")
+            if position >= 0:
+                value_end = position - 1
+                if data[value_end:position] != b",":
+                    raise LazyLoadError("文件不是编辑器写出的格式")
+            else:
+                value_end = end
+            members[key] = (value_start, value_end)
+        return members
+
+    def _array(self, span) -> tuple:
+        start, end = span
+        if end <= start or self._map[start] != b"["[0] or self._map[end - 1] != b"]"[0]:
+            raise LazyLoadError("列表不是编辑器写出的格式")
+        return span
+
+    def _value(self, span):
+        start, end = span
+        data = self._map
+        if end <= start:
+            raise LazyLoadError("文件不是编辑器写出的格式")
+        closing = _BRACKETS.get(data[start])
+        if closing is not None and data[end - 1] != closing:
+            raise LazyLoadError("文件不是编辑器写出的格式")
+        try:
+            return serialize.loads(data[start:end])
+        except ValueError:
+            raise LazyLoadError("无法解析") from None
@@ -0,0 +1,98 @@
+"""增量验证
+
+按节点（基本信息、单个参数、单个数据组）缓存验证结果，编辑时只把改动的节点标记为脏，
+重新验证的开销只与改动的规模有关，而与整个配置的大小无关。
+"""
+
+from .validate import ERROR, check_basic, check_data_group, check_parameter
+
+BASIC = "basic"
+PARAMETER = "parameter"
+DATA_GROUP = "data_group"
+
+_CHECKS = {
+    BASIC: check_basic,
+    PARAMETER: check_parameter,
+    DATA_GROUP: check_data_group,
+}
+
+
+def check_nodes(nodes) -> list:
+    """验证一批 (类型, 节点)，返回 (类型, 节点, 问题列表)；不修改任何状态，可在后台线程中调用"""
+    return [(kind, node, _CHECKS[kind](node)) for kind, node in nodes]
+
+
+class IncrementalValidator:
+    """维护每个节点的验证结果以及错误、警告总数"""
+
+    def __init__(self):
+        # id(节点) -> (节点, 问题列表)；保留节点引用以保证 id 不被复用
+        self._issues = {}
+        # id(节点) -> (类型, 节点)
+        self._dirty = {}
+        # 验证进行期间被删除的节点，其结果到达时丢弃
+        self._forgotten = set()
+        self.error_count = 0
+        self.warning_count = 0
+
+    def reset(self):
+        self._issues.clear()
+        self._dirty.clear()
+        self._forgotten.clear()
+        self.error_count = 0
+        self.warning_count = 0
+
+    def mark_dirty(self, kind, node):
+        # 基本信息每次都是新的快照，按类型去重
+        key = BASIC if kind == BASIC else id(node)
+        self._forgotten.discard(key)
+        self._dirty[key] = (kind, node)
+
+    def forget(self, node):
+        """节点被删除时移除其验证结果"""
+        self._dirty.pop(id(node), None)
+        self._forgotten.add(id(node))
+        entry = self._issues.pop(id(node), None)
+        if entry is not None:
+            self._count(entry[1], -1)
+
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def take_dirty(self) -> list:
+        """取出全部脏节点；同一时间只能有一批验证在进行"""
+        nodes = list(self._dirty.values())
+        self._dirty.clear()
+        self._forgotten.clear()
+        return nodes
+
+    def apply(self, results) -> list:
+        """写入 check_nodes 的结果，返回结果有变化的节点"""
+        changed = []
+        for kind, node, issues in results:
+            key = BASIC if kind == BASIC else id(node)
+            if key in self._forgotten:
+                continue
+            old = self._issues.get(key)
+            if old is not None:
+                self._count(old[1], -1)
+            self._issues[key] = (node, issues)
+            self._count(issues, 1)
+            if old is None or [str(i) for i in old[1]] != [str(i) for i in issues]:
+                changed.append((kind, node))
+        return changed
+
+    def issues_for(self, node) -> list:
+        entry = self._issues.get(id(node))
+        return entry[1] if entry is not None else []
+
+    def basic_issues(self) -> list:
+        entry = self._issues.get(BASIC)
+        return entry[1] if entry is not None else []
+
+    def _count(self, issues, sign):
+        for issue in issues:
+            if issue.severity == ERROR:
+                self.error_count += sign
+            else:
+                self.warning_count += sign
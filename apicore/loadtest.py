@@ -0,0 +1,177 @@
+"""并发压力测试
+
+从配置生成具体请求（见 apicore.request），用 asyncio 按指定并发数发送，统计吞吐量与延迟分布。
+连接按 (协议, 主机, 端口) 复用（HTTP/1.1 长连接，见 apicore.http），每个请求都有超时限制。
+只依赖标准库，可配合 apicore.stub 的本地模拟服务器离线运行。
+
+    report = run_load_test(config, total=1000, concurrency=50, base_url="http://127.0.0.1:8000")
+    print(report.to_json())
+"""
+
+import asyncio
+import json
+import math
+import time
+from urllib.parse import urlsplit
+
+from . import http
+from .request import ParameterSpace
+
+# 延迟直方图的桶上限（毫秒），最后一个桶收集更慢的请求
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class LoadTestError(Exception):
+    """无法开始压力测试"""
+
+
+def retarget(url, base_url) -> str:
+    """把请求地址的协议与主机替换为 base_url，保留路径和查询字符串"""
+    parts = urlsplit(url)
+    path = parts.path if parts.path.startswith("/") else "/"
+    return base_url.rstrip("/") + path + (f"?{parts.query}" if parts.query else "")
+
+
+async def send(pool, request, timeout, base_url=None):
+    """发送一个请求，返回 (状态码, 响应体字节数)；指定 base_url 时发往该地址"""
+    url = retarget(request.url, base_url) if base_url else request.url
+    body = request.body or b""
+    headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else None
+    # 只统计响应体大小，不保存内容
+    response = await http.request(pool, request.method, url, body, timeout, headers=headers)
+    return response.status, response.size
+
+
+def percentile(sorted_values, fraction) -> float:
+    """最近秩法求百分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadTestReport:
+    """一次压力测试的汇总，延迟单位为秒"""
+
+    def __init__(self, target, concurrency, timeout, latencies, statuses, errors, bytes_received, seconds,
+                 connections):
+        self.target = target
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.latencies = sorted(latencies)
+        self.statuses = statuses
+        self.errors = errors
+        self.bytes_received = bytes_received
+        self.seconds = seconds
+        self.connections = connections
+
+    @property
+    def total(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.seconds if self.seconds else 0.0
+
+    def histogram(self) -> list:
+        """[(桶上限毫秒, 数量), ...]，上限为 None 的桶包含所有更慢的请求"""
+        counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        bucket = 0
+        # 延迟已排序，单次遍历即可分桶
+        for latency in self.latencies:
+            while bucket < len(HISTOGRAM_BUCKETS) and latency * 1000 > HISTOGRAM_BUCKETS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return list(zip(HISTOGRAM_BUCKETS + (None,), counts))
+
+    def to_dict(self) -> dict:
+        latency_ms = {
+            name: round(percentile(self.latencies, fraction) * 1000, 3)
+            for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+        }
+        if self.latencies:
+            latency_ms["min"] = round(self.latencies[0] * 1000, 3)
+            latency_ms["max"] = round(self.latencies[-1] * 1000, 3)
+            latency_ms["mean"] = round(sum(self.latencies) / len(self.latencies) * 1000, 3)
+        return {
+            "target": self.target,
+            "concurrency": self.concurrency,
+            "timeout": self.timeout,
+            "total": self.total,
+            "completed": len(self.latencies),
+            "failed": sum(self.errors.values()),
+            "seconds": round(self.seconds, 6),
+            "throughput": round(self.throughput, 3),
+            "bytes_received": self.bytes_received,
+            "connections_opened": self.connections,
+            "latency_ms": latency_ms,
+            "histogram_ms": [{"le": le, "count": count} for le, count in self.histogram()],
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+
+def plan_requests(config, total, seed=None) -> list:
+    """从参数空间分层抽样，不足 total 个时循环使用"""
+    space = ParameterSpace(config)
+    requests = list(space.sample(min(total, space.size), seed))
+    if not requests:
+        raise LoadTestError("参数空间为空，无法生成请求")
+    return requests
+
+
+async def load_test(requests, total, concurrency=10, timeout=10.0, base_url=None) -> LoadTestReport:
+    """按 concurrency 个并发发送 total 个请求（循环使用 requests）"""
+    pool = http.ConnectionPool(concurrency)
+    latencies = []
+    statuses = {}
+    errors = {}
+    received = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal received
+        for index in counter:
+            request = requests[index % len(requests)]
+            start = time.perf_counter()
+            try:
+                status, size = await send(pool, request, timeout, base_url)
+            except asyncio.TimeoutError:
+                errors["timeout"] = errors.get("timeout", 0) + 1
+                continue
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                    http.HttpError) as e:
+                kind = type(e).__name__
+                errors[kind] = errors.get(kind, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            received += size
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        pool.close()
+    seconds = time.perf_counter() - start
+    target = base_url or (requests[0].url if requests else "")
+    return LoadTestReport(target, concurrency, timeout, latencies, statuses, errors, received, seconds,
+                          pool.opened)
+
+
+def run_load_test(config, total=100, concurrency=10, timeout=10.0, base_url=None, sample=None,
+                  delay=0.0, seed=None) -> LoadTestReport:
+    """运行压力测试；指定 sample 时启动本地模拟服务器并把请求发往该服务器"""
+    requests = plan_requests(config, total, seed)
+
+    async def main():
+        if sample is None:
+            return await load_test(requests, total, concurrency, timeout, base_url)
+        from .stub import StubServer
+        async with StubServer(sample, delay=delay) as server:
+            return await load_test(requests, total, concurrency, timeout, server.base_url)
+
+    return asyncio.run(main())
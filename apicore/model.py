@@ -0,0 +1,221 @@
+"""APICORE 配置模型
+
+不依赖 Qt 的配置对象，字段与 APICORE 1.0 规范一一对应。
+所有类都使用 __slots__，以便在处理大量参数与数据项时保持紧凑的内存占用。
+未知字段保存在 extra 中，保存时原样写回。
+"""
+
+PARAM_TYPES = ("integer", "boolean", "list", "string", "enum")
+ITEM_TYPES = ("string", "list")
+CONTENT_TYPES = ("URL", "BINARY")
+HTTP_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS")
+APICORE_VERSIONS = ("1.0",)
+
+
+def _extra(data: dict, known) -> dict:
+    # 收集模型未声明的字段
+    return {k: v for k, v in data.items() if k not in known}
+
+
+class Parameter:
+    """API 请求参数"""
+
+    FIELDS = ("enable", "name", "type", "required", "value", "friendly_value",
+              "friendly_name", "min_value", "max_value", "split_str")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, enable=True, name="", type="string", required=True, value="",
+                 friendly_value=None, friendly_name="", min_value=None, max_value=None,
+                 split_str=None, extra=None):
+        self.enable = enable
+        self.name = name
+        self.type = type
+        self.required = required
+        self.value = value
+        self.friendly_value = friendly_value if friendly_value is not None else []
+        self.friendly_name = friendly_name
+        self.min_value = min_value
+        self.max_value = max_value
+        self.split_str = split_str
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Parameter":
+        return cls(
+            enable=data.get("enable", True),
+            name=data.get("name", ""),
+            type=data.get("type", "string"),
+            required=data.get("required", True),
+            value=data.get("value", ""),
+            friendly_value=data.get("friendly_value", []),
+            friendly_name=data.get("friendly_name", ""),
+            min_value=data.get("min_value"),
+            max_value=data.get("max_value"),
+            split_str=data.get("split_str"),
+            extra=_extra(data, cls.FIELDS),
+        )
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"Parameter(name={self.name!r}, type={self.type!r})"
+
+
+class DataItem:
+    """数据组中的单个数据项"""
+
+    FIELDS = ("friendly_name", "path", "type", "one_to_one_mapping")
+    KEYS = ("friendly_name", "path", "type", "one-to-one-mapping")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, friendly_name="未命名数据项", path="", type="string",
+                 one_to_one_mapping=False, extra=None):
+        self.friendly_name = friendly_name
+        self.path = path
+        self.type = type
+        self.one_to_one_mapping = one_to_one_mapping
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DataItem":
+        one_to_one_mapping = data.get("one-to-one-mapping", False)
+        # 旧配置没有 type 字段时，启用一对一映射的数据项视为列表
+        item_type = data.get("type")
+        if item_type is None:
+            item_type = "list" if one_to_one_mapping else "string"
+        return cls(
+            friendly_name=data.get("friendly_name", ""),
+            path=data.get("path", ""),
+            type=item_type,
+            one_to_one_mapping=one_to_one_mapping,
+            extra=_extra(data, cls.KEYS),
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            "friendly_name": self.friendly_name,
+            "path": self.path,
+            "type": self.type,
+            "one-to-one-mapping": self.one_to_one_mapping,
+        }
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"DataItem(friendly_name={self.friendly_name!r}, path={self.path!r})"
+
+
+class DataGroup:
+    """响应中的其他数据组"""
+
+    __slots__ = ("friendly_name", "data", "extra")
+
+    def __init__(self, friendly_name="未命名数据组", data=None, extra=None):
+        self.friendly_name = friendly_name
+        self.data = data if data is not None else []
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DataGroup":
+        return cls(
+            friendly_name=data.get("friendly_name", ""),
+            data=[DataItem.from_dict(item) for item in data.get("data", [])],
+            extra=_extra(data, ("friendly_name", "data")),
+        )
+
+    def to_dict(self) -> dict:
+        data = {
+            "friendly_name": self.friendly_name,
+            "data": [item.to_dict() for item in self.data],
+        }
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"DataGroup(friendly_name={self.friendly_name!r}, items={len(self.data)})"
+
+
+class ImageSpec:
+    """响应中的图像配置"""
+
+    FIELDS = ("content_type", "path", "is_list", "is_base64")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, content_type="URL", path="", is_list=False, is_base64=False, extra=None):
+        self.content_type = content_type
+        self.path = path
+        self.is_list = is_list
+        self.is_base64 = is_base64
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ImageSpec":
+        return cls(
+            content_type=data.get("content_type", "URL"),
+            path=data.get("path", ""),
+            is_list=data.get("is_list", False),
+            is_base64=data.get("is_base64", False),
+            extra=_extra(data, cls.FIELDS),
+        )
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data.update(self.extra)
+        return data
+
+
+class Config:
+    """完整的 APICORE 配置"""
+
+    FIELDS = ("friendly_name", "intro", "icon", "link", "func", "APICORE_version")
+    __slots__ = FIELDS + ("parameters", "image", "others", "response_extra", "extra")
+
+    def __init__(self, friendly_name="", intro="", icon="", link="", func="GET",
+                 APICORE_version="1.0", parameters=None, image=None, others=None,
+                 response_extra=None, extra=None):
+        self.friendly_name = friendly_name
+        self.intro = intro
+        self.icon = icon
+        self.link = link
+        self.func = func
+        self.APICORE_version = APICORE_version
+        self.parameters = parameters if parameters is not None else []
+        self.image = image if image is not None else ImageSpec()
+        self.others = others if others is not None else []
+        self.response_extra = response_extra if response_extra is not None else {}
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Config":
+        response = data.get("response", {})
+        return cls(
+            friendly_name=data.get("friendly_name", ""),
+            intro=data.get("intro", ""),
+            icon=data.get("icon", ""),
+            link=data.get("link", ""),
+            func=data.get("func", "GET"),
+            APICORE_version=data.get("APICORE_version", "1.0"),
+            parameters=[Parameter.from_dict(p) for p in data.get("parameters", [])],
+            image=ImageSpec.from_dict(response.get("image", {})),
+            others=[DataGroup.from_dict(g) for g in response.get("others", [])],
+            response_extra=_extra(response, ("image", "others")),
+            extra=_extra(data, cls.FIELDS + ("parameters", "response")),
+        )
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["parameters"] = [p.to_dict() for p in self.parameters]
+        data["response"] = {
+            "image": self.image.to_dict(),
+            "others": [g.to_dict() for g in self.others],
+        }
+        data["response"].update(self.response_extra)
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return (f"Config(friendly_name={self.friendly_name!r}, "
+                f"parameters={len(self.parameters)}, others={len(self.others)})")
@@ -0,0 +1,26 @@
+"""APICORE 配置文件目录"""
+
+import os
+import sys
+from pathlib import Path
+
+
+def get_config_dir() -> str:
+    """返回 wallpaper-generator-next 的 EnterPoint 目录，不存在时回退到程序所在目录"""
+    program_dir = os.path.dirname(os.path.realpath(sys.argv[0]))
+    if sys.platform.startswith('win'):
+        config_dir = str(Path.home() / f'AppData{os.sep}Roaming{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
+    elif sys.platform.startswith('linux'):
+        config_dir = str(Path.home() / f'.config{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
+    elif sys.platform.startswith('darwin'):
+        config_dir = str(Path.home() / f'Library{os.sep}Application Support{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
+    else:
+        config_dir = str(Path.home() / f'.config{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
+
+    if not os.path.exists(config_dir):
+        if config_dir != program_dir and os.path.exists(program_dir):
+            config_dir = program_dir
+        else:
+            config_dir = ""
+
+    return config_dir
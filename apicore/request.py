@@ -0,0 +1,217 @@
+"""请求生成：把 link、func 与参数转换为具体的请求
+
+    request = materialize(config)          # 使用各参数的默认值
+    space = ParameterSpace(config)         # 全部参数组合，按需生成
+    len(space)                             # 组合总数，可以是数十亿
+    space[12345]                           # 按下标直接生成第 12345 个请求
+    for request in space.sample(100):      # 分层抽样 100 个请求
+        ...
+
+参数取值规则:
+    - 未启用 (enable 为 false) 的参数不出现在请求中
+    - list 参数的值用 split_str 连接
+    - enum 参数在参数空间中展开为每个可选值，默认请求使用第一个值
+    - integer 参数设置了 min_value 与 max_value 时，参数空间包含该范围内的每个整数
+    - boolean 参数在参数空间中展开为 true 与 false
+    - 非必需参数在参数空间中额外包含“不发送”
+"""
+
+import random
+from urllib.parse import urlencode
+
+# 作为查询字符串发送参数的请求方法，其余方法以表单形式放在请求体中
+QUERY_METHODS = ("GET", "HEAD", "DELETE", "OPTIONS")
+
+
+class _Omit:
+    # 参数空间中表示“不发送该参数”的取值
+    __slots__ = ()
+
+    def __repr__(self):
+        return "OMIT"
+
+
+OMIT = _Omit()
+
+
+class Request:
+    """一个具体的请求"""
+
+    __slots__ = ("method", "link", "params")
+
+    def __init__(self, method, link, params):
+        self.method = method
+        self.link = link
+        # [(参数名, 字符串值), ...]，保持参数在配置中的顺序
+        self.params = params
+
+    @property
+    def url(self) -> str:
+        if self.method not in QUERY_METHODS or not self.params:
+            return self.link
+        separator = "&" if "?" in self.link else "?"
+        return self.link + separator + urlencode(self.params)
+
+    @property
+    def body(self):
+        """请求体，查询字符串方法返回 None"""
+        if self.method in QUERY_METHODS:
+            return None
+        return urlencode(self.params).encode("utf-8")
+
+    def to_dict(self) -> dict:
+        return {"method": self.method, "url": self.url, "params": dict(self.params)}
+
+    def __repr__(self):
+        return f"Request({self.method} {self.url})"
+
+
+def format_value(param, value) -> str:
+    """把参数值转换为请求中发送的字符串"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if param.type == "list" and isinstance(value, list):
+        return (param.split_str or "").join(str(v) for v in value)
+    return str(value)
+
+
+def default_value(param):
+    """参数的默认取值，没有可发送的值时返回 OMIT"""
+    if param.type == "enum":
+        return param.value[0] if isinstance(param.value, list) and param.value else OMIT
+    if param.value is None or param.value == "":
+        return OMIT
+    return param.value
+
+
+class _Concat:
+    # 两个序列首尾相接，保持 range 不被展开
+    __slots__ = ("first", "second")
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def __len__(self):
+        return len(self.first) + len(self.second)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < len(self.first):
+            return self.first[index]
+        return self.second[index - len(self.first)]
+
+
+def choices(param):
+    """参数在参数空间中的全部取值，返回支持 len 与下标访问的序列（整数范围不会展开）"""
+    if param.type == "enum":
+        values = tuple(param.value) if isinstance(param.value, list) else ()
+    elif param.type == "boolean":
+        values = (False, True)
+    elif (param.type == "integer" and isinstance(param.min_value, int)
+          and isinstance(param.max_value, int) and param.min_value <= param.max_value):
+        values = range(param.min_value, param.max_value + 1)
+    else:
+        value = default_value(param)
+        values = () if value is OMIT else (value,)
+    if not param.required or not values:
+        # 非必需参数可以不发送；没有可用取值的参数只能不发送
+        return _Concat(values, (OMIT,))
+    return values
+
+
+def _build(config, params, values) -> Request:
+    pairs = [(param.name, format_value(param, value)) for param, value in zip(params, values) if value is not OMIT]
+    return Request(config.func, config.link, pairs)
+
+
+def enabled_parameters(config) -> list:
+    return [param for param in config.parameters if param.enable]
+
+
+def materialize(config) -> Request:
+    """使用各参数的默认值生成请求"""
+    params = enabled_parameters(config)
+    return _build(config, params, [default_value(param) for param in params])
+
+
+class ParameterSpace:
+    """全部参数组合构成的空间，组合按需生成，不会整体展开"""
+
+    def __init__(self, config):
+        self.config = config
+        self.params = enabled_parameters(config)
+        self.dimensions = [choices(param) for param in self.params]
+        self.sizes = [len(dimension) for dimension in self.dimensions]
+
+    def __len__(self):
+        # 组合数可能超出 sys.maxsize，len() 会报错，此时使用 size
+        return self.size
+
+    @property
+    def size(self) -> int:
+        total = 1
+        for size in self.sizes:
+            total *= size
+        return total
+
+    def values_at(self, index) -> list:
+        """第 index 个组合中各参数的取值，最后一个参数变化最快"""
+        if not 0 <= index < self.size:
+            raise IndexError("参数空间下标超出范围")
+        values = []
+        for dimension, size in zip(reversed(self.dimensions), reversed(self.sizes)):
+            index, position = divmod(index, size)
+            values.append(dimension[position])
+        values.reverse()
+        return values
+
+    def __getitem__(self, index) -> Request:
+        if index < 0:
+            index += self.size
+        return _build(self.config, self.params, self.values_at(index))
+
+    def __iter__(self):
+        # 逐个推进各维度的位置（类似里程表），每次只生成一个请求
+        if self.size == 0:
+            return
+        positions = [0] * len(self.dimensions)
+        while True:
+            yield _build(self.config, self.params,
+                         [dimension[p] for dimension, p in zip(self.dimensions, positions)])
+            axis = len(positions) - 1
+            while axis >= 0:
+                positions[axis] += 1
+                if positions[axis] < self.sizes[axis]:
+                    break
+                positions[axis] = 0
+                axis -= 1
+            if axis < 0:
+                return
+
+    def sample(self, count, seed=None):
+        """分层抽样生成 count 个请求
+
+        每个参数的取值范围被等分为 count 层，每层恰好抽取一次（取值少于 count 时各取值出现
+        的次数相差不超过一次），各参数的层次顺序独立打乱后再组合（拉丁超立方抽样）。
+        count 不小于组合总数时按顺序生成全部组合。
+        """
+        if self.size == 0 or count <= 0:
+            return
+        if count >= self.size:
+            yield from self
+            return
+        rng = random.Random(seed)
+        columns = []
+        for dimension, size in zip(self.dimensions, self.sizes):
+            positions = []
+            for stratum in range(count):
+                low = stratum * size // count
+                high = max(low + 1, (stratum + 1) * size // count)
+                positions.append(rng.randrange(low, high))
+            rng.shuffle(positions)
+            columns.append(positions)
+        for row in range(count):
+            yield _build(self.config, self.params,
+                         [dimension[column[row]] for dimension, column in zip(self.dimensions, columns)])
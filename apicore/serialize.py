@@ -0,0 +1,138 @@
+"""JSON 序列化后端
+
+配置文件的读写、预览与变更比较都通过这里的后端进行。安装了 orjson 时默认使用 orjson，
+否则使用标准库 json；也可以通过环境变量 APICORE_JSON_BACKEND=json 或 set_backend("json") 指定。
+
+两种后端写出的格式逐字节相同（等同于 json.dumps(ensure_ascii=False, indent=2)）：
+orjson 与标准库只在浮点数的指数形式上有差异（1e-07 与 1e-7、5e-05 与 0.00005），
+输出中出现这类数字时改用标准库重新生成；
+orjson 无法处理的值（超过 64 位的整数、非字符串键、孤立代理字符等）同样回退到标准库。
+NaN 与 Infinity 不是合法的 JSON，orjson 会把它们写为 null，标准库写为 NaN 与 Infinity；
+输出中有 null 时检查输入中是否有这类浮点数，有则改用标准库，保存的数据不会被改变。
+"""
+
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 数字的指数部分：e 与数字之后紧跟分隔符。以字母 e 开头便于正则快速定位，
+# 候选位置再检查 e 之前是否为数字（base64 等字符串中不会出现分隔符，候选很少）
+_EXPONENT = re.compile(rb"e-?\d+(?:[,\n\]}]|$)")
+_DIGITS = frozenset(b"0123456789")
+
+
+def _has_exponent(data) -> bool:
+    """orjson 输出中是否有标准库会写成指数形式的数字"""
+    # 标准库把小于 1e-4 的数写成指数形式，orjson 在 1e-5 附近仍写成 0.0000x
+    if b"0.0000" in data:
+        return True
+    for match in _EXPONENT.finditer(data):
+        start = match.start()
+        if start and data[start - 1] in _DIGITS:
+            return True
+    return False
+
+
+def _has_nonfinite(obj) -> bool:
+    """obj 中是否有 NaN 或 Infinity"""
+    for value in (obj.values() if isinstance(obj, dict) else obj):
+        kind = type(value)
+        if kind is str or kind is int or kind is bool or value is None:
+            continue
+        if isinstance(value, float):
+            # 只有 NaN 与 Infinity 减去自身不为 0
+            if value - value != 0:
+                return True
+        elif isinstance(value, (dict, list, tuple)) and _has_nonfinite(value):
+            return True
+    return False
+
+
+def _lossy(data, obj) -> bool:
+    """orjson 的输出是否把 obj 中的 NaN 或 Infinity 写成了 null"""
+    return b"null" in data and _has_nonfinite((obj,))
+
+
+class StdlibBackend:
+    """标准库 json"""
+
+    name = "json"
+
+    def dumps(self, obj) -> str:
+        """配置文件格式：两个空格缩进，保留非 ASCII 字符"""
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    def dumps_canonical(self, obj) -> bytes:
+        """键排序的紧凑格式，只用于比较两个文档是否相同"""
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend(StdlibBackend):
+    """orjson，无法逐字节一致时回退到标准库"""
+
+    name = "orjson"
+
+    def dumps(self, obj) -> str:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+        if _has_exponent(data) or _lossy(data, obj):
+            return super().dumps(obj)
+        return data.decode("utf-8")
+
+    def dumps_canonical(self, obj) -> bytes:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return super().dumps_canonical(obj)
+        if _lossy(data, obj):
+            return super().dumps_canonical(obj)
+        return data
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN、超大整数等标准库可以解析的内容，无法解析时由标准库给出错误信息
+            return super().loads(data)
+
+
+BACKENDS = {"json": StdlibBackend()}
+if orjson is not None:
+    BACKENDS["orjson"] = OrjsonBackend()
+
+_backend = BACKENDS.get(os.environ.get("APICORE_JSON_BACKEND", ""),
+                        BACKENDS.get("orjson", BACKENDS["json"]))
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(name):
+    """切换后端，name 为 BACKENDS 中的名称"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"不可用的 JSON 后端: {name}（可用: {', '.join(BACKENDS)}）")
+    _backend = BACKENDS[name]
+
+
+def dumps(obj) -> str:
+    return _backend.dumps(obj)
+
+
+def dumps_canonical(obj) -> bytes:
+    return _backend.dumps_canonical(obj)
+
+
+def loads(data):
+    return _backend.loads(data)
@@ -0,0 +1,204 @@
+"""响应模拟：用配置从本地保存的响应样例中提取图像与数据
+
+解析后的样例按 (文件路径, 修改时间) 缓存，提取结果按 (文件路径, 修改时间, 路径表达式) 缓存，
+修改单个路径后重新运行只会重新计算该路径。超过 STREAM_THRESHOLD 的样例使用流式提取，
+不会整体载入内存。
+"""
+
+import json
+import os
+
+from .jsonpath import PathSyntaxError, compile as compile_path
+from .stream import extract as stream_extract
+
+IMAGE = "image"
+DATA = "data"
+
+# 超过该大小的样例文件使用流式提取
+STREAM_THRESHOLD = 32 * 1024 * 1024
+
+
+class ExtractResult:
+    """一条提取结果"""
+
+    __slots__ = ("sample", "section", "group", "name", "path", "values", "is_list",
+                 "one_to_one_mapping", "error")
+
+    def __init__(self, sample, section, group, name, path, values, is_list=False,
+                 one_to_one_mapping=False, error=""):
+        self.sample = sample
+        self.section = section
+        self.group = group
+        self.name = name
+        self.path = path
+        self.values = values
+        self.is_list = is_list
+        self.one_to_one_mapping = one_to_one_mapping
+        self.error = error
+
+    def display_value(self, limit=200) -> str:
+        if self.error:
+            return self.error
+        if self.is_list:
+            text = json.dumps(self.values, ensure_ascii=False)
+        elif self.values:
+            value = self.values[0]
+            text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        else:
+            text = "(未找到)"
+        return text if len(text) <= limit else text[:limit] + "…"
+
+    def to_dict(self) -> dict:
+        return {
+            "sample": self.sample,
+            "section": self.section,
+            "group": self.group,
+            "name": self.name,
+            "path": self.path,
+            "values": self.values,
+            "is_list": self.is_list,
+            "one-to-one-mapping": self.one_to_one_mapping,
+            "error": self.error,
+        }
+
+
+def select_image_values(spec, matches) -> list:
+    """根据图像配置整理路径匹配结果"""
+    if spec.is_list:
+        # 路径没有展开通配符时，匹配到的是整个列表
+        if len(matches) == 1 and isinstance(matches[0], list):
+            return list(matches[0])
+        return matches
+    return matches[:1]
+
+
+def select_item_values(item, matches) -> list:
+    """根据数据项类型整理路径匹配结果"""
+    if item.type == "list":
+        if len(matches) == 1 and isinstance(matches[0], list):
+            return list(matches[0])
+        return matches
+    return matches[:1]
+
+
+class SampleCache:
+    """按文件修改时间缓存样例文档与路径求值结果"""
+
+    def __init__(self, max_documents=8, stream_threshold=STREAM_THRESHOLD):
+        self.max_documents = max_documents
+        self.stream_threshold = stream_threshold
+        # 文件路径 -> (修改时间, 文档)
+        self._documents = {}
+        # (文件路径, 修改时间, 路径表达式) -> 匹配列表
+        self._matches = {}
+        self.hits = 0
+        self.misses = 0
+
+    def document(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._documents.get(path)
+        if entry is not None and entry[0] == mtime:
+            return mtime, entry[1]
+        with open(path, "rb") as f:
+            document = json.loads(f.read())
+        # 文件变化后丢弃该文件的旧结果
+        self._matches = {k: v for k, v in self._matches.items() if k[0] != path}
+        if len(self._documents) >= self.max_documents and path not in self._documents:
+            oldest = next(iter(self._documents))
+            self.forget(oldest)
+        self._documents[path] = (mtime, document)
+        return mtime, document
+
+    def matches(self, path, expression) -> list:
+        return self.matches_many(path, [expression])[expression]
+
+    def matches_many(self, path, expressions) -> dict:
+        """求多个路径表达式的匹配结果，只计算缓存中没有的表达式"""
+        stat = os.stat(path)
+        mtime = stat.st_mtime_ns
+        found = {}
+        missing = []
+        for expression in expressions:
+            cached = self._matches.get((path, mtime, expression))
+            if cached is not None:
+                self.hits += 1
+                found[expression] = cached
+            else:
+                self.misses += 1
+                missing.append(expression)
+        if not missing:
+            return found
+
+        if stat.st_size > self.stream_threshold:
+            # 大文件不缓存文档，只扫描一遍同时求出全部缺失的表达式；文件变化后丢弃旧结果
+            self._matches = {k: v for k, v in self._matches.items() if k[0] != path or k[1] == mtime}
+            computed = stream_extract(path, missing)
+        else:
+            mtime, document = self.document(path)
+            computed = {e: compile_path(e).evaluate(document) for e in missing}
+        for expression, matches in computed.items():
+            self._matches[(path, mtime, expression)] = matches
+        found.update(computed)
+        return found
+
+    def forget(self, path):
+        self._documents.pop(path, None)
+        self._matches = {k: v for k, v in self._matches.items() if k[0] != path}
+
+    def clear(self):
+        self._documents.clear()
+        self._matches.clear()
+
+
+def run_sample(config, sample, cache=None) -> list:
+    """对单个样例文件运行配置中的全部路径"""
+    cache = cache if cache is not None else SampleCache()
+    results = []
+    spec = config.image
+
+    # 先检查路径语法，再一次性求出全部合法路径
+    expressions = [spec.path] + [item.path for group in config.others for item in group.data]
+    syntax_errors = {}
+    for expression in expressions:
+        if not expression:
+            syntax_errors[expression] = "未设置路径"
+            continue
+        try:
+            compile_path(expression)
+        except PathSyntaxError as e:
+            syntax_errors[expression] = str(e)
+    found = cache.matches_many(sample, [e for e in dict.fromkeys(expressions) if e not in syntax_errors])
+
+    def lookup(expression):
+        # 返回 (匹配列表, 错误信息)
+        if expression in syntax_errors:
+            return [], syntax_errors[expression]
+        return found[expression], ""
+
+    if spec.content_type == "BINARY" and not spec.path:
+        # 二进制响应本身就是图像
+        results.append(ExtractResult(sample, IMAGE, "", "图像", "", [], error="二进制响应，无需路径"))
+    else:
+        matches, error = lookup(spec.path)
+        results.append(ExtractResult(sample, IMAGE, "", "图像", spec.path,
+                                     select_image_values(spec, matches), spec.is_list, error=error))
+
+    for group in config.others:
+        for item in group.data:
+            matches, error = lookup(item.path)
+            results.append(ExtractResult(sample, DATA, group.friendly_name, item.friendly_name, item.path,
+                                         select_item_values(item, matches), item.type == "list",
+                                         item.one_to_one_mapping, error))
+    return results
+
+
+def run_samples(config, samples, cache=None) -> list:
+    """对多个样例文件运行配置，无法读取的文件记为一条错误结果"""
+    cache = cache if cache is not None else SampleCache()
+    results = []
+    for sample in samples:
+        try:
+            results.extend(run_sample(config, sample, cache))
+        except (OSError, ValueError) as e:
+            results.append(ExtractResult(sample, IMAGE, "", "样例文件", "", [], error=f"无法读取样例: {e}"))
+    return results
@@ -0,0 +1,161 @@
+"""配置快照与变更检测
+
+ChangeTracker 为基本信息、每个参数、每个数据组分别保存规范化 JSON 的摘要，整个配置的摘要
+由这些摘要组合而成。编辑某个节点时只重新计算该节点的摘要，是否有未保存的更改在编辑时就已
+确定，检查时不需要重新读取文件或序列化整个配置。
+
+文件是否被其他程序修改通过修改时间与大小判断，不读取文件内容。
+
+按需打开的文件（见 apicore.lazy）中尚未读取的列表以占位摘要参与组合，读取后调用 load
+换成实际的摘要，已保存的状态随之更新。
+
+    tracker = ChangeTracker()
+    tracker.reset(config, path)
+    config.parameters[0].name = "size"
+    tracker.touch(PARAMETER, config.parameters[0])
+    tracker.dirty            # True
+"""
+
+import hashlib
+import os
+
+from . import serialize
+from .blobs import content_key, is_inline
+from .live import BASIC, DATA_GROUP, PARAMETER
+
+# 尚未读取的列表的摘要
+_DEFERRED = bytes(16)
+
+
+def digest(obj) -> bytes:
+    """规范化 JSON 的摘要，键的顺序不影响结果"""
+    return hashlib.blake2b(serialize.dumps_canonical(obj), digest_size=16).digest()
+
+
+def basic_dict(config) -> dict:
+    """配置中除参数与数据组以外的部分"""
+    data = {field: getattr(config, field) for field in config.FIELDS}
+    # 大图标用按对象缓存的摘要代替，编辑其他字段时不再重复序列化
+    if not is_inline(config.icon):
+        data["icon"] = content_key(config.icon)
+    data["image"] = config.image.to_dict()
+    data["response_extra"] = config.response_extra
+    data["extra"] = config.extra
+    return data
+
+
+def config_digest(config) -> bytes:
+    """与 ChangeTracker 相同算法的整个配置的摘要"""
+    tracker = ChangeTracker()
+    tracker.reset(config)
+    return tracker.current_digest()
+
+
+def file_stamp(path):
+    """文件的 (修改时间, 大小)，文件不存在时为 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ChangeTracker:
+    """记录上次保存时的配置摘要，编辑时增量更新当前摘要"""
+
+    def __init__(self):
+        # id(节点) -> (节点, 摘要)；保留节点引用以保证 id 不被复用
+        self._nodes = {}
+        # 参数与数据组列表直接引用编辑器持有的列表
+        self._lists = {PARAMETER: [], DATA_GROUP: []}
+        self._sequences = {PARAMETER: None, DATA_GROUP: None}
+        self._basic = b""
+        self._saved = None
+        # 存在尚未读取的列表时，已保存状态的各部分摘要
+        self._saved_parts = None
+        self.dirty = False
+        self.path = None
+        self.stamp = None
+        # 每次 reset 加一，用于识别在 reset 之前发起的后台保存
+        self.generation = 0
+
+    def reset(self, config, path=None, deferred=()):
+        """以 config 作为已保存的状态重新开始跟踪，path 为对应的文件；deferred 中的列表尚未读取"""
+        self.generation += 1
+        self._nodes.clear()
+        self._lists = {PARAMETER: config.parameters, DATA_GROUP: config.others}
+        self._sequences = {PARAMETER: None, DATA_GROUP: None}
+        for kind in deferred:
+            self._sequences[kind] = _DEFERRED
+        self._basic = digest(basic_dict(config))
+        self._saved = self.current_digest()
+        self._saved_parts = self._parts() if deferred else None
+        self.dirty = False
+        self.record_file(path)
+
+    def load(self, kind, items):
+        """尚未读取的列表已从文件读入，items 为未经修改的内容"""
+        self._lists[kind] = items
+        self._sequences[kind] = None
+        if self._saved_parts is not None:
+            parts = dict(self._saved_parts)
+            parts[kind] = self._sequence(kind)
+            self._saved_parts = parts
+            self._saved = self._combine(parts)
+        self.dirty = self.current_digest() != self._saved
+
+    def touch(self, kind, node=None):
+        """节点被修改或添加后调用；基本信息传入新的配置快照，node 为 None 表示列表顺序或成员有变化"""
+        if kind == BASIC:
+            self._basic = digest(basic_dict(node))
+        else:
+            if node is not None:
+                self._nodes[id(node)] = (node, digest(node.to_dict()))
+            self._sequences[kind] = None
+        self.dirty = self.current_digest() != self._saved
+
+    def forget(self, kind, node):
+        """节点被删除后调用"""
+        self._nodes.pop(id(node), None)
+        self.touch(kind)
+
+    def _node_digest(self, node) -> bytes:
+        entry = self._nodes.get(id(node))
+        if entry is None or entry[0] is not node:
+            entry = self._nodes[id(node)] = (node, digest(node.to_dict()))
+        return entry[1]
+
+    def _sequence(self, kind) -> bytes:
+        # 列表的摘要只在其中的节点变化后重新组合，组合只涉及每个节点 16 字节的摘要
+        if self._sequences[kind] is None:
+            joined = b"".join(self._node_digest(node) for node in self._lists[kind])
+            self._sequences[kind] = hashlib.blake2b(joined, digest_size=16).digest()
+        return self._sequences[kind]
+
+    def _parts(self) -> dict:
+        return {BASIC: self._basic, PARAMETER: self._sequence(PARAMETER), DATA_GROUP: self._sequence(DATA_GROUP)}
+
+    @staticmethod
+    def _combine(parts) -> bytes:
+        return hashlib.blake2b(parts[BASIC] + parts[PARAMETER] + parts[DATA_GROUP], digest_size=16).digest()
+
+    def current_digest(self) -> bytes:
+        return self._combine(self._parts())
+
+    def mark_saved(self, path=None, saved=None):
+        """状态已写入 path；saved 为发起保存时的摘要，默认为当前摘要（后台保存完成前可能已有新的编辑）"""
+        # 保存前全部列表都已读取
+        self._saved_parts = None
+        self._saved = saved if saved is not None else self.current_digest()
+        self.dirty = self.current_digest() != self._saved
+        self.record_file(path)
+
+    def record_file(self, path):
+        self.path = path
+        self.stamp = file_stamp(path) if path else None
+
+    def file_changed(self, path=None) -> bool:
+        """跟踪的文件在上次打开或保存之后是否被其他程序修改或删除"""
+        if self.path is None or (path is not None and os.path.abspath(path) != os.path.abspath(self.path)):
+            return False
+        return file_stamp(self.path) != self.stamp
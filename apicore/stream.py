@@ -0,0 +1,225 @@
+"""流式路径提取
+
+逐块读取响应样例，只把与路径表达式匹配的子树解析为 Python 对象，其余部分直接跳过。
+峰值内存取决于读取块大小和单个匹配子树的大小，与整个文件的大小无关。
+
+    for expression, value in iter_matches("dump.json", ["data.image.raw[*]"]):
+        ...
+"""
+
+import codecs
+import json
+import re
+
+from .jsonpath import INDEX, KEY, CompiledPath, compile as compile_path
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITER = re.compile(r"[,\]}\s]")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_decoder = json.JSONDecoder()
+
+
+class StreamError(ValueError):
+    """样例不是合法的 JSON"""
+
+
+class _StreamPath:
+    # 可以流式匹配的前缀步骤；其余步骤在已解析的子树上求值
+    __slots__ = ("expression", "all_steps", "steps")
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.all_steps = compile_path(expression).steps
+        # 负数下标需要知道列表长度，从该步骤所在的列表开始整体解析
+        cut = len(self.all_steps)
+        for i, (kind, arg) in enumerate(self.all_steps):
+            if kind == INDEX and arg < 0:
+                cut = i
+                break
+        self.steps = self.all_steps[:cut]
+
+    def rest(self, value, depth) -> list:
+        """在深度 depth 处已解析的值上求剩余步骤"""
+        if depth == len(self.all_steps):
+            return [value]
+        return CompiledPath(self.expression, self.all_steps[depth:]).evaluate(value)
+
+
+def _step_matches(step, component):
+    kind, arg = step
+    if kind == KEY:
+        return type(component) is str and component == arg
+    if kind == INDEX:
+        return type(component) is int and component == arg
+    return type(component) is int
+
+
+class _Scanner:
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self):
+        """读取更多数据；当前位置之前的内容被丢弃，缓冲区最多翻倍增长"""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        size = max(self.chunk_size, len(self.buffer))
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        if not data:
+            self.eof = True
+            self.buffer += self.decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.decoder.decode(data)
+        return True
+
+    def peek(self):
+        """跳过空白并返回下一个字符，数据结束时返回空字符串"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise StreamError(f"位置 {self.bytes_read} 附近应为 {char!r}")
+        self.pos += 1
+
+    def read_string(self) -> str:
+        while True:
+            match = _STRING.match(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                text = match.group()
+                return json.loads(text) if "\\" in text else text[1:-1]
+            if not self.fill():
+                raise StreamError("字符串未结束")
+
+    def read_value(self):
+        """完整解析当前位置的值"""
+        if self.peek() not in '"[{':
+            # 数字等标量可能在缓冲区末尾被截断，先确保其后的分隔符已读入
+            while _DELIMITER.search(self.buffer, self.pos) is None and self.fill():
+                pass
+        while True:
+            try:
+                value, self.pos = _decoder.raw_decode(self.buffer, self.pos)
+                return value
+            except json.JSONDecodeError:
+                # 值跨越了缓冲区末尾，读取更多数据后重试
+                if not self.fill():
+                    raise StreamError(f"位置 {self.bytes_read} 附近的值不完整或无效")
+
+    def skip_value(self):
+        """跳过字符串或标量"""
+        if self.peek() == '"':
+            self.read_string()
+        else:
+            self.read_value()
+
+
+def iter_matches(source, expressions, chunk_size=DEFAULT_CHUNK_SIZE):
+    """流式求值多个路径表达式，按文档顺序生成 (表达式, 值)
+
+    source 可以是文件路径或以二进制模式打开的文件对象。
+    """
+    paths = [_StreamPath(expression) for expression in dict.fromkeys(expressions)]
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as stream:
+            yield from _iter_stream(_Scanner(stream, chunk_size), paths)
+    else:
+        yield from _iter_stream(_Scanner(source, chunk_size), paths)
+
+
+def _iter_stream(scanner, paths):
+    yield from _visit(scanner, paths, 0)
+    if scanner.peek() != "":
+        raise StreamError("JSON 文档之后存在多余内容")
+
+
+def _visit(scanner, active, depth):
+    # active 为前 depth 个步骤都已匹配的路径
+    if any(len(p.steps) == depth for p in active):
+        # 至少一个路径在此处完整匹配：解析该子树，所有仍在匹配的路径都在子树上求值
+        value = scanner.read_value()
+        for path in active:
+            for found in path.rest(value, depth):
+                yield path.expression, found
+        return
+
+    if not active:
+        char = scanner.peek()
+        if char in "[{":
+            try:
+                # 子树完整位于缓冲区内时一次跳过
+                _, scanner.pos = _decoder.raw_decode(scanner.buffer, scanner.pos)
+                return
+            except json.JSONDecodeError:
+                pass
+        else:
+            scanner.skip_value()
+            return
+
+    char = scanner.peek()
+    if char == "{":
+        yield from _visit_object(scanner, active, depth)
+    elif char == "[":
+        yield from _visit_array(scanner, active, depth)
+    else:
+        scanner.skip_value()
+
+
+def _visit_object(scanner, active, depth):
+    scanner.pos += 1
+    if scanner.peek() == "}":
+        scanner.pos += 1
+        return
+    while True:
+        if scanner.peek() != '"':
+            raise StreamError(f"位置 {scanner.bytes_read} 附近应为对象键")
+        key = scanner.read_string()
+        scanner.expect(":")
+        yield from _visit(scanner, [p for p in active if _step_matches(p.steps[depth], key)], depth + 1)
+        char = scanner.peek()
+        scanner.pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise StreamError(f"位置 {scanner.bytes_read} 附近应为 , 或 }}")
+
+
+def _visit_array(scanner, active, depth):
+    scanner.pos += 1
+    if scanner.peek() == "]":
+        scanner.pos += 1
+        return
+    index = 0
+    while True:
+        yield from _visit(scanner, [p for p in active if _step_matches(p.steps[depth], index)], depth + 1)
+        index += 1
+        char = scanner.peek()
+        scanner.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise StreamError(f"位置 {scanner.bytes_read} 附近应为 , 或 ]")
+
+
+def extract(source, expressions, chunk_size=DEFAULT_CHUNK_SIZE) -> dict:
+    """流式求值，返回 {表达式: 匹配列表}"""
+    found = {expression: [] for expression in expressions}
+    for expression, value in iter_matches(source, expressions, chunk_size):
+        found[expression].append(value)
+    return found
@@ -0,0 +1,137 @@
+"""本地模拟服务器
+
+对任意路径的请求都返回同一个响应样例，用于离线测试配置与压力测试。
+服务器基于 asyncio，支持 HTTP/1.1 长连接，可选地为每个响应增加固定延迟。
+
+    python -m apicore stub response.json --port 8000
+"""
+
+import asyncio
+import mimetypes
+import os
+
+# 请求头的最大长度，超过时关闭连接
+MAX_HEADER_SIZE = 64 * 1024
+
+
+def guess_content_type(path) -> str:
+    if path.endswith(".json"):
+        return "application/json; charset=utf-8"
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+class StubServer:
+    """返回样例响应的 HTTP 服务器"""
+
+    def __init__(self, sample, host="127.0.0.1", port=0, delay=0.0, status=200, content_type=None):
+        with open(sample, "rb") as f:
+            self.body = f.read()
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.status = status
+        self.content_type = content_type or guess_content_type(sample)
+        self.requests = 0
+        # 正在处理的请求数及其最大值，可以用来检查客户端的并发限制
+        self.active = 0
+        self.max_active = 0
+        self._server = None
+        # 正在处理的连接，关闭服务器时一并结束
+        self._tasks = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # 端口为 0 时由系统分配
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _response_head(self, keep_alive) -> bytes:
+        reason = "OK" if self.status == 200 else "Stub"
+        return (f"HTTP/1.1 {self.status} {reason}\r\n"
+                f"Content-Type: {self.content_type}\r\n"
+                f"Content-Length: {len(self.body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("ascii")
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                if len(head) > MAX_HEADER_SIZE:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method = lines[0].split(" ", 1)[0]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length:
+                    await reader.readexactly(length)
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                self.requests += 1
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                try:
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    writer.write(self._response_head(keep_alive))
+                    if method != "HEAD":
+                        writer.write(self.body)
+                    await writer.drain()
+                finally:
+                    self.active -= 1
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # 服务器关闭时取消的连接正常结束
+            pass
+        finally:
+            self._tasks.discard(task)
+            writer.close()
+
+
+def run_stub(sample, host="127.0.0.1", port=8000, delay=0.0):
+    """在前台运行模拟服务器，直到被中断"""
+    server = StubServer(sample, host, port, delay)
+
+    async def main():
+        await server.start()
+        print(f"模拟服务器已启动: {server.base_url}  样例: {os.path.abspath(sample)}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,220 @@
+"""APICORE 配置验证
+
+check() 一次性运行全部规则，返回所有问题及其 JSON Pointer 位置（如 /parameters/17/max_value）。
+各参数类型的专属检查通过预先编译好的规则表分派。
+"""
+
+from .jsonpath import PathSyntaxError, compile as compile_path
+from .model import APICORE_VERSIONS, CONTENT_TYPES, ITEM_TYPES, PARAM_TYPES
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Issue:
+    """验证发现的单个问题"""
+
+    __slots__ = ("pointer", "severity", "message")
+
+    def __init__(self, pointer, severity, message):
+        self.pointer = pointer
+        self.severity = severity
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return {"pointer": self.pointer, "severity": self.severity, "message": self.message}
+
+    def __str__(self):
+        return f"{self.pointer}: {self.message}"
+
+    def __repr__(self):
+        return f"Issue({self.pointer!r}, {self.severity!r}, {self.message!r})"
+
+
+class ValidationError(ValueError):
+    """配置不符合 APICORE 规范，issues 中保存全部问题"""
+
+    def __init__(self, message, issues=()):
+        super().__init__(message)
+        self.issues = list(issues)
+
+
+def _path_issue(path, pointer):
+    # 路径语法错误不影响保存，只作为警告提示
+    try:
+        compile_path(path)
+    except PathSyntaxError as e:
+        return [Issue(pointer, WARNING, str(e))]
+    return ()
+
+
+def _as_int(value):
+    # bool 是 int 的子类，但不是合法的整数取值
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# 参数规则：每条规则接收 (参数, 参数名, JSON Pointer 前缀)，返回问题列表
+
+def _rule_friendly_name(param, name, base):
+    if not param.friendly_name:
+        return [Issue(f"{base}/friendly_name", ERROR, f"在参数 {name} 上缺少友好名称")]
+    return ()
+
+
+def _rule_integer_range(param, name, base):
+    issues = []
+    min_value = _as_int(param.min_value)
+    max_value = _as_int(param.max_value)
+    value = _as_int(param.value)
+    if param.min_value is None:
+        issues.append(Issue(f"{base}/min_value", ERROR, f"在参数 {name} 上缺少最小值"))
+    elif min_value is None:
+        issues.append(Issue(f"{base}/min_value", ERROR, f"在参数 {name} 上最小值不是整数"))
+    if param.max_value is None:
+        issues.append(Issue(f"{base}/max_value", ERROR, f"在参数 {name} 上缺少最大值"))
+    elif max_value is None:
+        issues.append(Issue(f"{base}/max_value", ERROR, f"在参数 {name} 上最大值不是整数"))
+    if value is None:
+        issues.append(Issue(f"{base}/value", ERROR, f"在参数 {name} 上值不是整数"))
+    if min_value is not None and max_value is not None and min_value > max_value:
+        issues.append(Issue(f"{base}/max_value", ERROR, f"在参数 {name} 上最小值大于最大值"))
+    if value is not None and max_value is not None and value > max_value:
+        issues.append(Issue(f"{base}/value", ERROR, f"在参数 {name} 上值大于最大值"))
+    if value is not None and min_value is not None and value < min_value:
+        issues.append(Issue(f"{base}/value", ERROR, f"在参数 {name} 上值小于最小值"))
+    return issues
+
+
+def _rule_boolean_value(param, name, base):
+    if not isinstance(param.value, bool):
+        return [Issue(f"{base}/value", WARNING, f"在参数 {name} 上默认值不是布尔值")]
+    return ()
+
+
+def _rule_list_split_str(param, name, base):
+    if param.split_str is None:
+        return [Issue(f"{base}/split_str", ERROR, f"在参数 {name} 上缺少分割符")]
+    return ()
+
+
+def _rule_list_value(param, name, base):
+    if not isinstance(param.value, list):
+        return [Issue(f"{base}/value", WARNING, f"在参数 {name} 上默认值不是列表")]
+    return ()
+
+
+def _rule_enum_values(param, name, base):
+    issues = []
+    if not param.friendly_value:
+        issues.append(Issue(f"{base}/friendly_value", ERROR, f"在参数 {name} 上缺少友好值列表"))
+    if not param.value:
+        issues.append(Issue(f"{base}/value", ERROR, f"在参数 {name} 上缺少值列表"))
+    # 验证友好值列表与值列表长度是否一致
+    if param.friendly_value and param.value and len(param.friendly_value) != len(param.value):
+        issues.append(Issue(f"{base}/friendly_value", ERROR,
+                            f"在参数 {name} 上枚举类型的友好值列表与值列表长度不匹配"))
+    return issues
+
+
+# 所有类型共用的规则
+COMMON_PARAMETER_RULES = (_rule_friendly_name,)
+
+# 参数类型 -> 规则元组，模块加载时编译一次，验证时直接按类型查表
+PARAMETER_RULES = {
+    "integer": (_rule_integer_range,) + COMMON_PARAMETER_RULES,
+    "boolean": (_rule_boolean_value,) + COMMON_PARAMETER_RULES,
+    "list": (_rule_list_split_str, _rule_list_value) + COMMON_PARAMETER_RULES,
+    "string": COMMON_PARAMETER_RULES,
+    "enum": (_rule_enum_values,) + COMMON_PARAMETER_RULES,
+}
+assert set(PARAMETER_RULES) == set(PARAM_TYPES)
+
+
+def check_parameter(param, index=None) -> list:
+    """检查单个参数，index 为其在 parameters 中的位置；为 None 时返回相对于该参数的位置"""
+    base = f"/parameters/{index}" if index is not None else ""
+    rules = PARAMETER_RULES.get(param.type)
+    if rules is None:
+        issues = [Issue(f"{base}/type", ERROR, f"在参数 {param.name} 上存在无效的参数类型: {param.type}")]
+        rules = COMMON_PARAMETER_RULES
+    else:
+        issues = []
+    for rule in rules:
+        issues.extend(rule(param, param.name, base))
+    return issues
+
+
+def check_data_group(group, index=None) -> list:
+    """检查单个数据组及其中的数据项；index 为 None 时返回相对于该数据组的位置"""
+    base = f"/response/others/{index}" if index is not None else ""
+    issues = []
+    if not group.friendly_name:
+        issues.append(Issue(f"{base}/friendly_name", WARNING, "数据组缺少名称"))
+    for item_index, item in enumerate(group.data):
+        item_base = f"{base}/data/{item_index}"
+        name = item.friendly_name
+        if not item.path:
+            issues.append(Issue(f"{item_base}/path", WARNING, f"在数据项 {name} 上缺少数据路径"))
+        else:
+            issues.extend(_path_issue(item.path, f"{item_base}/path"))
+        if item.type not in ITEM_TYPES:
+            issues.append(Issue(f"{item_base}/type", ERROR, f"在数据项 {name} 上存在无效的数据类型: {item.type}"))
+        elif item.one_to_one_mapping and item.type != "list":
+            issues.append(Issue(f"{item_base}/one-to-one-mapping", WARNING,
+                                f"在数据项 {name} 上只有列表类型可以启用一对一映射"))
+    return issues
+
+
+def check_basic(config) -> list:
+    """检查基本信息与图像配置"""
+    issues = []
+    if config.APICORE_version not in APICORE_VERSIONS:
+        issues.append(Issue("/APICORE_version", ERROR, "无效的版本号"))
+    if not config.link:
+        issues.append(Issue("/link", ERROR, "缺少必要的API配置: link"))
+    if not config.func:
+        issues.append(Issue("/func", ERROR, "缺少必要的API配置: func"))
+    if not config.friendly_name:
+        issues.append(Issue("/friendly_name", ERROR, "缺少API接口名称"))
+
+    image = config.image
+    if not image.content_type:
+        issues.append(Issue("/response/image/content_type", ERROR, "缺少图像类型"))
+    elif image.content_type not in CONTENT_TYPES:
+        issues.append(Issue("/response/image/content_type", ERROR, f"无效的图像类型: {image.content_type}"))
+    if image.content_type != "BINARY" and not image.path:
+        issues.append(Issue("/response/image/path", ERROR, "缺少图像路径"))
+    elif image.path:
+        issues.extend(_path_issue(image.path, "/response/image/path"))
+    return issues
+
+
+def check(config) -> list:
+    """运行全部规则，返回所有问题"""
+    issues = check_basic(config)
+    for index, param in enumerate(config.parameters):
+        issues.extend(check_parameter(param, index))
+    for index, group in enumerate(config.others):
+        issues.extend(check_data_group(group, index))
+    return issues
+
+
+def errors(issues) -> list:
+    return [issue for issue in issues if issue.severity == ERROR]
+
+
+def validate(config):
+    """验证配置，存在错误时抛出包含全部问题的 ValidationError"""
+    issues = check(config)
+    found = errors(issues)
+    if found:
+        message = found[0].message
+        if len(found) > 1:
+            message += f"（另有 {len(found) - 1} 个错误）"
+        raise ValidationError(message, issues)
+    return issues
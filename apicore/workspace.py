@@ -0,0 +1,326 @@
+"""工作区索引
+
+把目录中的全部配置文件的摘要（名称、链接、请求方法、参数名称与类型、数据组名称、文件摘要与
+修改时间）保存在本地 SQLite 数据库中，并对这些字段建立全文索引，无需逐个打开文件即可搜索。
+
+重新索引是增量的：修改时间与大小都未变化的文件直接跳过；变化的文件在进程池中读取并计算
+sha256，内容与索引中相同时只更新修改时间，不同时才重新解析。已删除的文件从索引中移除。
+
+    index = WorkspaceIndex()
+    stats = index.update(get_config_dir())
+    for entry in index.search("壁纸 random"):
+        print(entry.path, entry.friendly_name)
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from . import serialize
+from .batch import DEFAULT_PATTERN, find_config_files
+from .model import Config
+
+DEFAULT_INDEX_PATH = str(Path.home() / ".apicore_editor" / "workspace.sqlite3")
+# 需要读取的文件少于该数量时不启动进程池
+POOL_THRESHOLD = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    root TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    friendly_name TEXT NOT NULL,
+    link TEXT NOT NULL,
+    func TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    data_groups TEXT NOT NULL,
+    error TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_root ON files (root);
+"""
+# 全文索引的行号与 files.id 相同
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    friendly_name, link, func, parameters, data_groups, path
+);
+"""
+_COLUMNS = ("path", "root", "mtime_ns", "size", "hash", "friendly_name", "link", "func",
+            "parameters", "data_groups", "error")
+
+
+class WorkspaceError(Exception):
+    """索引数据库无法使用"""
+
+
+class Entry:
+    """索引中的一个配置文件；parameters 为 [(名称, 类型)]，error 为无法解析时的错误信息"""
+
+    __slots__ = ("path", "friendly_name", "link", "func", "parameters", "data_groups", "hash", "mtime_ns",
+                 "error")
+
+    def __init__(self, path, friendly_name="", link="", func="", parameters=(), data_groups=(), hash="",
+                 mtime_ns=0, error=""):
+        self.path = path
+        self.friendly_name = friendly_name
+        self.link = link
+        self.func = func
+        self.parameters = list(parameters)
+        self.data_groups = list(data_groups)
+        self.hash = hash
+        self.mtime_ns = mtime_ns
+        self.error = error
+
+    @property
+    def name(self) -> str:
+        """显示用的名称，没有 friendly_name 时为文件名"""
+        return self.friendly_name or os.path.basename(self.path)
+
+    def __repr__(self):
+        return f"Entry({self.path!r}, {self.friendly_name!r})"
+
+
+class IndexStats:
+    """一次重新索引的统计"""
+
+    __slots__ = ("added", "updated", "touched", "unchanged", "removed", "seconds")
+
+    def __init__(self):
+        self.added = 0
+        # 内容变化后重新解析的文件
+        self.updated = 0
+        # 修改时间变化但内容相同的文件
+        self.touched = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.seconds = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.added + self.updated + self.touched + self.unchanged
+
+    def __repr__(self):
+        return (f"IndexStats(added={self.added}, updated={self.updated}, touched={self.touched}, "
+                f"unchanged={self.unchanged}, removed={self.removed}, seconds={self.seconds:.3f})")
+
+
+def summarize(path, known_hash=None):
+    """读取文件，返回 (路径, 修改时间, 大小, 摘要, 字段)；内容摘要等于 known_hash 时字段为 None"""
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    file_hash = hashlib.sha256(data).hexdigest()
+    if file_hash == known_hash:
+        return path, stat.st_mtime_ns, stat.st_size, file_hash, None
+    try:
+        config = Config.from_dict(serialize.loads(data))
+        fields = {
+            "friendly_name": str(config.friendly_name),
+            "link": str(config.link),
+            "func": str(config.func),
+            "parameters": [[str(p.name), str(p.type)] for p in config.parameters],
+            "data_groups": [str(g.friendly_name) for g in config.others],
+            "error": "",
+        }
+    except Exception as e:
+        fields = {"friendly_name": "", "link": "", "func": "", "parameters": [], "data_groups": [],
+                  "error": f"{type(e).__name__}: {e}"}
+    return path, stat.st_mtime_ns, stat.st_size, file_hash, fields
+
+
+def _summarize_chunk(items) -> list:
+    # 在子进程中处理一批文件，减少进程间通信次数
+    results = []
+    for path, known_hash in items:
+        try:
+            results.append(summarize(path, known_hash))
+        except OSError:
+            # 扫描之后被删除或无法读取的文件，下次重新索引时再处理
+            results.append(None)
+    return results
+
+
+def summarize_files(items, jobs=None) -> list:
+    """并行处理 [(路径, 已知的摘要)]，返回与输入顺序一致的结果（无法读取的文件为 None）"""
+    items = list(items)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) < POOL_THRESHOLD:
+        return _summarize_chunk(items)
+    chunk_size = max(1, min(256, len(items) // (jobs * 8)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    # 只在需要进程池时导入 multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        for chunk_results in executor.map(_summarize_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def fts_query(text) -> str:
+    """把输入的关键词转换为 FTS5 查询：每个词按前缀匹配，全部词都需要出现"""
+    terms = []
+    for word in text.split():
+        word = word.replace('"', '""')
+        terms.append(f'"{word}"*')
+    return " ".join(terms)
+
+
+class WorkspaceIndex:
+    """保存在 SQLite 数据库中的工作区索引；每个线程使用各自的 WorkspaceIndex"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            self._db = sqlite3.connect(path, timeout=30)
+            # 后台重新索引写入时，界面线程仍可以读取
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            raise WorkspaceError(f"无法打开索引数据库 {path}: {e}") from None
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite 编译时未包含 FTS5，搜索改为逐字段的子串匹配
+            self.full_text = False
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def count(self, root=None) -> int:
+        if root is None:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return self._db.execute("SELECT COUNT(*) FROM files WHERE root = ?", (_normalize(root),)).fetchone()[0]
+
+    def update(self, root, pattern=DEFAULT_PATTERN, jobs=None, paths=None) -> IndexStats:
+        """增量地重新索引 root 中匹配 pattern 的文件
+
+        paths 不为 None 时只处理其中的文件（例如目录监视器报告的变化），不遍历目录；
+        其中已不存在的文件从索引中移除。
+        """
+        start = time.perf_counter()
+        root = _normalize(root)
+        stats = IndexStats()
+        known = {path: (mtime_ns, size, file_hash) for path, mtime_ns, size, file_hash in self._db.execute(
+            "SELECT path, mtime_ns, size, hash FROM files WHERE root = ?", (root,))}
+
+        if paths is None:
+            candidates = find_config_files(root, pattern)
+        else:
+            paths = {os.path.abspath(path) for path in paths}
+            candidates = sorted(path for path in paths if path.startswith(root + os.sep))
+        changed = []
+        found = set()
+        for path in candidates:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.add(path)
+            previous = known.get(path)
+            if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                stats.unchanged += 1
+            else:
+                changed.append((path, previous[2] if previous is not None else None))
+        removed = [path for path in (known if paths is None else paths)
+                   if path in known and path not in found]
+
+        results = summarize_files(changed, jobs)
+        with self._db:
+            for path in removed:
+                self._delete(path)
+            stats.removed = len(removed)
+            for result in results:
+                if result is None:
+                    continue
+                path, mtime_ns, size, file_hash, fields = result
+                if fields is None:
+                    self._db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                                     (mtime_ns, size, path))
+                    stats.touched += 1
+                    continue
+                if path in known:
+                    self._delete(path)
+                    stats.updated += 1
+                else:
+                    stats.added += 1
+                self._insert(root, path, mtime_ns, size, file_hash, fields)
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def search(self, text="", root=None, limit=200) -> list:
+        """搜索名称、链接、请求方法、参数与数据组名称；text 为空时按名称列出全部文件"""
+        conditions, arguments = [], []
+        if root is not None:
+            conditions.append("files.root = ?")
+            arguments.append(_normalize(root))
+        text = text.strip()
+        if text and self.full_text:
+            sql = "SELECT files.* FROM files_fts JOIN files ON files.id = files_fts.rowid"
+            conditions.append("files_fts MATCH ?")
+            arguments.append(fts_query(text))
+            order = "files_fts.rank"
+        else:
+            sql = "SELECT * FROM files"
+            for word in text.split():
+                pattern = "%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                conditions.append("(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in
+                                                    ("friendly_name", "link", "func", "parameters",
+                                                     "data_groups", "path")) + ")")
+                arguments.extend([pattern] * 6)
+            order = "friendly_name, path"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} LIMIT ?"
+        arguments.append(limit)
+        try:
+            rows = self._db.execute(sql, arguments).fetchall()
+        except sqlite3.OperationalError as e:
+            raise WorkspaceError(f"无效的搜索: {e}") from None
+        return [_entry(row) for row in rows]
+
+    def _insert(self, root, path, mtime_ns, size, file_hash, fields):
+        values = (path, root, mtime_ns, size, file_hash, fields["friendly_name"], fields["link"], fields["func"],
+                  serialize.dumps_canonical(fields["parameters"]).decode("utf-8"),
+                  serialize.dumps_canonical(fields["data_groups"]).decode("utf-8"), fields["error"])
+        cursor = self._db.execute(
+            f"INSERT INTO files ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", values)
+        if self.full_text:
+            self._db.execute(
+                "INSERT INTO files_fts (rowid, friendly_name, link, func, parameters, data_groups, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cursor.lastrowid, fields["friendly_name"], fields["link"], fields["func"],
+                 " ".join(f"{name} {type}" for name, type in fields["parameters"]),
+                 "\n".join(fields["data_groups"]), path))
+
+    def _delete(self, path):
+        row = self._db.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        if self.full_text:
+            self._db.execute("DELETE FROM files_fts WHERE rowid = ?", row)
+        self._db.execute("DELETE FROM files WHERE id = ?", row)
+
+
+def _normalize(root) -> str:
+    return os.path.abspath(root)
+
+
+def _entry(row) -> Entry:
+    (_, path, _, mtime_ns, _, file_hash, friendly_name, link, func, parameters, data_groups, error) = row
+    return Entry(path, friendly_name, link, func, [tuple(p) for p in serialize.loads(parameters)],
+                 serialize.loads(data_groups), file_hash, mtime_ns, error)
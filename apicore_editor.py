@@ -1,29 +1,68 @@
 import sys
-import json
 import os
 import sys
-import subprocess, webbrowser
+import math
+import time
 import logging
 
-# 配置日志系统
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("apicore_editor.log"),
-        logging.StreamHandler()
-    ]
-)
+# 开始执行本模块的时间，--startup-benchmark 从这里开始计时
+STARTED_AT = time.perf_counter()
+
+# 命令行子命令（如 validate）无需图形界面，在导入 PyQt5 之前交给 apicore 处理
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from apicore.cli import COMMANDS, main as cli_main
+    if sys.argv[1] in COMMANDS:
+        sys.exit(cli_main(sys.argv[1:]))
+
 logger = logging.getLogger("APICORE_Editor")
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QLineEdit, QTextEdit, QComboBox, QCheckBox, QSpinBox, 
     QPushButton, QFileDialog, QTabWidget, QGroupBox, QListWidget, 
-    QListWidgetItem, QMessageBox, QScrollArea, QSplitter
+    QListWidgetItem, QMessageBox, QScrollArea, QSplitter, QStyle,
+    QTableWidget, QTableWidgetItem, QHeaderView, QDockWidget, QAbstractItemView, QTableView, QTreeView
 )
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QIcon, QPixmap, QFont
+from PyQt5.QtCore import Qt, QSize, QEvent, QEventLoop, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QPixmap, QFont, QColor, QKeySequence
+
+import apicore
+from apicore import Config, DataGroup, DataItem, ImageSpec, Parameter, HTTP_METHODS, ValidationError
+from apicore.live import BASIC, PARAMETER, DATA_GROUP
+from apicore.blobs import BlobStore, decode_data_uri, describe, encode_data_uri, guess_mime_type, is_inline
+from apicore.history import History, Insert, Remove, SetField, Update, state
+from apicore.imagedata import sample_image_sources
+from apicore.request import ParameterSpace, materialize
+from apicore.journal import Journal, JournalError, JournalLock, find_orphans, remove_journal, replay as replay_journal
+from apicore.lazy import LAZY_THRESHOLD, LazyConfig, LazyLoadError
+from apicore.dirindex import BROKEN, FAILED, PASSED
+from apicore.workspace import DEFAULT_INDEX_PATH, WorkspaceError, WorkspaceIndex
+from apicore.snapshot import ChangeTracker, config_digest
+from apicore.simulate import IMAGE, SampleCache
+from QtWorkers.ImageDecoder import ImageDecoder
+from QtWorkers.ConfigSaver import ConfigSaver
+from QtWorkers.LiveValidator import LiveValidator
+from QtWorkers.SampleExtractor import SampleExtractor
+from QtWorkers.WorkspaceIndexer import WorkspaceIndexer
+from QtWorkers.DirectoryWatcher import DirectoryWatcher
+from QtModels.ParameterListModel import ParameterListModel
+from QtModels.DataGroupTreeModel import DataGroupTreeModel
+
+def setup_logging():
+    # 配置日志系统；启动编辑器时才创建日志文件，导入本模块（例如基准测试）不会写入日志文件
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("apicore_editor.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+def open_url(url):
+    # 在浏览器中打开文档，使用时才导入 webbrowser
+    import webbrowser
+    webbrowser.open(url)
 
 class QMessageBoxEx(QMessageBox):
     def information(self, title, message):
@@ -35,7 +74,14 @@ class QMessageBoxEx(QMessageBox):
         msg.exec_()
 
 class APICoreEditor(QMainWindow):
-    def __init__(self):
+    # 图标不在文本框中编辑时，由 set_icon 发出
+    icon_changed = pyqtSignal()
+    # 编辑日志写入失败，由日志的写入线程发出
+    journal_failed = pyqtSignal(str)
+    
+    def __init__(self, journal_path=None):
+        """journal_path 为 None 时使用本进程在 ~/.apicore_editor 中的编辑日志，同一目录中
+        已退出的编辑器留下的日志可以恢复"""
         super().__init__()
         
         # 设置全局样式表
@@ -48,7 +94,45 @@ class APICoreEditor(QMainWindow):
             QMessageBox.warning(self, "警告", "未找到样式表文件 css/modern.css 将使用默认样式。", QMessageBox.Ok)
         
         self.current_file = None
+        # 图标按内容保存在会话的存储中，表单只引用同一个字符串对象
+        self.blob_store = BlobStore()
+        self.icon_value = ""
+        self._updating_icon = False
+        self._config_extra = {}
+        self._response_extra = {}
+        self._image_extra = {}
+        # 按需打开的大文件，参数与数据组在首次查看时读取
+        self.lazy_config = None
+        
+        # 实时验证：编辑时只重新验证改动的参数或数据组
+        self.live_validator = LiveValidator(self)
+        self.live_validator.updated.connect(self.on_live_validation_updated)
+        
+        # 变更跟踪：编辑时增量更新摘要，检查是否有未保存的更改不需要重新读取文件
+        self.change_tracker = ChangeTracker()
+        
+        # 后台保存：序列化与写入在工作线程中进行
+        self.config_saver = ConfigSaver(self)
+        self.config_saver.saved.connect(self.on_config_saved)
+        self.config_saver.save_failed.connect(self.on_config_save_failed)
+        
+        # 编辑日志：未保存的编辑在后台追加写入，异常退出后可以恢复；每个进程使用自己的日志
+        self.journal = Journal(journal_path, snapshot=self.journal_snapshot, on_error=self.journal_failed.emit)
+        self.journal_failed.connect(self.on_journal_failed)
+        
+        # 撤销与重做：命令只保存改动的部分，字段值与模型共享
+        self.history = History()
+        self._field_values = {}
+        self._applying_history = False
+        
         self.init_ui()
+        self.change_tracker.reset(self.create_config_from_forms())
+        self.start_history()
+        
+        # 先取得本进程日志的锁，再查找已退出的编辑器留下的日志
+        self.journal.start()
+        if not self.recover_from_journal():
+            self.journal.reset(None)
         
     def init_ui(self):
         # 设置窗口标题和大小
@@ -73,15 +157,109 @@ class APICoreEditor(QMainWindow):
         # 创建基本配置标签页
         self.create_basic_config_tab()
         
-        # 创建参数配置标签页
-        self.create_parameters_tab()
+        # 参数与响应配置的控件很多，先添加空白的标签页，首次绘制后的空闲时或首次切换到时再创建
+        self.parameters_tab = QWidget()
+        self.tabs.addTab(self.parameters_tab, "参数配置")
+        self.response_tab = QWidget()
+        self.tabs.addTab(self.response_tab, "响应配置")
+        self.tabs_built = False
+        # 首次绘制的时间，--startup-benchmark 使用
+        self.first_paint_time = None
         
-        # 创建响应配置标签页
-        self.create_response_tab()
+        # 参数与数据组的模型，视图在创建标签页时设置
+        self.parameter_model = ParameterListModel(self.live_validator.issues_for, self)
+        self.data_model = DataGroupTreeModel(self.live_validator.issues_for, self)
+        
+        # 初始化数据存储
+        self.parameters = []
+        self.parameter_model.set_parameters(self.parameters)
+        self.data_groups = []
+        self.data_model.set_groups(self.data_groups)
+        self.current_param_index = -1
+        self.current_group_index = -1
+        self.current_item_index = -1
+        
+        # 创建工作区面板
+        self.create_workspace_dock()
         
         # 创建状态栏
         self.statusBar().showMessage("就绪")
         
+        # 状态栏右侧显示实时验证结果
+        self.issue_count_label = QLabel()
+        self.statusBar().addPermanentWidget(self.issue_count_label)
+        
+        # 基本信息变化时重新验证，图像配置在创建响应配置标签页时连接
+        for signal in (self.friendly_name_edit.textChanged, self.link_edit.textChanged,
+                       self.func_combo.currentTextChanged, self.version_combo.currentTextChanged):
+            signal.connect(self.mark_basic_dirty)
+        # 不参与验证的字段只需要更新变更跟踪
+        for signal in (self.intro_edit.textChanged, self.icon_changed):
+            signal.connect(self.mark_basic_changed)
+        
+        # 字段的修改记录到编辑日志与撤销历史；名称 -> (读取, 写入)
+        self.fields = {}
+        self.register_fields((
+                ("friendly_name", self.friendly_name_edit.textChanged, self.friendly_name_edit.text,
+                 self.friendly_name_edit.setText),
+                ("intro", self.intro_edit.textChanged, self.intro_edit.toPlainText, self.intro_edit.setPlainText),
+                ("icon", self.icon_changed, lambda: self.icon_value, self.set_icon),
+                ("link", self.link_edit.textChanged, self.link_edit.text, self.link_edit.setText),
+                ("func", self.func_combo.currentTextChanged, self.func_combo.currentText,
+                 self.func_combo.setCurrentText),
+                ("APICORE_version", self.version_combo.currentTextChanged, self.version_combo.currentText,
+                 self.version_combo.setCurrentText)))
+        self.mark_basic_dirty()
+        
+        # 链接和请求方法变化时更新请求预览；预览需要遍历全部参数，连续的修改只生成一次
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(200)
+        self.preview_timer.timeout.connect(self.update_request_preview)
+        self.link_edit.textChanged.connect(self.schedule_request_preview)
+        self.func_combo.currentTextChanged.connect(self.schedule_request_preview)
+        
+        # 首次切换到参数或响应配置时创建标签页，按需打开的文件读取对应的部分
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        
+    def event(self, event):
+        # 首次绘制之后，在空闲时创建参数与响应配置标签页
+        if event.type() == QEvent.Paint and self.first_paint_time is None:
+            self.first_paint_time = time.perf_counter()
+            QTimer.singleShot(0, self.build_tabs)
+        return super().event(event)
+        
+    def build_tabs(self):
+        """创建参数与响应配置标签页；需要读写其中的表单时（打开、新建文件）先调用"""
+        if self.tabs_built:
+            return
+        self.create_parameters_tab()
+        self.create_response_tab()
+        self.tabs_built = True
+        
+        # 图像配置变化时重新验证，修改记录到编辑日志与撤销历史
+        for signal in (self.image_content_type_combo.currentTextChanged, self.image_path_edit.textChanged):
+            signal.connect(self.mark_basic_dirty)
+        for signal in (self.image_is_list_check.toggled, self.image_is_base64_check.toggled):
+            signal.connect(self.mark_basic_changed)
+        self.register_fields((
+                ("image.content_type", self.image_content_type_combo.currentTextChanged,
+                 self.image_content_type_combo.currentText, self.image_content_type_combo.setCurrentText),
+                ("image.path", self.image_path_edit.textChanged, self.image_path_edit.text,
+                 self.image_path_edit.setText),
+                ("image.is_list", self.image_is_list_check.toggled, self.image_is_list_check.isChecked,
+                 self.image_is_list_check.setChecked),
+                ("image.is_base64", self.image_is_base64_check.toggled, self.image_is_base64_check.isChecked,
+                 self.image_is_base64_check.setChecked)))
+        self.update_request_preview()
+        
+    def register_fields(self, fields):
+        # fields 为 (名称, 修改信号, 读取, 写入)
+        for name, signal, getter, setter in fields:
+            self.fields[name] = (getter, setter)
+            self._field_values[name] = getter()
+            signal.connect(lambda *args, name=name: self.on_field_edited(name))
+        
     def create_menu_bar(self):
         # 创建菜单栏
         menu_bar = self.menuBar()
@@ -95,15 +273,20 @@ class APICoreEditor(QMainWindow):
         
         # 打开文件动作
         open_action = file_menu.addAction("打开")
-        open_action.triggered.connect(self.open_file)
+        open_action.triggered.connect(lambda _: self.open_file())
+        
+        # 工作区：搜索配置目录中的全部文件
+        self.workspace_action = file_menu.addAction("工作区")
+        self.workspace_action.setCheckable(True)
+        self.workspace_action.toggled.connect(lambda checked: self.workspace_dock.setVisible(checked))
         
         # 保存文件动作
         save_action = file_menu.addAction("保存")
-        save_action.triggered.connect(self.save_file)
+        save_action.triggered.connect(lambda _: self.save_file())
         
         # 另存为动作
         save_as_action = file_menu.addAction("另存为")
-        save_as_action.triggered.connect(self.save_file_as)
+        save_as_action.triggered.connect(lambda _: self.save_file_as())
         
         file_menu.addSeparator()
         
@@ -111,24 +294,35 @@ class APICoreEditor(QMainWindow):
         validate_action = file_menu.addAction("验证配置")
         validate_action.triggered.connect(lambda _: self.validate_config(True))
         
+        # 编辑菜单
+        edit_menu = menu_bar.addMenu("编辑")
+        
+        self.undo_action = edit_menu.addAction("撤销")
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.undo_action.triggered.connect(lambda _: self.undo())
+        
+        self.redo_action = edit_menu.addAction("重做")
+        self.redo_action.setShortcut(QKeySequence.Redo)
+        self.redo_action.triggered.connect(lambda _: self.redo())
+        
         #文档菜单
         wiki_menu = menu_bar.addMenu("文档")
         create_action = wiki_menu.addAction("创建配置文件")
-        create_action.triggered.connect(lambda: webbrowser.open("https://github.com/SRON-org/APICORE/wiki/Create-a-New-APICORE-Configuration-File"))
+        create_action.triggered.connect(lambda: open_url("https://github.com/SRON-org/APICORE/wiki/Create-a-New-APICORE-Configuration-File"))
         
         complete_action = wiki_menu.addAction("复杂路径配置")
-        complete_action.triggered.connect(lambda: webbrowser.open("https://github.com/SRON-org/APICORE/wiki/Complex-Configuration"))
+        complete_action.triggered.connect(lambda: open_url("https://github.com/SRON-org/APICORE/wiki/Complex-Configuration"))
         
         wiki_menu.addSeparator()
         
         repo_action = wiki_menu.addAction("APICORE 仓库")
-        repo_action.triggered.connect(lambda: webbrowser.open("https://github.com/SRON-org/APICORE"))
+        repo_action.triggered.connect(lambda: open_url("https://github.com/SRON-org/APICORE"))
         
         # 帮助菜单
         help_menu = menu_bar.addMenu("帮助")
         
         repo_action_2 = help_menu.addAction("前往仓库")
-        repo_action_2.triggered.connect(lambda: webbrowser.open("https://github.com/SRON-org/APICORE_Editor"))
+        repo_action_2.triggered.connect(lambda: open_url("https://github.com/SRON-org/APICORE_Editor"))
         
         # 关于动作
         about_action = help_menu.addAction("关于")
@@ -174,15 +368,40 @@ class APICoreEditor(QMainWindow):
         icon_label = QLabel("API接口图标URL")
         icon_label.setMinimumWidth(120)
         self.icon_edit = QLineEdit()
-        self.icon_edit.setPlaceholderText("请输入API接口图标URL，或使用右侧工具转换后粘贴")
+        self.icon_edit.setPlaceholderText("请输入API接口图标URL，或选择图片、粘贴转换后的图标")
+        self.icon_edit.textChanged.connect(self.on_icon_text_edited)
+        self.icon_file_btn = QPushButton("选择图片")
+        self.icon_file_btn.setFixedWidth(100)
+        self.icon_file_btn.clicked.connect(self.choose_icon_file)
+        self.icon_paste_btn = QPushButton("粘贴图标")
+        self.icon_paste_btn.setFixedWidth(100)
+        self.icon_paste_btn.clicked.connect(self.paste_icon)
         self.icon_converter_btn = QPushButton("转换图片")
         self.icon_converter_btn.setFixedWidth(100)
         self.icon_converter_btn.clicked.connect(self.open_image_converter)
         icon_layout.addWidget(icon_label)
         icon_layout.addWidget(self.icon_edit)
+        icon_layout.addWidget(self.icon_file_btn)
+        icon_layout.addWidget(self.icon_paste_btn)
         icon_layout.addWidget(self.icon_converter_btn)
         basic_group_layout.addLayout(icon_layout)
         
+        # 内嵌图标（data URI）不放入文本框，只显示缩略图、大小与摘要
+        icon_preview_layout = QHBoxLayout()
+        icon_preview_layout.addSpacing(120)
+        self.icon_preview = QLabel()
+        self.icon_preview.setFixedSize(48, 48)
+        self.icon_preview.setAlignment(Qt.AlignCenter)
+        self.icon_info_label = QLabel("未设置图标")
+        self.icon_clear_btn = QPushButton("清除图标")
+        self.icon_clear_btn.setFixedWidth(100)
+        self.icon_clear_btn.clicked.connect(lambda: self.set_icon(""))
+        icon_preview_layout.addWidget(self.icon_preview)
+        icon_preview_layout.addWidget(self.icon_info_label, 1)
+        icon_preview_layout.addWidget(self.icon_clear_btn)
+        basic_group_layout.addLayout(icon_preview_layout)
+        self.update_icon_preview()
+        
         # link
         link_layout = QHBoxLayout()
         link_label = QLabel("API接口链接 (*)")
@@ -229,9 +448,8 @@ class APICoreEditor(QMainWindow):
         self.tabs.addTab(basic_config_tab, "基本配置")
         
     def create_parameters_tab(self):
-        # 创建参数配置标签页
-        parameters_tab = QWidget()
-        parameters_layout = QHBoxLayout(parameters_tab)
+        # 在空白的参数配置标签页中创建控件
+        parameters_layout = QHBoxLayout(self.parameters_tab)
         parameters_layout.setContentsMargins(10, 10, 10, 10)
         
         # 创建左侧参数列表
@@ -245,7 +463,20 @@ class APICoreEditor(QMainWindow):
         list_label.setStyleSheet("font-weight: bold;")
         left_layout.addWidget(list_label)
         
-        self.parameters_list = QListWidget()
+        # 参数很多时列表只绘制可见的行，增删改只通知受影响的行。
+        # 使用单列、固定行高的表格：QListView 在任意一行的数据变化后都会重新布局全部行
+        self.parameters_list = QTableView()
+        self.parameters_list.setModel(self.parameter_model)
+        self.parameters_list.horizontalHeader().hide()
+        self.parameters_list.horizontalHeader().setStretchLastSection(True)
+        self.parameters_list.verticalHeader().hide()
+        self.parameters_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.parameters_list.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.parameters_list.setShowGrid(False)
+        self.parameters_list.setWordWrap(False)
+        self.parameters_list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.parameters_list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.parameters_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.parameters_list.setAlternatingRowColors(True)
         left_layout.addWidget(self.parameters_list)
         
@@ -436,6 +667,17 @@ class APICoreEditor(QMainWindow):
         param_details_layout.addLayout(buttons_layout)
         
         right_layout.addWidget(self.param_details_group)
+        
+        # 请求预览：使用参数默认值生成的请求与参数组合总数
+        request_preview_group = QGroupBox("请求预览")
+        request_preview_layout = QVBoxLayout(request_preview_group)
+        request_preview_layout.setContentsMargins(10, 20, 10, 10)  # 增加顶部边距以避免标题被遮挡
+        self.request_preview_edit = QLineEdit()
+        self.request_preview_edit.setReadOnly(True)
+        self.request_space_label = QLabel()
+        request_preview_layout.addWidget(self.request_preview_edit)
+        request_preview_layout.addWidget(self.request_space_label)
+        right_layout.addWidget(request_preview_group)
         right_layout.addStretch()
         
         # 添加左右两侧到标签页
@@ -448,16 +690,12 @@ class APICoreEditor(QMainWindow):
         # 初始化参数类型相关控件的显示
         self.on_param_type_changed(self.param_type_combo.currentText())
         
-        # 添加标签页到标签控件
-        self.tabs.addTab(parameters_tab, "参数配置")
-        
         # 连接参数列表的选择信号
-        self.parameters_list.itemClicked.connect(self.on_parameter_selected)
+        self.parameters_list.clicked.connect(self.on_parameter_selected)
         
     def create_response_tab(self):
-        # 创建响应配置标签页
-        response_tab = QWidget()
-        response_layout = QVBoxLayout(response_tab)
+        # 在空白的响应配置标签页中创建控件
+        response_layout = QVBoxLayout(self.response_tab)
         response_layout.setContentsMargins(20, 20, 20, 20)
         
         # 创建滚动区域
@@ -527,17 +765,21 @@ class APICoreEditor(QMainWindow):
         others_layout.setSpacing(12)
         others_layout.setContentsMargins(10, 20, 10, 10)  # 增加顶部边距以避免标题被遮挡
         
-        # 数据组列表
+        # 数据组与数据项的树，数据组的数据项在展开或选择时才加入
         data_groups_layout = QVBoxLayout()
-        group_list_label = QLabel("数据组")
+        group_list_label = QLabel("数据组与数据项")
         group_list_label.setStyleSheet("font-weight: bold;")
         data_groups_layout.addWidget(group_list_label)
         
         group_list_h_layout = QHBoxLayout()
-        self.data_groups_list = QListWidget()
-        self.data_groups_list.setAlternatingRowColors(True)
-        self.data_groups_list.setMinimumHeight(150)
-        group_list_h_layout.addWidget(self.data_groups_list)
+        self.data_tree = QTreeView()
+        self.data_tree.setModel(self.data_model)
+        self.data_tree.setHeaderHidden(True)
+        self.data_tree.setUniformRowHeights(True)
+        self.data_tree.setAlternatingRowColors(True)
+        self.data_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.data_tree.setMinimumHeight(270)
+        group_list_h_layout.addWidget(self.data_tree)
         data_groups_layout.addLayout(group_list_h_layout)
         
         # 将数据组布局添加到主布局
@@ -564,20 +806,6 @@ class APICoreEditor(QMainWindow):
         group_friendly_name_layout.addWidget(self.group_friendly_name_edit)
         data_group_details_layout.addLayout(group_friendly_name_layout)
         
-        # 数据项列表
-        data_items_layout = QVBoxLayout()
-        item_list_label = QLabel("数据项")
-        item_list_label.setStyleSheet("font-weight: bold;")
-        data_items_layout.addWidget(item_list_label)
-        
-        item_list_h_layout = QHBoxLayout()
-        self.data_items_list = QListWidget()
-        self.data_items_list.setAlternatingRowColors(True)
-        self.data_items_list.setMinimumHeight(120)
-        item_list_h_layout.addWidget(self.data_items_list)
-        data_items_layout.addLayout(item_list_h_layout)
-        data_group_details_layout.addLayout(data_items_layout)
-        
         # 添加数据项按钮
         add_item_btn = QPushButton("添加数据项")
         add_item_btn.clicked.connect(self.add_data_item)
@@ -672,6 +900,9 @@ class APICoreEditor(QMainWindow):
         others_layout.addWidget(self.data_group_details_group)
         
         scroll_layout.addWidget(others_group)
+        
+        # 样例响应测试
+        scroll_layout.addWidget(self.create_sample_test_group())
         scroll_layout.addStretch()
         
         # 设置滚动区域
@@ -680,19 +911,220 @@ class APICoreEditor(QMainWindow):
         
         response_layout.addWidget(scroll_area)
         
-        # 添加标签页到标签控件
-        self.tabs.addTab(response_tab, "响应配置")
+        # 连接树的选择信号
+        self.data_tree.clicked.connect(self.on_data_tree_clicked)
+        
+    def create_sample_test_group(self):
+        # 使用本地保存的响应样例测试当前配置
+        sample_group = QGroupBox("测试样例响应")
+        sample_layout = QVBoxLayout(sample_group)
+        sample_layout.setSpacing(10)
+        sample_layout.setContentsMargins(10, 20, 10, 10)  # 增加顶部边距以避免标题被遮挡
+        
+        sample_buttons_layout = QHBoxLayout()
+        self.sample_files_label = QLabel("未加载样例文件")
+        load_sample_btn = QPushButton("加载样例文件")
+        load_sample_btn.clicked.connect(self.load_sample_files)
+        self.run_sample_btn = QPushButton("运行测试")
+        self.run_sample_btn.setEnabled(False)
+        self.run_sample_btn.clicked.connect(self.run_sample_test)
+        sample_buttons_layout.addWidget(self.sample_files_label)
+        sample_buttons_layout.addStretch()
+        self.fetch_images_btn = QPushButton("下载图像")
+        self.fetch_images_btn.setEnabled(False)
+        self.fetch_images_btn.clicked.connect(self.fetch_sample_images)
+        sample_buttons_layout.addWidget(load_sample_btn)
+        sample_buttons_layout.addWidget(self.run_sample_btn)
+        sample_buttons_layout.addWidget(self.fetch_images_btn)
+        sample_layout.addLayout(sample_buttons_layout)
+        
+        self.sample_results_table = QTableWidget(0, 5)
+        self.sample_results_table.setHorizontalHeaderLabels(["样例", "数据组", "名称", "路径", "结果"])
+        self.sample_results_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.sample_results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sample_results_table.setMinimumHeight(200)
+        sample_layout.addWidget(self.sample_results_table)
+        
+        # 图像地址下载后的缩略图，按到达顺序显示
+        self.sample_images_list = QListWidget()
+        self.sample_images_list.setViewMode(QListWidget.IconMode)
+        self.sample_images_list.setIconSize(QSize(96, 96))
+        self.sample_images_list.setResizeMode(QListWidget.Adjust)
+        self.sample_images_list.setUniformItemSizes(True)
+        self.sample_images_list.setMinimumHeight(130)
+        self.sample_images_list.setVisible(False)
+        sample_layout.addWidget(self.sample_images_list)
+        
+        # 样例文件列表、结果缓存与后台线程
+        self.sample_files = []
+        self.sample_cache = SampleCache()
+        self.sample_extractor = None
+        self.sample_rerun_pending = False
+        self.sample_image_urls = []
+        self.image_fetcher = None
+        self.image_decoder = None
+        self.pending_image_sources = None
+        
+        return sample_group
+        
+    def load_sample_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "选择响应样例文件", "", "JSON文件 (*.json);;所有文件 (*)")
+        if not file_paths:
+            return
         
-        # 连接列表的选择信号
-        self.data_groups_list.itemClicked.connect(self.on_data_group_selected)
-        self.data_items_list.itemClicked.connect(self.on_data_item_selected)
+        self.sample_files = file_paths
+        self.sample_files_label.setText(f"已加载 {len(file_paths)} 个样例文件")
+        self.run_sample_btn.setEnabled(True)
+        self.run_sample_test()
         
-        # 初始化数据存储
-        self.parameters = []
-        self.data_groups = []
-        self.current_param_index = -1
-        self.current_group_index = -1
-        self.current_item_index = -1
+    def run_sample_test(self):
+        if not self.sample_files:
+            return
+        
+        # 上一次测试尚未完成时，完成后再运行一次
+        if self.sample_extractor is not None:
+            self.sample_rerun_pending = True
+            return
+        
+        if not self.load_pending():
+            return
+        self.statusBar().showMessage("正在使用样例响应测试配置...")
+        # 编辑器持有的模型在测试期间仍可编辑，后台线程使用副本
+        config = Config.from_dict(self.create_config_from_forms().to_dict())
+        self.sample_extractor = SampleExtractor(config, self.sample_files, self.sample_cache)
+        self.sample_extractor.extraction_complete.connect(self.on_sample_test_complete)
+        self.sample_extractor.extraction_error.connect(self.on_sample_test_error)
+        self.sample_extractor.finished.connect(self.on_sample_extractor_finished)
+        self.sample_extractor.start()
+        
+    def on_sample_test_complete(self, results, alignment, seconds):
+        # 只列出不对应的一一对应数据项
+        misaligned = [result for result in alignment if not result.ok]
+        self.sample_results_table.setRowCount(len(results) + len(misaligned))
+        for row, result in enumerate(results):
+            cells = [os.path.basename(result.sample), result.group, result.name, result.path, result.display_value()]
+            for column, text in enumerate(cells):
+                cell = QTableWidgetItem(text)
+                if result.error:
+                    cell.setForeground(QColor("#c0392b"))
+                self.sample_results_table.setItem(row, column, cell)
+        for row, result in enumerate(misaligned, len(results)):
+            cells = [os.path.basename(result.sample), result.group, result.name, result.path,
+                     f"一一对应检查: {result.message()}"]
+            for column, text in enumerate(cells):
+                cell = QTableWidgetItem(text)
+                cell.setForeground(QColor("#d35400"))
+                self.sample_results_table.setItem(row, column, cell)
+        # 图像类型为 URL 时记录提取到的图像地址，供下载图像使用
+        self.sample_image_urls = []
+        if self.image_content_type_combo.currentText() == "URL":
+            for result in results:
+                if result.section == IMAGE and not result.error:
+                    self.sample_image_urls.extend(value for value in result.values if isinstance(value, str))
+            self.sample_image_urls = list(dict.fromkeys(self.sample_image_urls))
+        self.fetch_images_btn.setEnabled(bool(self.sample_image_urls) and self.image_fetcher is None)
+        
+        # 图像类型为 BINARY 时直接解码样例中的图像数据并显示缩略图
+        spec = self.sample_extractor.config.image
+        sources = []
+        for result in results:
+            if result.section == IMAGE:
+                sources.extend(sample_image_sources(spec, result.sample, result.values))
+        if sources:
+            self.decode_sample_images(sources)
+        
+        message = f"样例测试完成，共 {len(results)} 条结果，耗时 {seconds * 1000:.0f} ms"
+        if misaligned:
+            message += f"，{len(misaligned)} 个数据项与图像列表不对应"
+        self.statusBar().showMessage(message)
+        
+    def on_sample_test_error(self, error):
+        logger.error(f"样例测试失败: {error}")
+        self.statusBar().showMessage(f"样例测试失败: {error}")
+        
+    def on_sample_extractor_finished(self):
+        self.sample_extractor.deleteLater()
+        self.sample_extractor = None
+        if self.sample_rerun_pending:
+            self.sample_rerun_pending = False
+            self.run_sample_test()
+        
+    def decode_sample_images(self, sources):
+        # 上一次解码尚未完成时先中断，完成后再解码新的来源
+        self.pending_image_sources = sources
+        if self.image_decoder is not None:
+            self.image_decoder.requestInterruption()
+            return
+        
+        self.pending_image_sources = None
+        self.sample_images_list.clear()
+        self.sample_images_list.setVisible(True)
+        self.image_decoder = ImageDecoder(sources)
+        self.image_decoder.image_ready.connect(self.on_sample_image_decoded)
+        self.image_decoder.decode_complete.connect(self.on_sample_images_decoded)
+        self.image_decoder.finished.connect(self.on_image_decoder_finished)
+        self.image_decoder.start()
+        
+    def on_sample_image_decoded(self, name, image, info):
+        item = QListWidgetItem(os.path.basename(name))
+        if not image.isNull():
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+            item.setToolTip(f"{name}\n{info}")
+        else:
+            item.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxCritical))
+            item.setToolTip(f"{name}\n无法解码图像: {info}")
+        self.sample_images_list.addItem(item)
+        
+    def on_sample_images_decoded(self, count, seconds):
+        self.statusBar().showMessage(f"已解码 {count} 张图像，耗时 {seconds * 1000:.0f} ms")
+        
+    def on_image_decoder_finished(self):
+        self.image_decoder.deleteLater()
+        self.image_decoder = None
+        if self.pending_image_sources:
+            self.decode_sample_images(self.pending_image_sources)
+        
+    def fetch_sample_images(self):
+        if not self.sample_image_urls or self.image_fetcher is not None:
+            return
+        
+        self.sample_images_list.clear()
+        self.sample_images_list.setVisible(True)
+        self.fetch_images_btn.setEnabled(False)
+        self.statusBar().showMessage(f"正在下载 {len(self.sample_image_urls)} 张图像...")
+        # 下载使用 asyncio，导入较慢，首次下载时才导入
+        from QtWorkers.ImageFetcher import ImageFetcher
+        self.image_fetcher = ImageFetcher(self.sample_image_urls)
+        self.image_fetcher.image_ready.connect(self.on_sample_image_ready)
+        self.image_fetcher.fetch_complete.connect(self.on_sample_images_complete)
+        self.image_fetcher.fetch_error.connect(self.on_sample_images_error)
+        self.image_fetcher.finished.connect(self.on_image_fetcher_finished)
+        self.image_fetcher.start()
+        
+    def on_sample_image_ready(self, result, image):
+        item = QListWidgetItem(os.path.basename(result.url.split("?", 1)[0]) or result.url)
+        if result.ok and not image.isNull():
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+            item.setToolTip(f"{result.url}\n{result.size / 1024:.1f} KB")
+        else:
+            item.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxCritical))
+            item.setToolTip(f"{result.url}\n{result.error or '无法解码图像'}")
+        self.sample_images_list.addItem(item)
+        
+    def on_sample_images_complete(self, report):
+        first = f"{report.first_image_seconds * 1000:.0f} ms" if report.first_image_seconds is not None else "无"
+        self.statusBar().showMessage(
+            f"图像下载完成: 成功 {report.count(True)}，失败 {report.count(False)}，"
+            f"{report.bytes_per_second / 1024 / 1024:.1f} MB/s，首张图像 {first}，耗时 {report.seconds:.2f} s")
+        
+    def on_sample_images_error(self, error):
+        logger.error(f"图像下载失败: {error}")
+        self.statusBar().showMessage(f"图像下载失败: {error}")
+        
+    def on_image_fetcher_finished(self):
+        self.image_fetcher.deleteLater()
+        self.image_fetcher = None
+        self.fetch_images_btn.setEnabled(bool(self.sample_image_urls))
         
     def on_image_content_type_changed(self, content_type):
         # 当图像类型为binary时，图像路径无需填写
@@ -732,43 +1164,58 @@ class APICoreEditor(QMainWindow):
 
     def add_parameter(self):
         # 创建一个新的参数对象
-        param = {
-            "enable": True,
-            "name": "",
-            "type": "string",
-            "required": True,
-            "value": "",
-            "friendly_value": [],
-            "friendly_name": "",
-            "min_value": None,
-            "max_value": None,
-            "split_str": None
-        }
+        param = Parameter()
         
-        # 添加到参数列表
-        self.parameters.append(param)
-        
-        # 更新参数列表显示
-        self.update_parameters_list()
+        # 添加到参数列表，列表只插入一行
+        self.parameter_model.append(param)
+        self.mark_node_dirty(PARAMETER, param)
+        self.journal.add_parameter(param)
+        self.push_history(Insert(PARAMETER, self.parameter_model, len(self.parameters) - 1, param))
+        self.schedule_request_preview()
         
         # 选择新添加的参数
-        self.parameters_list.setCurrentRow(len(self.parameters) - 1)
-        self.on_parameter_selected(self.parameters_list.currentItem())
+        self.select_parameter(len(self.parameters) - 1)
         
     def update_parameters_list(self):
-        # 清空列表
-        self.parameters_list.clear()
-        
-        # 添加参数到列表
-        for i, param in enumerate(self.parameters):
-            friendly_name = param.get("friendly_name", "未命名参数")
-            param_type = param.get("type", "")
-            item = QListWidgetItem(f"{i+1}. {friendly_name} ({param_type})")
-            self.parameters_list.addItem(item)
+        # self.parameters 被替换（打开、新建文件）后重新设置整个模型
+        self.parameter_model.set_parameters(self.parameters)
+        self.schedule_request_preview()
+        
+    def select_parameter(self, row):
+        index = self.parameter_model.index(row)
+        self.parameters_list.setCurrentIndex(index)
+        self.parameters_list.scrollTo(index)
+        self.on_parameter_selected(index)
             
-    def on_parameter_selected(self, item):
+    def schedule_request_preview(self, *args):
+        self.preview_timer.start()
+        
+    def update_request_preview(self):
+        # 参数配置标签页创建后生成第一次预览
+        if not self.tabs_built:
+            return
+        # 参数尚未读取时，切换到参数配置后再生成预览
+        if self.lazy_config is not None and PARAMETER in self.lazy_config.pending:
+            self.request_preview_edit.clear()
+            self.request_space_label.clear()
+            return
+        # 参数空间只计算各参数取值数量的乘积，不会展开组合
+        config = self.create_config_from_forms(complete=False)
+        request = materialize(config)
+        self.request_preview_edit.setText(f"{request.method} {request.url}")
+        body = request.body
+        self.request_preview_edit.setToolTip(body.decode("utf-8") if body else "")
+        space = ParameterSpace(config)
+        # 参数很多时组合数可达数千位，逐个相乘很慢且超出整数转换为字符串的位数限制，按对数显示
+        exponent = sum(math.log10(size) for size in space.sizes) if 0 not in space.sizes else 0
+        if exponent < 15:
+            self.request_space_label.setText(f"参数组合总数: {space.size:,}")
+        else:
+            self.request_space_label.setText(f"参数组合总数: 约 {10 ** (exponent % 1):.2f}e{int(exponent)}")
+        
+    def on_parameter_selected(self, model_index):
         # 获取选中的参数索引
-        index = self.parameters_list.row(item)
+        index = model_index.row()
         if index < 0 or index >= len(self.parameters):
             logger.error(f"无效的参数索引: {index}")
             return
@@ -780,29 +1227,28 @@ class APICoreEditor(QMainWindow):
         param = self.parameters[index]
         
         # 填充表单
-        self.param_type_combo.setCurrentText(param.get("type", "string"))
-        self.param_name_edit.setText(param.get("name", ""))
-        self.param_friendly_name_edit.setText(param.get("friendly_name", ""))
-        self.param_required_check.setChecked(param.get("required", True))
-        self.param_enable_check.setChecked(param.get("enable", True))
+        self.param_type_combo.setCurrentText(param.type)
+        self.param_name_edit.setText(param.name)
+        self.param_friendly_name_edit.setText(param.friendly_name)
+        self.param_required_check.setChecked(param.required)
+        self.param_enable_check.setChecked(param.enable)
         
         # 根据参数类型填充特定字段
-        param_type = param.get("type", "string")
-        if param_type == "integer":
-            self.param_min_value_spin.setValue(param.get("min_value", 0))
-            self.param_max_value_spin.setValue(param.get("max_value", 100))
-            self.param_integer_value_spin.setValue(param.get("value", 0))
-        elif param_type == "boolean":
-            self.param_boolean_value_combo.setCurrentText(str(param.get("value", False)).lower())
-        elif param_type == "list":
-            self.param_split_str_edit.setText(param.get("split_str", ""))
-            self.param_list_value_edit.setPlainText(", ".join(param.get("value", [])))
-        elif param_type == "string":
-            self.param_string_value_edit.setText(param.get("value", ""))
-        elif param_type == "enum":
+        if param.type == "integer":
+            self.param_min_value_spin.setValue(param.min_value if param.min_value is not None else 0)
+            self.param_max_value_spin.setValue(param.max_value if param.max_value is not None else 100)
+            self.param_integer_value_spin.setValue(param.value if isinstance(param.value, int) else 0)
+        elif param.type == "boolean":
+            self.param_boolean_value_combo.setCurrentText(str(param.value).lower())
+        elif param.type == "list":
+            self.param_split_str_edit.setText(param.split_str or "")
+            self.param_list_value_edit.setPlainText(", ".join(param.value or []))
+        elif param.type == "string":
+            self.param_string_value_edit.setText(param.value)
+        elif param.type == "enum":
             # 确保所有值都是字符串类型
-            enum_values = [str(v) for v in param.get("value", [])]
-            friendly_values = [str(v) for v in param.get("friendly_value", [])]
+            enum_values = [str(v) for v in param.value or []]
+            friendly_values = [str(v) for v in param.friendly_value]
             self.param_enum_values_edit.setPlainText(", ".join(enum_values))
             self.param_friendly_values_edit.setPlainText(", ".join(friendly_values))
         
@@ -814,57 +1260,60 @@ class APICoreEditor(QMainWindow):
         
         # 获取参数对象
         param = self.parameters[self.current_param_index]
+        before = state(param)
         
         # 更新参数对象
-        param["type"] = self.param_type_combo.currentText()
-        param["name"] = self.param_name_edit.text()
-        param["friendly_name"] = self.param_friendly_name_edit.text()
-        param["required"] = self.param_required_check.isChecked()
+        param.type = self.param_type_combo.currentText()
+        param.name = self.param_name_edit.text()
+        param.friendly_name = self.param_friendly_name_edit.text()
+        param.required = self.param_required_check.isChecked()
         
         # 当类型不是enum时，更新enable字段
-        if param["type"] != "enum":
-            param["enable"] = self.param_enable_check.isChecked()
+        if param.type != "enum":
+            param.enable = self.param_enable_check.isChecked()
         
         # 根据参数类型更新特定字段
-        if param["type"] == "integer":
-            param["min_value"] = self.param_min_value_spin.value()
-            param["max_value"] = self.param_max_value_spin.value()
-            param["value"] = self.param_integer_value_spin.value()
-            param["friendly_value"] = []
-            param["split_str"] = None
-        elif param["type"] == "boolean":
-            param["value"] = self.param_boolean_value_combo.currentText() == "true"
-            param["friendly_value"] = []
-            param["min_value"] = None
-            param["max_value"] = None
-            param["split_str"] = None
-        elif param["type"] == "list":
-            param["split_str"] = self.param_split_str_edit.text()
+        if param.type == "integer":
+            param.min_value = self.param_min_value_spin.value()
+            param.max_value = self.param_max_value_spin.value()
+            param.value = self.param_integer_value_spin.value()
+            param.friendly_value = []
+            param.split_str = None
+        elif param.type == "boolean":
+            param.value = self.param_boolean_value_combo.currentText() == "true"
+            param.friendly_value = []
+            param.min_value = None
+            param.max_value = None
+            param.split_str = None
+        elif param.type == "list":
+            param.split_str = self.param_split_str_edit.text()
             value_text = self.param_list_value_edit.toPlainText()
-            param["value"] = [v.strip() for v in value_text.split(",")] if value_text else []
-            param["friendly_value"] = []
-            param["min_value"] = None
-            param["max_value"] = None
-        elif param["type"] == "string":
-            param["value"] = self.param_string_value_edit.text()
-            param["friendly_value"] = []
-            param["min_value"] = None
-            param["max_value"] = None
-            param["split_str"] = None
-        elif param["type"] == "enum":
+            param.value = [v.strip() for v in value_text.split(",")] if value_text else []
+            param.friendly_value = []
+            param.min_value = None
+            param.max_value = None
+        elif param.type == "string":
+            param.value = self.param_string_value_edit.text()
+            param.friendly_value = []
+            param.min_value = None
+            param.max_value = None
+            param.split_str = None
+        elif param.type == "enum":
             value_text = self.param_enum_values_edit.toPlainText()
-            param["value"] = [v.strip() for v in value_text.split(",")] if value_text else []
+            param.value = [v.strip() for v in value_text.split(",")] if value_text else []
             friendly_value_text = self.param_friendly_values_edit.toPlainText()
-            param["friendly_value"] = [v.strip() for v in friendly_value_text.split(",")] if friendly_value_text else []
-            param["min_value"] = None
-            param["max_value"] = None
-            param["split_str"] = None
+            param.friendly_value = [v.strip() for v in friendly_value_text.split(",")] if friendly_value_text else []
+            param.min_value = None
+            param.max_value = None
+            param.split_str = None
         
-        # 更新参数列表显示
-        self.update_parameters_list()
+        self.mark_node_dirty(PARAMETER, param)
+        self.journal.set_parameter(self.current_param_index, param)
+        self.push_history(Update(PARAMETER, param, before, state(param)))
         
-        # 重新选择当前参数
-        self.parameters_list.setCurrentRow(self.current_param_index)
+        # 只重新绘制该参数所在的行
+        self.parameter_model.refresh(self.current_param_index)
+        self.schedule_request_preview()
         
         QMessageBoxEx.information(self, "提示", "参数已更新")
         
@@ -880,10 +1329,11 @@ class APICoreEditor(QMainWindow):
         
         if reply == QMessageBox.Yes:
             # 删除参数
-            self.parameters.pop(self.current_param_index)
-            
-            # 更新参数列表显示
-            self.update_parameters_list()
+            param = self.parameter_model.pop(self.current_param_index)
+            self.forget_node(PARAMETER, param)
+            self.journal.delete_parameter(self.current_param_index)
+            self.push_history(Remove(PARAMETER, self.parameter_model, self.current_param_index, param))
+            self.schedule_request_preview()
             
             # 重置当前参数索引
             self.current_param_index = -1
@@ -894,20 +1344,16 @@ class APICoreEditor(QMainWindow):
         self.statusBar().showMessage("正在添加新数据组...")
         
         # 创建一个新的数据组对象
-        data_group = {
-            "friendly_name": "未命名数据组",
-            "data": []
-        }
+        data_group = DataGroup()
         
-        # 添加到数据组列表
-        self.data_groups.append(data_group)
-        
-        # 更新数据组列表显示
-        self.update_data_groups_list()
+        # 添加到数据组列表，树中只插入一行
+        self.data_model.append(data_group)
+        self.mark_node_dirty(DATA_GROUP, data_group)
+        self.journal.add_group(data_group)
+        self.push_history(Insert(DATA_GROUP, self.data_model, len(self.data_groups) - 1, data_group))
         
         # 选择新添加的数据组
-        self.data_groups_list.setCurrentRow(len(self.data_groups) - 1)
-        self.on_data_group_selected(self.data_groups_list.currentItem())
+        self.select_data_group(len(self.data_groups) - 1)
         
         self.statusBar().showMessage("已添加新数据组，请设置友好名称")
         
@@ -927,55 +1373,198 @@ class APICoreEditor(QMainWindow):
         self.statusBar().showMessage(f"数据项类型已更改为：{text} - {type_hints.get(text, '请根据类型设置相应参数')}")
 
     def update_data_groups_list(self):
-        # 清空列表
-        self.data_groups_list.clear()
-        
-        # 添加数据组到列表
-        for i, data_group in enumerate(self.data_groups):
-            friendly_name = data_group.get("friendly_name", "未命名数据组")
-            item = QListWidgetItem(f"{i+1}. {friendly_name}")
-            logger.info(f"添加数据组到列表: {i+1}. {friendly_name}")
-            self.data_groups_list.addItem(item)
+        # self.data_groups 被替换（打开、新建文件）后重新设置整个模型
+        self.current_group_index = -1
+        self.current_item_index = -1
+        self.data_model.set_groups(self.data_groups)
+        
+    def select_data_group(self, row):
+        # 选择数据组时展开并选中其第一个数据项
+        index = self.data_model.index(row)
+        self.data_tree.setCurrentIndex(index)
+        self.on_data_group_selected(row)
+        if self.current_item_index >= 0:
+            self.data_tree.expand(index)
+            self.data_tree.setCurrentIndex(self.data_model.item_index(self.data_groups[row], self.current_item_index))
+        self.data_tree.scrollTo(self.data_tree.currentIndex())
+        
+    def select_data_item(self, group_row, row):
+        self.on_data_group_selected(group_row, select_item=False)
+        index = self.data_model.item_index(self.data_groups[group_row], row)
+        self.data_tree.expand(index.parent())
+        self.data_tree.setCurrentIndex(index)
+        self.data_tree.scrollTo(index)
+        self.on_data_item_selected(row)
+        
+    def on_data_tree_clicked(self, index):
+        group_row = self.data_model.group_row(index)
+        if group_row >= 0:
+            self.select_data_group(group_row)
+        else:
+            self.select_data_item(index.parent().row(), index.row())
             
-    def on_data_group_selected(self, item):
-        # 获取选中的数据组索引
-        index = self.data_groups_list.row(item)
+    def on_data_group_selected(self, index, select_item=True):
         if index < 0 or index >= len(self.data_groups):
             return
         
         # 保存当前数据组索引
         self.current_group_index = index
+        self.current_item_index = -1
         
         # 获取数据组对象
         data_group = self.data_groups[index]
         
         # 填充表单
-        self.group_friendly_name_edit.setText(data_group.get("friendly_name", ""))
-        
-        # 更新数据项列表显示
-        self.update_data_items_list()
-        
-        if len(self.data_items_list) > 0:
-            self.data_items_list.setCurrentRow(0)
-            self.on_data_item_selected(self.data_items_list.currentItem())
-        
-    def update_data_items_list(self):
-        # 清空列表
-        self.data_items_list.clear()
+        self.group_friendly_name_edit.setText(data_group.friendly_name)
         
-        # 检查是否有选中的数据组
-        if self.current_group_index < 0 or self.current_group_index >= len(self.data_groups):
-            return
+        if select_item and len(data_group.data) > 0:
+            self.on_data_item_selected(0)
+            
+    def mark_basic_dirty(self, *args):
+        # 基本信息的验证只涉及少量字段，创建配置快照的开销与参数数量无关
+        config = self.create_config_from_forms(complete=False)
+        self.live_validator.mark_dirty(BASIC, config)
+        self.change_tracker.touch(BASIC, config)
+        
+    def on_field_edited(self, name):
+        value = self.fields[name][0]()
+        self.journal.field(name, value)
+        if not self._applying_history:
+            self.push_history(SetField(self.set_field, name, self._field_values.get(name), value))
+        self._field_values[name] = value
+        
+    def set_field(self, name, value):
+        # 撤销或重做时写回字段，不再记录到历史
+        self._applying_history = True
+        try:
+            self.fields[name][1](value)
+        finally:
+            self._applying_history = False
+        
+    def start_history(self):
+        # 打开、新建文件后清空历史，以当前表单作为起点
+        self.history.clear()
+        self._field_values = {name: getter() for name, (getter, setter) in self.fields.items()}
+        self.update_history_actions()
+        
+    def push_history(self, command):
+        self.history.push(command)
+        self.update_history_actions()
+        
+    def update_history_actions(self):
+        self.undo_action.setEnabled(self.history.can_undo())
+        self.redo_action.setEnabled(self.history.can_redo())
+        
+    def undo(self):
+        command = self.history.undo()
+        if command is not None:
+            self.on_history_applied(command, undone=True)
+        
+    def redo(self):
+        command = self.history.redo()
+        if command is not None:
+            self.on_history_applied(command, undone=False)
+        
+    def on_history_applied(self, command, undone):
+        # 字段通过 set_field 写回控件，已触发验证、变更跟踪与编辑日志；参数与数据组需要刷新列表
+        self.journal_history(command, undone)
+        if command.kind == PARAMETER:
+            # 插入与删除已通过模型通知列表，修改只需重新绘制该行
+            row = self.parameter_model.row_of(command.node)
+            if row >= 0:
+                self.mark_node_dirty(PARAMETER, command.node)
+                self.parameter_model.refresh(row)
+                self.select_parameter(row)
+            else:
+                self.forget_node(PARAMETER, command.node)
+            self.current_param_index = self.parameters_list.currentIndex().row()
+            self.schedule_request_preview()
+        elif command.kind == DATA_GROUP:
+            # 数据项的修改以所在数据组为受影响的节点
+            self.current_group_index = -1
+            self.current_item_index = -1
+            row = self.data_model.row_of(command.node)
+            if row >= 0:
+                self.mark_node_dirty(DATA_GROUP, command.node)
+                self.data_model.refresh_group(command.node)
+                self.select_data_group(row)
+            else:
+                self.forget_node(DATA_GROUP, command.node)
+        
+        self.update_history_actions()
+        action = "撤销" if undone else "重做"
+        self.statusBar().showMessage(f"已{action}（历史 {len(self.history)} 步，约 {self.history.memory / 1024:.0f} KB）")
+        
+    def journal_history(self, command, undone):
+        # 撤销与重做只把实际发生的修改记录到编辑日志，不写入完整快照
+        if isinstance(command, Insert):
+            # Insert 撤销时删除、重做时插入，Remove 相反
+            inserted = isinstance(command, Remove) == undone
+            node, index = command.inserted, command.index
+            if command.kind == PARAMETER:
+                if inserted:
+                    self.journal.add_parameter(node, index)
+                else:
+                    self.journal.delete_parameter(index)
+            elif command.node is node:
+                if inserted:
+                    self.journal.add_group(node, index)
+                else:
+                    self.journal.delete_group(index)
+            else:
+                group_row = self.data_model.row_of(command.node)
+                if inserted:
+                    self.journal.add_item(group_row, node, index)
+                else:
+                    self.journal.delete_item(group_row, index)
+        elif isinstance(command, Update):
+            target = command.target
+            if command.kind == PARAMETER:
+                self.journal.set_parameter(self.parameter_model.row_of(target), target)
+            elif command.node is target:
+                self.journal.rename_group(self.data_model.row_of(target), target.friendly_name)
+            else:
+                group = command.node
+                row = next(row for row, item in enumerate(group.data) if item is target)
+                self.journal.set_item(self.data_model.row_of(group), row, target)
+        
+    def journal_snapshot(self):
+        """编辑日志的快照；按需打开的文件中尚未读取的部分只记录为对该文件的引用，不读取也不序列化"""
+        lazy = self.lazy_config
+        pending = lazy.pending if lazy is not None else ()
+        return (self.create_config_from_forms(complete=False), self.current_file, pending,
+                lazy.path if lazy is not None else None)
+        
+    def on_journal_failed(self, error):
+        # 写入失败的操作保留在内存中并自动重试，编辑不受影响
+        logger.warning(f"编辑日志写入失败: {error}")
+        self.statusBar().showMessage(f"编辑日志写入失败，正在重试（异常退出时可能无法恢复最近的编辑）: {error}")
+        
+    def mark_basic_changed(self, *args):
+        self.change_tracker.touch(BASIC, self.create_config_from_forms(complete=False))
+        
+    def mark_node_dirty(self, kind, node):
+        # 参数或数据组被添加或修改：重新验证并更新变更跟踪
+        self.live_validator.mark_dirty(kind, node)
+        self.change_tracker.touch(kind, node)
+        
+    def forget_node(self, kind, node):
+        self.live_validator.forget(node)
+        self.change_tracker.forget(kind, node)
+        
+    def on_live_validation_updated(self, changed):
+        # 更新状态栏中的错误计数
+        errors = self.live_validator.error_count
+        warnings = self.live_validator.warning_count
+        if errors or warnings:
+            self.issue_count_label.setText(f"错误 {errors}  警告 {warnings}")
+        else:
+            self.issue_count_label.setText("验证通过")
         
-        # 获取数据组对象
-        data_group = self.data_groups[self.current_group_index]
+        # 只重新绘制结果有变化的行
+        self.parameter_model.refresh_nodes([node for kind, node in changed if kind == PARAMETER])
+        self.data_model.refresh_nodes([node for kind, node in changed if kind == DATA_GROUP])
         
-        # 添加数据项到列表
-        for i, data_item in enumerate(data_group.get("data", [])):
-            friendly_name = data_item.get("friendly_name", "未命名数据项")
-            item = QListWidgetItem(f"{i+1}. {friendly_name}")
-            self.data_items_list.addItem(item)
-            
     def add_data_item(self):
         # 检查是否有选中的数据组
         if self.current_group_index < 0 or self.current_group_index >= len(self.data_groups):
@@ -986,56 +1575,45 @@ class APICoreEditor(QMainWindow):
         self.statusBar().showMessage("正在添加新数据项...")
         
         # 创建一个新的数据项对象，包含数据类型和one-to-one-mapping
-        data_item = {
-            "friendly_name": "未命名数据项",
-            "path": "",
-            "type": "string",  # 默认数据类型为string
-            "one-to-one-mapping": False  # 默认不启用一对一映射
-        }
-        
-        # 添加到数据项列表
-        self.data_groups[self.current_group_index]["data"].append(data_item)
+        # 默认数据类型为string，不启用一对一映射
+        data_item = DataItem()
         
-        # 更新数据项列表显示
-        self.update_data_items_list()
+        # 添加到数据项列表，树中只插入一行
+        data_group = self.data_groups[self.current_group_index]
+        items = self.data_model.items_of(data_group)
+        items.append(data_item)
+        self.mark_node_dirty(DATA_GROUP, data_group)
+        self.journal.add_item(self.current_group_index, data_item)
+        self.push_history(Insert(DATA_GROUP, items, len(data_group.data) - 1, data_item, data_group))
         
         # 选择新添加的数据项
-        self.data_items_list.setCurrentRow(len(self.data_groups[self.current_group_index]["data"]) - 1)
-        self.on_data_item_selected(self.data_items_list.currentItem())
+        self.select_data_item(self.current_group_index, len(data_group.data) - 1)
         
         self.statusBar().showMessage("已添加新数据项，请设置友好名称、路径和类型")
         
-    def on_data_item_selected(self, item):
-        # 获取选中的数据项索引
-        index = self.data_items_list.row(item)
-        if index < 0 or index >= len(self.data_groups[self.current_group_index]["data"]):
+    def on_data_item_selected(self, index):
+        # index 为数据项在当前数据组中的位置
+        if index < 0 or index >= len(self.data_groups[self.current_group_index].data):
             return
         
         # 保存当前数据项索引
         self.current_item_index = index
         
         # 获取数据项对象
-        data_item: dict = self.data_groups[self.current_group_index]["data"][index]
-        logger.info(f"选择数据项: {index+1}. {data_item.get('friendly_name', '未命名数据项')}")
+        data_item: DataItem = self.data_groups[self.current_group_index].data[index]
         
         # 填充表单
-        self.item_friendly_name_edit.setText(data_item.get("friendly_name", ""))
-        self.item_path_edit.setText(data_item.get("path", ""))
+        self.item_friendly_name_edit.setText(data_item.friendly_name)
+        self.item_path_edit.setText(data_item.path)
         
-        # 设置数据类型
-        item_type = data_item.get("type", "string")
-        if item_type in ["string", "list"]:
-            self.item_type_combo.setCurrentText(item_type)
+        # 设置数据类型（缺少type字段的旧配置已在加载时推断）
+        if data_item.type in ["string", "list"]:
+            self.item_type_combo.setCurrentText(data_item.type)
         else:
             self.item_type_combo.setCurrentText("string")
         
         # 设置一对一映射状态
-        one_to_one_mapping = data_item.get("one-to-one-mapping", False)
-        self.item_one_to_one_mapping_check.setChecked(one_to_one_mapping)
-        
-        if "type" not in data_item and data_item.get("one-to-one-mapping", False):
-            self.item_type_combo.setCurrentText("list")
-            self.item_one_to_one_mapping_check.setChecked(True)
+        self.item_one_to_one_mapping_check.setChecked(data_item.one_to_one_mapping)
         
         # 根据数据类型启用或禁用一对一映射复选框
         self.on_item_type_changed(self.item_type_combo.currentText())
@@ -1043,7 +1621,7 @@ class APICoreEditor(QMainWindow):
     def update_data_item(self):
         # 检查是否有选中的数据项
         if (self.current_group_index < 0 or self.current_group_index >= len(self.data_groups) or
-            self.current_item_index < 0 or self.current_item_index >= len(self.data_groups[self.current_group_index]["data"])):
+            self.current_item_index < 0 or self.current_item_index >= len(self.data_groups[self.current_group_index].data)):
             QMessageBox.warning(self, "警告", "请先选择要更新的数据项")
             self.statusBar().showMessage("更新数据项失败：请先选择数据项")
             return
@@ -1051,32 +1629,35 @@ class APICoreEditor(QMainWindow):
         self.statusBar().showMessage("正在更新数据项...")
         
         # 获取数据项对象
-        data_item = self.data_groups[self.current_group_index]["data"][self.current_item_index]
+        data_item = self.data_groups[self.current_group_index].data[self.current_item_index]
+        before = state(data_item)
         
         # 更新数据项对象
-        data_item["friendly_name"] = self.item_friendly_name_edit.text()
-        data_item["path"] = self.item_path_edit.text()
-        data_item["type"] = self.item_type_combo.currentText()
+        data_item.friendly_name = self.item_friendly_name_edit.text()
+        data_item.path = self.item_path_edit.text()
+        data_item.type = self.item_type_combo.currentText()
         
         # 只有在数据类型为list且复选框被选中时才设置one-to-one-mapping为True
         if self.item_type_combo.currentText() == "list":
-            data_item["one-to-one-mapping"] = self.item_one_to_one_mapping_check.isChecked()
+            data_item.one_to_one_mapping = self.item_one_to_one_mapping_check.isChecked()
         else:
-            data_item["one-to-one-mapping"] = False
+            data_item.one_to_one_mapping = False
         
-        # 更新数据项列表显示
-        self.update_data_items_list()
+        self.mark_node_dirty(DATA_GROUP, self.data_groups[self.current_group_index])
+        self.journal.set_item(self.current_group_index, self.current_item_index, data_item)
+        self.push_history(Update(DATA_GROUP, data_item, before, state(data_item),
+                                 self.data_groups[self.current_group_index]))
         
-        # 重新选择当前数据项
-        self.data_items_list.setCurrentRow(self.current_item_index)
+        # 只重新绘制该数据项所在的行
+        self.data_model.refresh_item(self.data_groups[self.current_group_index], self.current_item_index)
         
         QMessageBoxEx.information(self, "提示", "数据项已更新")
-        self.statusBar().showMessage(f"已更新数据项：{data_item['friendly_name']}")
+        self.statusBar().showMessage(f"已更新数据项：{data_item.friendly_name}")
         
     def delete_data_item(self):
         # 检查是否有选中的数据项
         if (self.current_group_index < 0 or self.current_group_index >= len(self.data_groups) or
-            self.current_item_index < 0 or self.current_item_index >= len(self.data_groups[self.current_group_index]["data"])):
+            self.current_item_index < 0 or self.current_item_index >= len(self.data_groups[self.current_group_index].data)):
             QMessageBox.warning(self, "警告", "请先选择要删除的数据项")
             self.statusBar().showMessage("删除数据项失败：请先选择数据项")
             return
@@ -1087,13 +1668,15 @@ class APICoreEditor(QMainWindow):
         
         if reply == QMessageBox.Yes:
             # 删除数据项
-            data_item = self.data_groups[self.current_group_index]["data"][self.current_item_index]
-            item_name = data_item.get("friendly_name", "数据项")
+            data_item = self.data_groups[self.current_group_index].data[self.current_item_index]
+            item_name = data_item.friendly_name or "数据项"
             
-            self.data_groups[self.current_group_index]["data"].pop(self.current_item_index)
-            
-            # 更新数据项列表显示
-            self.update_data_items_list()
+            data_group = self.data_groups[self.current_group_index]
+            items = self.data_model.items_of(data_group)
+            items.pop(self.current_item_index)
+            self.mark_node_dirty(DATA_GROUP, data_group)
+            self.journal.delete_item(self.current_group_index, self.current_item_index)
+            self.push_history(Remove(DATA_GROUP, items, self.current_item_index, data_item, data_group))
             
             # 重置当前数据项索引
             self.current_item_index = -1
@@ -1114,18 +1697,19 @@ class APICoreEditor(QMainWindow):
         
         # 获取数据组对象
         data_group = self.data_groups[self.current_group_index]
+        before = state(data_group)
         
         # 更新数据组对象
-        data_group["friendly_name"] = self.group_friendly_name_edit.text()
-        
-        # 更新数据组列表显示
-        self.update_data_groups_list()
+        data_group.friendly_name = self.group_friendly_name_edit.text()
+        self.mark_node_dirty(DATA_GROUP, data_group)
+        self.journal.rename_group(self.current_group_index, data_group.friendly_name)
+        self.push_history(Update(DATA_GROUP, data_group, before, state(data_group)))
         
-        # 重新选择当前数据组
-        self.data_groups_list.setCurrentRow(self.current_group_index)
+        # 只重新绘制该数据组所在的行
+        self.data_model.refresh_group(data_group)
         
         QMessageBoxEx.information(self, "提示", "数据组已更新")
-        self.statusBar().showMessage(f"已更新数据组：{data_group['friendly_name']}")
+        self.statusBar().showMessage(f"已更新数据组：{data_group.friendly_name}")
         
     def delete_data_group(self):
         # 检查是否有选中的数据组
@@ -1141,20 +1725,16 @@ class APICoreEditor(QMainWindow):
         if reply == QMessageBox.Yes:
             # 删除数据组
             data_group = self.data_groups[self.current_group_index]
-            group_name = data_group.get("friendly_name", "数据组")
+            group_name = data_group.friendly_name or "数据组"
             
-            self.data_groups.pop(self.current_group_index)
-            
-            # 更新数据组列表显示
-            self.update_data_groups_list()
+            self.forget_node(DATA_GROUP, self.data_model.pop(self.current_group_index))
+            self.journal.delete_group(self.current_group_index)
+            self.push_history(Remove(DATA_GROUP, self.data_model, self.current_group_index, data_group))
             
             # 重置当前数据组和数据项索引
             self.current_group_index = -1
             self.current_item_index = -1
             
-            # 清空数据项列表
-            self.data_items_list.clear()
-            
             QMessageBoxEx.information(self, "提示", "数据组已删除")
             self.statusBar().showMessage(f"已删除数据组：{group_name}（包含其中所有数据项）")
         else:
@@ -1170,7 +1750,7 @@ class APICoreEditor(QMainWindow):
                 logger.info("用户取消了新建文件操作")
                 return
             elif reply == QMessageBox.Yes:
-                if not self.save_file():
+                if not self.save_file(wait=True):
                     logger.warning("保存当前文件失败，取消新建文件操作")
                     return
         
@@ -1182,14 +1762,21 @@ class APICoreEditor(QMainWindow):
         logger.info("创建了新文件")
         
     def reset_all_forms(self):
+        self.build_tabs()
+        self.close_lazy_config()
+        
         # 重置基本配置表单
         self.friendly_name_edit.clear()
         self.intro_edit.clear()
-        self.icon_edit.clear()
+        self.set_icon("")
         self.link_edit.clear()
         self.func_combo.setCurrentIndex(0)
         self.version_combo.setCurrentIndex(0)  # 修改为下拉框
         
+        # 清空实时验证结果
+        self.live_validator.reset()
+        self.mark_basic_dirty()
+        
         # 重置参数配置表单
         self.parameters = []
         self.current_param_index = -1
@@ -1202,35 +1789,23 @@ class APICoreEditor(QMainWindow):
         self.image_is_base64_check.setChecked(False)
         
         self.data_groups = []
-        self.current_group_index = -1
-        self.current_item_index = -1
         self.update_data_groups_list()
-        self.data_items_list.clear()
+        
+        self._config_extra = {}
+        self._response_extra = {}
+        self._image_extra = {}
         
         # 重置当前文件路径
         self.current_file = None
+        self.change_tracker.reset(self.create_config_from_forms())
+        self.journal.reset(None)
+        self.start_history()
         
     def get_config_dir(self) -> str:
-        from pathlib import Path
-        config_dir = os.path.dirname(os.path.realpath(sys.argv[0]))
-        if sys.platform.startswith('win'):
-            config_dir = str(Path.home() / f'AppData{os.sep}Roaming{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
-        elif sys.platform.startswith('linux'):
-            config_dir = str(Path.home() / f'.config{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
-        elif sys.platform.startswith('darwin'):
-            config_dir = str(Path.home() / f'Library{os.sep}Application Support{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
-        else:
-            config_dir = str(Path.home() / f'.config{os.sep}wallpaper-generator-next{os.sep}EnterPoint')
-        
-        if not os.path.exists(config_dir):
-            if config_dir != os.path.dirname(os.path.realpath(sys.argv[0])) and os.path.exists(os.path.dirname(os.path.realpath(sys.argv[0]))):
-                config_dir = os.path.dirname(os.path.realpath(sys.argv[0]))
-            else:
-                config_dir = ""
-            
-        return config_dir
+        return apicore.get_config_dir()
         
-    def open_file(self):
+    def open_file(self, file_path=None):
+        """打开配置文件，file_path 为 None 时显示文件对话框"""
         # 确认是否保存当前文件
         self.statusBar().showMessage("准备打开配置文件，请确认是否保存当前更改...")
         if self.current_file is not None and self.config_has_changes():
@@ -1242,32 +1817,38 @@ class APICoreEditor(QMainWindow):
                 self.statusBar().showMessage("已取消打开文件操作")
                 return
             elif reply == QMessageBox.Yes:
-                if not self.save_file():
+                if not self.save_file(wait=True):
                     logger.warning("保存当前文件失败，取消打开文件操作")
                     self.statusBar().showMessage("保存当前文件失败，已取消打开操作")
                     return
         
         # 打开文件对话框
-        self.statusBar().showMessage("请选择要打开的 APICORE 配置文件")
-        file_path, _ = QFileDialog.getOpenFileName(self, "打开 APICORE 配置文件", self.get_config_dir(), "APICORE 配置文件 (*.api.json);;JSON文件 (*.json);;所有文件 (*)")
+        if file_path is None:
+            self.statusBar().showMessage("请选择要打开的 APICORE 配置文件")
+            file_path, _ = QFileDialog.getOpenFileName(self, "打开 APICORE 配置文件", self.get_config_dir(), "APICORE 配置文件 (*.api.json);;JSON文件 (*.json);;所有文件 (*)")
         
         if file_path:
             # 加载文件内容
             try:
                 self.statusBar().showMessage(f"正在加载文件: {os.path.basename(file_path)}...")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config, lazy = self.read_config(file_path)
                 
                 # 填充表单
-                self.fill_forms_from_config(config)
+                self.fill_forms_from_config(config, lazy)
                 
                 # 更新当前文件路径
                 self.current_file = file_path
+                self.change_tracker.record_file(file_path)
+                self.journal.reset(file_path)
                 
-                # 更新状态栏
-                self.statusBar().showMessage(f"已打开: {os.path.basename(file_path)}，系统正在验证配置...")
                 logger.info(f"文件已打开: {file_path}")
+                if lazy is not None:
+                    # 完整验证需要读取全部内容，按需打开的文件只进行实时验证
+                    self.statusBar().showMessage(f"已打开: {os.path.basename(file_path)}（参数与响应配置在首次查看时读取）")
+                    return
                 
+                # 更新状态栏
+                self.statusBar().showMessage(f"已打开: {os.path.basename(file_path)}，系统正在验证配置...")
                 self.validate_config(Reminder_on_Success=False)
                 self.statusBar().showMessage(f"已打开: {os.path.basename(file_path)}")
             except Exception as e:
@@ -1275,24 +1856,110 @@ class APICoreEditor(QMainWindow):
                 logger.error(error_msg)
                 QMessageBox.critical(self, "错误", error_msg)
                 
-    def fill_forms_from_config(self, config):
+    def read_config(self, file_path):
+        """读取配置文件，返回 (配置, LazyConfig)；大文件按需打开，参数与数据组为空列表，否则第二项为 None"""
+        if os.path.getsize(file_path) >= LAZY_THRESHOLD:
+            try:
+                lazy = LazyConfig(file_path)
+                return lazy.config, lazy
+            except LazyLoadError as e:
+                logger.info(f"无法按需打开 {file_path}，完整读取: {str(e)}")
+        return apicore.load(file_path), None
+        
+    def close_lazy_config(self):
+        if self.lazy_config is not None:
+            self.lazy_config.close()
+            self.lazy_config = None
+        
+    def on_tab_changed(self, index):
+        self.build_tabs()
+        widget = self.tabs.widget(index)
+        if widget is self.parameters_tab:
+            self.load_pending(PARAMETER)
+        elif widget is self.response_tab:
+            self.load_pending(DATA_GROUP)
+        
+    def load_pending(self, *kinds) -> bool:
+        """读取尚未读取的部分；失败时提示并返回 False，已有的编辑保留，由用户决定是否重新加载文件"""
+        try:
+            self.ensure_loaded(*kinds)
+            return True
+        except LazyLoadError as e:
+            error_msg = str(e)
+            logger.error(error_msg)
+            reply = QMessageBox.question(
+                self, "错误",
+                f"{error_msg}\n该部分读取前无法保存、验证或测试配置。\n"
+                "是否重新加载文件？未保存的更改会丢失。",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.reload_current_file(complete=True)
+            return False
+        
+    def ensure_loaded(self, *kinds):
+        """读取按需打开的文件中尚未读取的部分，kinds 为空时读取全部；失败时抛出 LazyLoadError，该部分仍未读取"""
+        lazy = self.lazy_config
+        if lazy is None:
+            return
+        for kind in kinds or lazy.pending:
+            if kind not in lazy.pending:
+                continue
+            name = "参数" if kind == PARAMETER else "数据组"
+            self.statusBar().showMessage(f"正在读取{name}（{lazy.size(kind) / 1024 / 1024:.1f} MB）...")
+            try:
+                items = lazy.load(kind)
+            except LazyLoadError as e:
+                self.statusBar().clearMessage()
+                raise LazyLoadError(f"读取{name}失败: {str(e)}") from None
+            
+            # 读取的内容与文件相同，只需要验证，不是未保存的更改
+            for node in items:
+                self.live_validator.mark_dirty(kind, node)
+            self.change_tracker.load(kind, items)
+            if kind == PARAMETER:
+                self.parameters = items
+                self.update_parameters_list()
+                if len(self.parameters) > 0:
+                    self.select_parameter(0)
+            else:
+                self.data_groups = items
+                self.update_data_groups_list()
+                if len(self.data_groups) > 0:
+                    self.select_data_group(0)
+            self.statusBar().showMessage(f"已读取{name}: {len(items)} 项")
+            logger.info(f"已读取{name}: {len(items)} 项")
+        if not lazy.pending:
+            self.close_lazy_config()
+        
+    def fill_forms_from_config(self, config: Config, lazy=None):
+        """填充表单；lazy 为按需打开 config 的 LazyConfig，其中尚未读取的部分在首次查看时读取"""
+        self.build_tabs()
+        self.close_lazy_config()
+        self.lazy_config = lazy
+        
         # 填充基本配置表单
-        self.friendly_name_edit.setText(config.get("friendly_name", ""))
-        self.intro_edit.setText(config.get("intro", ""))
-        self.icon_edit.setText(config.get("icon", ""))
-        self.link_edit.setText(config.get("link", ""))
+        self.friendly_name_edit.setText(config.friendly_name)
+        self.intro_edit.setText(config.intro)
+        self.set_icon(config.icon)
+        self.link_edit.setText(config.link)
         
-        func = config.get("func", "GET")
-        if func in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]:
-            self.func_combo.setCurrentText(func)
+        if config.func in HTTP_METHODS:
+            self.func_combo.setCurrentText(config.func)
         
         # 将版本设置为下拉框的值
-        version = config.get("APICORE_version", "1.0")
-        if version == "1.0":
+        if config.APICORE_version == "1.0":
             self.version_combo.setCurrentIndex(0)
         
+        # 打开新文件时全部节点都需要验证一次
+        self.live_validator.reset()
+        self.mark_basic_dirty()
+        for param in config.parameters:
+            self.live_validator.mark_dirty(PARAMETER, param)
+        for data_group in config.others:
+            self.live_validator.mark_dirty(DATA_GROUP, data_group)
+        
         # 填充参数配置表单
-        self.parameters = config.get("parameters", [])
+        self.parameters = config.parameters
         self.current_param_index = -1
         self.update_parameters_list()
         
@@ -1313,34 +1980,40 @@ class APICoreEditor(QMainWindow):
         self.param_list_value_edit.clear()
         
         if len(self.parameters) > 0:
-            self.parameters_list.setCurrentRow(0)
-            self.on_parameter_selected(self.parameters_list.currentItem())
+            self.select_parameter(0)
         
         # 填充响应配置表单
-        response = config.get("response", {})
-        image = response.get("image", {})
+        image = config.image
         
-        content_type = image.get("content_type", "URL")
-        if content_type in ["URL", "BINARY"]:
-            self.image_content_type_combo.setCurrentText(content_type)
+        if image.content_type in ["URL", "BINARY"]:
+            self.image_content_type_combo.setCurrentText(image.content_type)
         
-        self.image_path_edit.setText(image.get("path", ""))
-        self.image_is_list_check.setChecked(image.get("is_list", False))
-        self.image_is_base64_check.setChecked(image.get("is_base64", False))
+        self.image_path_edit.setText(image.path)
+        self.image_is_list_check.setChecked(image.is_list)
+        self.image_is_base64_check.setChecked(image.is_base64)
         
-        self.data_groups = response.get("others", [])
-        self.current_group_index = -1
-        self.current_item_index = -1
+        # 保留配置中编辑器未展示的字段，保存时原样写回
+        self._config_extra = config.extra
+        self._response_extra = config.response_extra
+        self._image_extra = image.extra
+        
+        self.data_groups = config.others
         self.update_data_groups_list()
-        self.data_items_list.clear()
         
         if len(self.data_groups) > 0:
-            self.data_groups_list.setCurrentRow(0)
-            self.on_data_group_selected(self.data_groups_list.currentItem())
-
-    def save_file(self):
-        # 如果当前文件路径不存在，调用另存为
+            self.select_data_group(0)
+        
+        # 填充后的表单作为已保存的状态
+        self.change_tracker.reset(self.create_config_from_forms(complete=False),
+                                  deferred=lazy.pending if lazy is not None else ())
+        self.start_history()
         
+        # 当前页面需要的部分在窗口显示出基本信息之后读取
+        if lazy is not None:
+            QTimer.singleShot(0, lambda: self.on_tab_changed(self.tabs.currentIndex()))
+
+    def save_file(self, wait=False):
+        """保存到当前文件；序列化与写入在后台进行，wait 为 True 时等待写入完成并返回是否成功"""
         # 验证配置
         self.statusBar().showMessage("准备保存文件，正在验证配置...")
         if not self.validate_config(Reminder_on_Success=False):
@@ -1348,33 +2021,60 @@ class APICoreEditor(QMainWindow):
             self.statusBar().showMessage("保存失败：配置验证未通过，请检查配置")
             return False
         
+        # 如果当前文件路径不存在，调用另存为
         if self.current_file is None:
             logger.info("当前无文件路径，调用另存为")
             self.statusBar().showMessage("当前无文件路径，正在打开另存为对话框...")
-            return self.save_file_as()
-        
-        # 保存文件
-        try:
-            self.statusBar().showMessage(f"正在保存文件: {os.path.basename(self.current_file)}...")
-            config = self.create_config_from_forms()
-            
-            with open(self.current_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-            
-            # 更新状态栏
-            self.statusBar().showMessage(f"已保存: {os.path.basename(self.current_file)}，文件保存成功")
-            logger.info(f"文件已保存: {self.current_file}")
-            
-            return True
-            
-        except Exception as e:
-            error_msg = f"保存文件失败: {str(e)}"
-            logger.error(error_msg)
-            QMessageBox.critical(self, "错误", error_msg)
-            self.statusBar().showMessage(f"保存失败: {str(e)}")
-            return False
+            return self.save_file_as(wait)
+        
+        # 文件在打开后被其他程序修改过时确认是否覆盖（后台保存进行中时文件的变化来自本程序）
+        if not self.config_saver.isRunning() and self.change_tracker.file_changed(self.current_file):
+            reply = QMessageBox.question(self, "确认", "文件已被其他程序修改，是否覆盖？",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                self.statusBar().showMessage("已取消保存：文件已被其他程序修改")
+                return False
+        
+        # 在界面线程中生成字典快照，之后的编辑不会影响正在进行的保存
+        data = self.create_config_from_forms().to_dict()
+        token = (self.change_tracker.generation, self.change_tracker.current_digest())
+        self.statusBar().showMessage(f"正在保存文件: {os.path.basename(self.current_file)}...")
+        self.config_saver.save(data, self.current_file, token)
+        
+        if wait:
+            return self.finish_pending_saves(self.current_file)
+        return True
+        
+    def finish_pending_saves(self, path=None):
+        """等待后台保存完成并立即处理完成通知，返回 path（为 None 时为全部文件）是否保存成功"""
+        ok = self.config_saver.flush(path)
+        QApplication.sendPostedEvents(None, QEvent.MetaCall)
+        return ok
+        
+    def on_config_saved(self, path, token, seconds, coalesced):
+        generation, saved = token
+        # 保存期间打开了其他文件或新建了文件时，不再更新变更状态
+        if generation == self.change_tracker.generation and path == self.current_file:
+            self.change_tracker.mark_saved(path, saved)
+            # 已保存的编辑不再需要日志；保存期间又有编辑时以当前配置作为基准
+            if self.change_tracker.dirty:
+                self.journal.write_snapshot(*self.journal_snapshot())
+            else:
+                self.journal.reset(path)
+        
+        message = f"已保存: {os.path.basename(path)}，用时 {seconds * 1000:.0f} ms"
+        if coalesced:
+            message += f"（合并了 {coalesced} 次保存请求）"
+        self.statusBar().showMessage(message)
+        logger.info(f"文件已保存: {path}，用时 {seconds:.3f} 秒")
+        
+    def on_config_save_failed(self, path, token, error):
+        error_msg = f"保存文件失败: {error}"
+        logger.error(error_msg)
+        QMessageBox.critical(self, "错误", error_msg)
+        self.statusBar().showMessage(f"保存失败: {error}")
             
-    def save_file_as(self):
+    def save_file_as(self, wait=False):
         # 打开文件对话框
         if not self.validate_config(Reminder_on_Success=False):
             return False
@@ -1390,34 +2090,45 @@ class APICoreEditor(QMainWindow):
             self.current_file = file_path
             
             # 保存文件
-            return self.save_file()
+            return self.save_file(wait)
         
         return False
         
-    def create_config_from_forms(self):
-        # 创建配置对象
-        config = {
-            "friendly_name": self.friendly_name_edit.text(),
-            "intro": self.intro_edit.toPlainText(),
-            "icon": self.icon_edit.text(),
-            "link": self.link_edit.text(),
-            "func": self.func_combo.currentText(),
-            "APICORE_version": self.version_combo.currentText(),  # 从下拉框获取版本
-            "parameters": self.parameters,
-            "response": {
-                "image": {
-                    "content_type": self.image_content_type_combo.currentText(),
-                    "path": self.image_path_edit.text(),
-                    "is_list": self.image_is_list_check.isChecked(),
-                    "is_base64": self.image_is_base64_check.isChecked()
-                },
-                "others": self.data_groups
-            }
-        }
+    def create_config_from_forms(self, complete=True) -> Config:
+        """创建配置对象，参数与数据组直接引用编辑器持有的模型；complete 为 False 时不读取按需打开的文件中尚未读取的部分，为 True 时读取失败抛出 LazyLoadError"""
+        if complete:
+            self.ensure_loaded()
+        config = Config(
+            friendly_name=self.friendly_name_edit.text(),
+            intro=self.intro_edit.toPlainText(),
+            icon=self.icon_value,
+            link=self.link_edit.text(),
+            func=self.func_combo.currentText(),
+            APICORE_version=self.version_combo.currentText(),  # 从下拉框获取版本
+            parameters=self.parameters,
+            image=self.create_image_from_forms(),
+            others=self.data_groups,
+            response_extra=self._response_extra,
+            extra=self._config_extra
+        )
         
         return config
         
+    def create_image_from_forms(self) -> ImageSpec:
+        # 响应配置标签页创建之前，图像配置的表单为默认值
+        if not self.tabs_built:
+            return ImageSpec(extra=self._image_extra)
+        return ImageSpec(
+            content_type=self.image_content_type_combo.currentText(),
+            path=self.image_path_edit.text(),
+            is_list=self.image_is_list_check.isChecked(),
+            is_base64=self.image_is_base64_check.isChecked(),
+            extra=self._image_extra
+        )
+        
     def preview_config(self):
+        if not self.load_pending():
+            return
         # 创建配置对象
         config = self.create_config_from_forms()
         
@@ -1448,7 +2159,7 @@ class APICoreEditor(QMainWindow):
         highlighter = JsonHighlighter(text_edit.document())
         
         # 设置配置内容
-        config_json = json.dumps(config, ensure_ascii=False, indent=2)
+        config_json = apicore.dumps(config)
         text_edit.setPlainText(config_json)
         
         # 添加文本编辑框到布局
@@ -1470,44 +2181,14 @@ class APICoreEditor(QMainWindow):
         dialog.exec_()
         
     def validate_config(self, Reminder_on_Success=True) -> bool:
+        if not self.load_pending():
+            return False
         # 创建配置对象
         config = self.create_config_from_forms()
         logger.info(f"开始验证配置")
         # 验证配置
         try:
-            # 基本验证
-            assert config.get('APICORE_version') == '1.0', "无效的版本号"
-            assert config.get('link') and config.get('func'), "缺少必要的API配置"
-            assert config.get('friendly_name'), "缺少API接口名称"
-            
-            # 参数验证
-            for param in config.get('parameters', []):
-                param_type = param.get('type')
-                param_name = param.get('name')
-                assert param_type in ['integer', 'boolean', 'list', 'string', 'enum'], f"在参数 {param_name} 上存在无效的参数类型: {param_type}"
-                
-                if param_type == 'integer':
-                    assert param.get('min_value') is not None, f"在参数 {param_name} 上缺少最小值"
-                    assert param.get('max_value') is not None, f"在参数 {param_name} 上缺少最大值"
-                    assert int(param.get('min_value')) <= int(param.get('max_value')), f"在参数 {param_name} 上最小值大于最大值"
-                    assert int(param.get('value')) <= int(param.get('max_value')), f"在参数 {param_name} 上值大于最大值"
-                    assert int(param.get('value')) >= int(param.get('min_value')), f"在参数 {param_name} 上值小于最小值"
-                elif param_type == 'list':
-                    assert param.get('split_str') is not None, f"在参数 {param_name} 上缺少分割符"
-                elif param_type == 'enum':
-                    assert param.get('friendly_value') is not None and len(param.get('friendly_value')) > 0, f"在参数 {param_name} 上缺少友好值列表"
-                    assert param.get('value') is not None and len(param.get('value')) > 0, f"在参数 {param_name} 上缺少值列表"
-                    # 验证友好值列表与值列表长度是否一致
-                    assert len(param.get('friendly_value')) == len(param.get('value')), f"在参数 {param_name} 上枚举类型的友好值列表与值列表长度不匹配"
-                
-                assert param.get('friendly_name'), f"在参数 {param_name} 上缺少友好名称"
-            
-            # 响应验证
-            response = config.get('response', {})
-            image = response.get('image', {})
-            assert image.get('content_type'), "缺少图像类型"
-            if self.image_content_type_combo.currentText() != "BINARY": 
-                assert image.get('path'), "缺少图像路径"
+            apicore.validate(config)
             
             if Reminder_on_Success:
                 QMessageBoxEx.information(self, "提示", "配置文件验证通过")
@@ -1516,8 +2197,13 @@ class APICoreEditor(QMainWindow):
                 logger.debug("配置文件验证通过（静默模式）")
                 
             return True
-        except AssertionError as e:
-            error_msg = f"配置文件验证失败: {str(e)}"
+        except ValidationError as e:
+            # 一次列出全部错误，避免逐个修复时反复验证
+            found = [issue for issue in e.issues if issue.severity == apicore.ERROR]
+            lines = [f"{issue.pointer}  {issue.message}" for issue in found[:20]]
+            if len(found) > 20:
+                lines.append(f"……以及另外 {len(found) - 20} 个错误")
+            error_msg = f"配置文件验证失败，共 {len(found)} 个错误:\n" + "\n".join(lines)
             logger.warning(error_msg)
             QMessageBox.critical(self, "错误", error_msg)
             return False
@@ -1527,8 +2213,84 @@ class APICoreEditor(QMainWindow):
             QMessageBox.critical(self, "错误", error_msg)
             return False
             
+    def set_icon(self, value):
+        """设置图标；内容相同的内嵌图标共用存储中的同一个字符串"""
+        if not is_inline(value):
+            value = self.blob_store.put(value)
+        if value is self.icon_value or value == self.icon_value:
+            return
+        self.icon_value = value
+        
+        # 地址等短文本在文本框中编辑，内嵌图标只显示缩略图
+        self._updating_icon = True
+        try:
+            text = value if is_inline(value) else ""
+            if self.icon_edit.text() != text:
+                self.icon_edit.setText(text)
+        finally:
+            self._updating_icon = False
+        self.update_icon_preview()
+        self.icon_changed.emit()
+        
+    def on_icon_text_edited(self, text):
+        if not self._updating_icon:
+            self.set_icon(text)
+        
+    def update_icon_preview(self):
+        value = self.icon_value
+        self.icon_preview.clear()
+        self.icon_clear_btn.setEnabled(bool(value))
+        if not value:
+            self.icon_info_label.setText("未设置图标")
+            return
+        if is_inline(value):
+            self.icon_info_label.setText("图标地址")
+            return
+        
+        info = describe(value)
+        self.icon_info_label.setText(f"内嵌图标：{info.describe()}")
+        self.icon_info_label.setToolTip(f"sha256: {info.key}")
+        # 大图标的解码需要数十毫秒，在窗口更新之后进行
+        QTimer.singleShot(0, lambda: self.decode_icon_preview(value, info))
+        
+    def decode_icon_preview(self, value, info):
+        # 解码前图标已被修改时不再需要
+        if value is not self.icon_value:
+            return
+        decoded = decode_data_uri(value)
+        image = QImage.fromData(decoded[1]) if decoded is not None else QImage()
+        if image.isNull():
+            self.icon_info_label.setText(f"内嵌图标（无法预览）：{info.describe()}")
+        else:
+            pixmap = QPixmap.fromImage(image.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.icon_preview.setPixmap(pixmap)
+            self.icon_info_label.setText(f"内嵌图标 {image.width()}×{image.height()}：{info.describe()}")
+        
+    def choose_icon_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择图标图片", "", "图片 (*.png *.jpg *.jpeg *.gif *.bmp *.svg *.ico *.webp);;所有文件 (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            QMessageBox.critical(self, "错误", f"读取图片失败: {str(e)}")
+            return
+        self.set_icon(encode_data_uri(data, guess_mime_type(file_path)))
+        self.statusBar().showMessage(f"已设置图标: {os.path.basename(file_path)}")
+        
+    def paste_icon(self):
+        # 转换工具生成的 data URI 可能超过文本框的长度限制，直接从剪贴板读取
+        text = QApplication.clipboard().text().strip()
+        if not text:
+            self.statusBar().showMessage("剪贴板中没有文本")
+            return
+        self.set_icon(text)
+        self.statusBar().showMessage("已从剪贴板设置图标")
+        
     def open_image_converter(self):
         # 打开图片转换工具
+        import subprocess
         try:
             # 获取当前脚本所在目录
             if getattr(sys, 'frozen', False):
@@ -1549,6 +2311,207 @@ class APICoreEditor(QMainWindow):
             logger.error(error_msg)
             QMessageBox.critical(self, "错误", error_msg)
     
+    def create_workspace_dock(self):
+        # 工作区目录的索引保存在本地数据库中，首次显示面板时才打开
+        self.workspace_root = self.get_config_dir()
+        self.workspace_index = None
+        self.workspace_indexer = None
+        self.workspace_reindex_pending = False
+        # 索引期间目录监视器报告的变化，完成后再处理
+        self.workspace_pending_paths = set()
+        # 工作区目录的监视器，首次显示面板时启动
+        self.workspace_watcher = None
+        
+        self.workspace_dock = QDockWidget("工作区", self)
+        self.workspace_dock.setObjectName("workspace_dock")
+        workspace_widget = QWidget()
+        workspace_layout = QVBoxLayout(workspace_widget)
+        workspace_layout.setContentsMargins(5, 5, 5, 5)
+        
+        self.workspace_root_label = QLabel()
+        self.workspace_root_label.setWordWrap(True)
+        workspace_layout.addWidget(self.workspace_root_label)
+        
+        workspace_buttons_layout = QHBoxLayout()
+        workspace_choose_btn = QPushButton("选择目录")
+        workspace_choose_btn.clicked.connect(self.choose_workspace_root)
+        self.workspace_reindex_btn = QPushButton("重新索引")
+        self.workspace_reindex_btn.clicked.connect(self.reindex_workspace)
+        workspace_buttons_layout.addWidget(workspace_choose_btn)
+        workspace_buttons_layout.addWidget(self.workspace_reindex_btn)
+        workspace_layout.addLayout(workspace_buttons_layout)
+        
+        self.workspace_search_edit = QLineEdit()
+        self.workspace_search_edit.setPlaceholderText("搜索名称、链接、参数或数据组")
+        self.workspace_search_edit.textChanged.connect(self.search_workspace)
+        workspace_layout.addWidget(self.workspace_search_edit)
+        
+        self.workspace_list = QListWidget()
+        self.workspace_list.itemActivated.connect(self.on_workspace_item_activated)
+        workspace_layout.addWidget(self.workspace_list)
+        
+        self.workspace_status_label = QLabel()
+        self.workspace_status_label.setWordWrap(True)
+        workspace_layout.addWidget(self.workspace_status_label)
+        
+        self.workspace_count_label = QLabel()
+        workspace_layout.addWidget(self.workspace_count_label)
+        
+        self.workspace_dock.setWidget(workspace_widget)
+        self.addDockWidget(Qt.LeftDockWidgetArea, self.workspace_dock)
+        self.workspace_dock.hide()
+        self.workspace_dock.visibilityChanged.connect(self.on_workspace_visibility_changed)
+        self.update_workspace_root_label()
+        
+    def update_workspace_root_label(self):
+        self.workspace_root_label.setText(f"目录: {self.workspace_root}" if self.workspace_root else "未找到配置目录")
+        self.workspace_root_label.setToolTip(self.workspace_root)
+        
+    def on_workspace_visibility_changed(self, visible):
+        self.workspace_action.setChecked(visible)
+        if not visible or self.workspace_index is not None:
+            return
+        try:
+            self.workspace_index = WorkspaceIndex(DEFAULT_INDEX_PATH)
+        except WorkspaceError as e:
+            logger.error(str(e))
+            self.workspace_status_label.setText(str(e))
+            return
+        # 先显示上次的索引，同时在后台更新
+        self.search_workspace()
+        self.reindex_workspace()
+        self.start_workspace_watcher()
+        
+    def choose_workspace_root(self):
+        root = QFileDialog.getExistingDirectory(self, "选择工作区目录", self.workspace_root)
+        if not root:
+            return
+        self.workspace_root = root
+        self.update_workspace_root_label()
+        self.search_workspace()
+        self.reindex_workspace()
+        self.start_workspace_watcher()
+        
+    def start_workspace_watcher(self):
+        # 启动时扫描一次整个目录，之后只处理文件系统通知报告的变化
+        self.stop_workspace_watcher()
+        if not self.workspace_root or not os.path.isdir(self.workspace_root):
+            return
+        self.workspace_watcher = DirectoryWatcher(self.workspace_root, self)
+        self.workspace_watcher.scanned.connect(self.on_workspace_scanned)
+        self.workspace_watcher.updated.connect(self.on_workspace_files_changed)
+        self.workspace_watcher.start()
+        
+    def stop_workspace_watcher(self):
+        if self.workspace_watcher is None:
+            return
+        self.workspace_watcher.stop()
+        self.workspace_watcher.deleteLater()
+        self.workspace_watcher = None
+        self.workspace_pending_paths.clear()
+        
+    def on_workspace_scanned(self):
+        # 数据库已在显示面板时完整索引，只需显示验证结果
+        self.search_workspace()
+        unwatched = self.workspace_watcher.unwatched
+        if unwatched:
+            logger.warning(f"超出系统文件监视数量上限，{unwatched} 个文件的修改无法自动检测")
+        
+    def on_workspace_files_changed(self, paths):
+        logger.debug(f"工作区文件变化: {len(paths)} 个")
+        self.statusBar().showMessage(f"工作区中 {len(paths)} 个文件已变化")
+        # 数据库只更新这些文件，不重新遍历目录
+        self.reindex_workspace(paths=paths)
+        
+    def reindex_workspace(self, *args, paths=None):
+        if self.workspace_index is None:
+            return
+        if not self.workspace_root:
+            self.workspace_status_label.setText("请先选择工作区目录")
+            return
+        # 正在索引时，完成后再索引一次
+        if self.workspace_indexer is not None:
+            if paths is None:
+                self.workspace_reindex_pending = True
+            else:
+                self.workspace_pending_paths.update(paths)
+            return
+        if paths is None:
+            self.workspace_status_label.setText("正在索引...")
+            self.workspace_reindex_btn.setEnabled(False)
+        self.workspace_indexer = WorkspaceIndexer(DEFAULT_INDEX_PATH, self.workspace_root, paths)
+        self.workspace_indexer.indexed.connect(self.on_workspace_indexed)
+        self.workspace_indexer.index_failed.connect(self.on_workspace_index_failed)
+        self.workspace_indexer.finished.connect(self.on_workspace_indexer_finished)
+        self.workspace_indexer.start()
+        
+    def on_workspace_indexed(self, root, stats):
+        logger.info(f"工作区索引完成: {root}，{stats}")
+        if root != self.workspace_root:
+            return
+        self.search_workspace()
+        self.workspace_status_label.setText(
+            f"共 {self.workspace_index.count(root)} 个文件（新增 {stats.added}，更新 {stats.updated}，"
+            f"删除 {stats.removed}），索引用时 {stats.seconds:.2f} 秒")
+        
+    def on_workspace_index_failed(self, root, error):
+        logger.error(f"工作区索引失败: {root}，{error}")
+        self.workspace_status_label.setText(f"索引失败: {error}")
+        
+    def on_workspace_indexer_finished(self):
+        self.workspace_indexer.deleteLater()
+        self.workspace_indexer = None
+        self.workspace_reindex_btn.setEnabled(True)
+        if self.workspace_reindex_pending:
+            # 完整索引已包含监视器报告的变化
+            self.workspace_reindex_pending = False
+            self.workspace_pending_paths.clear()
+            self.reindex_workspace()
+        elif self.workspace_pending_paths:
+            paths = sorted(self.workspace_pending_paths)
+            self.workspace_pending_paths.clear()
+            self.reindex_workspace(paths=paths)
+        
+    def search_workspace(self, *args):
+        if self.workspace_index is None:
+            return
+        self.workspace_list.clear()
+        if not self.workspace_root:
+            return
+        try:
+            entries = self.workspace_index.search(self.workspace_search_edit.text(), root=self.workspace_root)
+        except WorkspaceError as e:
+            self.workspace_status_label.setText(str(e))
+            return
+        # 监视器完成扫描后显示各文件的验证结果
+        watcher = self.workspace_watcher
+        files = watcher.index if watcher is not None and watcher.ready else None
+        for entry in entries:
+            item = QListWidgetItem(entry.name)
+            item.setData(Qt.UserRole, entry.path)
+            lines = [entry.path]
+            if entry.error:
+                item.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxCritical))
+                lines.append(f"无法解析: {entry.error}")
+            else:
+                lines.append(f"{entry.func} {entry.link}")
+                if entry.parameters:
+                    lines.append("参数: " + ", ".join(f"{name} ({type})" for name, type in entry.parameters))
+                if entry.data_groups:
+                    lines.append("数据组: " + ", ".join(entry.data_groups))
+                info = files.get(entry.path) if files is not None else None
+                if info is not None and info.status == FAILED:
+                    item.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxWarning))
+                    lines.append(f"验证未通过（{info.errors} 个错误）: {info.message}")
+            item.setToolTip("\n".join(lines))
+            self.workspace_list.addItem(item)
+        if files is not None:
+            self.workspace_count_label.setText(
+                f"验证通过 {files.count(PASSED)}，未通过 {files.count(FAILED)}，无法解析 {files.count(BROKEN)}")
+        
+    def on_workspace_item_activated(self, item):
+        self.open_file(item.data(Qt.UserRole))
+        
     def show_about(self):
         # 显示关于对话框
         about_text = """APICORE 配置文件编辑器
@@ -1578,68 +2541,191 @@ APICORE 版本: 1.0
         # 显示对话框
         msg_box.exec_()
         
-    def config_has_changes(self):
-        """检查当前配置是否与已保存的配置不同"""
-        # 如果是新文件（从未保存过），则认为有更改
-        if self.current_file is None:
-            # 检查是否有任何基本配置被填写
-            if (self.friendly_name_edit.text() or 
-                self.intro_edit.toPlainText() or 
-                self.icon_edit.text() or 
-                self.link_edit.text()):
-                return True
-            
-            # 检查是否有参数被添加
-            if len(self.parameters) > 0:
-                return True
-            
-            # 检查是否有数据组被添加
-            if len(self.data_groups) > 0:
+    def recover_from_journal(self):
+        """已退出（包括异常退出）的编辑器留下了未保存的编辑时，询问是否恢复；恢复后返回 True
+
+        正在运行的其他编辑器的日志不会被恢复或删除。恢复一个日志后，其余日志留到下次启动时处理。
+        """
+        for path in find_orphans(os.path.dirname(self.journal.path)):
+            if path == self.journal.path:
+                continue
+            lock = JournalLock(path)
+            if not lock.acquire():
+                # 同时启动的其他编辑器正在处理该日志
+                continue
+            try:
+                recovered = self.recover_journal(path)
+                # 恢复的编辑已写入本进程的日志，放弃或无法读取的日志不再保留
+                remove_journal(path)
+            finally:
+                lock.release()
+            if recovered:
                 return True
-            
+        return False
+        
+    def recover_journal(self, path):
+        """询问是否恢复日志 path 中的编辑；恢复后返回 True"""
+        try:
+            recovery = replay_journal(path)
+        except (OSError, ValueError, JournalError) as e:
+            logger.error(f"读取编辑日志失败: {str(e)}")
+            return False
+        if recovery is None:
+            return False
+        
+        name = os.path.basename(recovery.file) if recovery.file else "未保存的新配置"
+        message = f"上次编辑 {name} 时程序异常退出，留下了 {recovery.operations} 项未保存的编辑，是否恢复？"
+        if recovery.base_changed:
+            message += "\n该文件在此之后被修改过，恢复的结果可能与退出前不同。"
+        logger.info(f"发现编辑日志: {name}，{recovery.operations} 项编辑")
+        if QMessageBox.question(self, "恢复编辑", message, QMessageBox.Yes | QMessageBox.No,
+                                QMessageBox.Yes) != QMessageBox.Yes:
+            logger.info("用户放弃了编辑日志中的编辑")
             return False
         
+        self.fill_forms_from_config(recovery.config)
+        self.current_file = recovery.file
+        # 恢复的编辑相对于磁盘上的文件仍是未保存的更改
         try:
-            # 加载已保存的配置
-            with open(self.current_file, 'r', encoding='utf-8') as f:
-                saved_config = json.load(f)
-            
-            # 获取当前配置
-            current_config = self.create_config_from_forms()
-            
-            # 比较配置是否相同
-            return json.dumps(saved_config, ensure_ascii=False, sort_keys=True) != \
-                   json.dumps(current_config, ensure_ascii=False, sort_keys=True)
-            
+            saved = apicore.load(recovery.file) if recovery.file else Config()
+            self.change_tracker.mark_saved(recovery.file, config_digest(saved))
         except Exception as e:
-            logger.error(f"比较配置时发生错误: {str(e)}")
-            # 如果发生错误，默认认为有更改
+            logger.warning(f"读取基准文件失败: {str(e)}")
+            self.change_tracker.dirty = True
+        self.journal.write_snapshot(self.create_config_from_forms(), recovery.file)
+        # 写入本进程的日志后才删除原来的日志
+        self.journal.flush()
+        self.statusBar().showMessage(f"已恢复 {recovery.operations} 项未保存的编辑: {name}")
+        logger.info(f"已从编辑日志恢复: {name}")
+        return True
+    
+    def config_has_changes(self):
+        """检查当前配置是否与已保存的配置不同"""
+        # 摘要在编辑时已增量更新，这里不需要重新读取或序列化配置
+        if self.change_tracker.dirty:
             return True
+        # 已保存的文件被删除时同样视为有未保存的更改
+        return self.current_file is not None and not os.path.exists(self.current_file)
+    
+    def check_external_changes(self):
+        """当前文件被其他程序修改时提示重新加载，只比较修改时间与大小"""
+        if self.current_file is None or not self.change_tracker.file_changed():
+            return
+        # 同一次修改只提示一次
+        self.change_tracker.record_file(self.current_file)
+        if not os.path.exists(self.current_file):
+            self.statusBar().showMessage(f"文件已被删除: {os.path.basename(self.current_file)}")
+            logger.warning(f"文件已被其他程序删除: {self.current_file}")
+            return
+        
+        message = f"文件 {os.path.basename(self.current_file)} 已被其他程序修改，是否重新加载？"
+        if self.change_tracker.dirty:
+            message += "\n当前未保存的更改将会丢失。"
+        logger.info(f"检测到文件被其他程序修改: {self.current_file}")
+        if QMessageBox.question(self, "文件已修改", message, QMessageBox.Yes | QMessageBox.No,
+                                QMessageBox.Yes) != QMessageBox.Yes:
+            return
+        self.reload_current_file()
+        
+    def reload_current_file(self, complete=False) -> bool:
+        """重新加载当前文件；complete 为 True 时完整读取，不按需打开"""
+        try:
+            if complete:
+                config, lazy = apicore.load(self.current_file), None
+            else:
+                config, lazy = self.read_config(self.current_file)
+            self.fill_forms_from_config(config, lazy)
+            self.change_tracker.record_file(self.current_file)
+            self.journal.reset(self.current_file)
+            self.statusBar().showMessage(f"已重新加载: {os.path.basename(self.current_file)}")
+            logger.info(f"文件已重新加载: {self.current_file}")
+            return True
+        except Exception as e:
+            error_msg = f"重新加载文件失败: {str(e)}"
+            logger.error(error_msg)
+            QMessageBox.critical(self, "错误", error_msg)
+            return False
+    
+    def changeEvent(self, event):
+        # 窗口重新获得焦点时检查文件是否被其他程序修改
+        super().changeEvent(event)
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.check_external_changes()
     
     def closeEvent(self, event):
         """重写窗口关闭事件，添加保存提示"""
+        # 先完成进行中的后台保存，已保存的内容不再提示
+        self.finish_pending_saves()
+        
         # 检查配置是否有更改
         if self.config_has_changes():
             reply = QMessageBox.question(self, "确认", "是否保存当前文件？", 
                                          QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Cancel)
             
             if reply == QMessageBox.Cancel:
-                # 取消关闭
+                # 取消关闭，编辑日志保留
                 event.ignore()
                 logger.info("用户取消了关闭窗口操作")
+                return
             elif reply == QMessageBox.Yes:
                 # 保存文件
-                if not self.save_file():
-                    # 保存失败，取消关闭
+                if not self.save_file(wait=True):
+                    # 保存失败，取消关闭，编辑日志保留
                     event.ignore()
                     logger.warning("保存文件失败，取消关闭窗口操作")
+                    return
             # 如果是No，则继续关闭
         
-        # 如果没有更改或用户选择不保存，则接受关闭事件
-        if not event.isAccepted():
-            event.accept()
+        # 没有更改或用户选择不保存、保存成功，接受关闭事件
+        event.accept()
+        
+        # 正常退出时编辑已保存或被放弃，删除编辑日志
+        self.release_resources()
+        
+    def release_resources(self):
+        """删除编辑日志并关闭文件、目录监视与工作区索引"""
+        self.journal.close(remove=True)
+        self.close_lazy_config()
+        self.stop_workspace_watcher()
+        if self.workspace_indexer is not None:
+            self.workspace_indexer.wait()
+        if self.workspace_index is not None:
+            self.workspace_index.close()
+
+def startup_benchmark() -> int:
+    """--startup-benchmark：启动编辑器，输出到主窗口首次绘制的各阶段耗时，创建其余标签页后退出
+
+    编辑日志写入临时目录，不会提示恢复或删除用户的编辑日志，退出时也不提示保存。
+    """
+    import tempfile
+    
+    journal_dir = tempfile.mkdtemp()
+    imported = time.perf_counter()
+    app = QApplication(sys.argv)
+    created = time.perf_counter()
+    editor = APICoreEditor(os.path.join(journal_dir, "recovery.journal"))
+    constructed = time.perf_counter()
+    editor.show()
+    while not editor.tabs_built:
+        app.processEvents(QEventLoop.WaitForMoreEvents)
+    built = time.perf_counter()
+    
+    for name, seconds in (("导入模块", imported - STARTED_AT),
+                          ("创建 QApplication", created - imported),
+                          ("创建主窗口", constructed - created),
+                          ("显示到首次绘制", editor.first_paint_time - constructed),
+                          ("启动到首次绘制", editor.first_paint_time - STARTED_AT),
+                          ("首次绘制后创建参数与响应配置", built - editor.first_paint_time)):
+        print(f"{name}: {seconds * 1000:.1f} ms")
+    editor.hide()
+    editor.release_resources()
+    os.rmdir(journal_dir)
+    return 0
 
 if __name__ == "__main__":
+    setup_logging()
+    if "--startup-benchmark" in sys.argv[1:]:
+        sys.exit(startup_benchmark())
     app = QApplication(sys.argv)
     editor = APICoreEditor()
     editor.show()
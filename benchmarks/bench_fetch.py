@@ -0,0 +1,51 @@
+"""图像下载基准测试
+
+启动本地模拟服务器（apicore.stub，每个响应带固定延迟以模拟网络往返），按不同的并发数下载
+同一批图像地址，报告吞吐量（MB/s）与首张图像到达时间。每轮使用新的缓存目录。
+
+用法: python benchmarks/bench_fetch.py [图像数量，默认 48] [单张大小KB，默认 256] [延迟毫秒，默认 50]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apicore.fetch import fetch_images
+from apicore.stub import StubServer
+
+WORKERS = (1, 4, 8, 16)
+
+
+async def run(count, size_kb, delay_ms):
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, "image.jpg")
+        with open(sample, "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+        async with StubServer(sample, delay=delay_ms / 1000) as server:
+            urls = [f"{server.base_url}/images/{i:04d}.jpg" for i in range(count)]
+            print(f"{count} 张图像，每张 {size_kb} KB，服务器延迟 {delay_ms} ms")
+            for workers in WORKERS:
+                cache_dir = os.path.join(tmp, f"cache{workers}")
+                report = await fetch_images(urls, cache_dir, workers=workers, per_host=workers)
+                assert report.count(True) == count, [r.error for r in report.results if not r.ok]
+                print(f"并发 {workers:3d}:  {report.seconds:6.3f} s  "
+                      f"{report.bytes_per_second / 1024 / 1024:8.1f} MB/s  "
+                      f"首张图像 {report.first_image_seconds * 1000:7.1f} ms")
+
+            # 第二次运行全部命中磁盘缓存
+            report = await fetch_images(urls, cache_dir, workers=WORKERS[-1])
+            print(f"缓存命中:  {report.seconds:6.3f} s  首张图像 {report.first_image_seconds * 1000:7.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    delay_ms = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    asyncio.run(run(count, size_kb, delay_ms))
+
+
+if __name__ == "__main__":
+    main()
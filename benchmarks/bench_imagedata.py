@@ -0,0 +1,68 @@
+"""二进制图像解码基准测试
+
+生成一张大尺寸 JPEG，写成带换行的 base64 文本文件，比较两种生成缩略图的方式：
+    - 流式：mmap 读取文件，按块解码 base64 并直接交给图像解码器，解码时缩小（apicore.imagedata）
+    - 整体：读入全部文本，一次性 base64 解码，完整解码图像后再缩小
+报告耗时与 tracemalloc 测得的峰值内存。
+
+用法: python benchmarks/bench_imagedata.py [宽度，默认 6000] [高度，默认 4000]
+"""
+
+import base64
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from apicore.imagedata import decode_file_thumbnail
+
+THUMBNAIL_SIZE = 256
+
+
+def whole_file(path):
+    with open(path, "rb") as f:
+        data = base64.b64decode(f.read())
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    return image
+
+
+def measure(func, path):
+    start = time.perf_counter()
+    func(path)
+    seconds = time.perf_counter() - start
+    # tracemalloc 会拖慢执行，峰值内存单独测量
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 6000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+    with tempfile.TemporaryDirectory() as tmp:
+        buffer = io.BytesIO()
+        Image.effect_noise((width, height), 64).convert("RGB").save(buffer, "JPEG", quality=95)
+        path = os.path.join(tmp, "response.b64")
+        with open(path, "wb") as f:
+            f.write(base64.encodebytes(buffer.getvalue()))
+        del buffer
+        print(f"{width}x{height} JPEG，base64 文件 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+        for name, func in (("流式解码", lambda p: decode_file_thumbnail(p, True, THUMBNAIL_SIZE)),
+                           ("整体解码", whole_file)):
+            seconds, peak = measure(func, path)
+            print(f"{name}: {seconds:6.3f} s  峰值内存 {peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""编辑日志基准测试
+
+在临时目录中按编辑器的方式记录一批随机编辑（字段修改以及参数、数据组、数据项的增删改），
+报告每次记录的耗时（编辑时的额外延迟）、后台写入完成所需的时间、日志大小与重放耗时，
+以及压缩时写入快照的耗时，并确认重放结果与直接修改的配置相同。
+
+用法: python benchmarks/bench_journal.py [操作数量，默认 100000]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apicore import Config, DataGroup, DataItem, Parameter, serialize
+from apicore.journal import Journal, replay
+
+
+def edit(config, journal, rng):
+    # 在 config 上执行一次随机编辑并记录
+    choice = rng.random()
+    if choice < 0.3:
+        name = rng.choice(("friendly_name", "link", "intro"))
+        value = f"{name}-{rng.randrange(1000)}"
+        setattr(config, name, value)
+        journal.field(name, value)
+    elif choice < 0.4:
+        config.image.path = f"data.images[{rng.randrange(10)}]"
+        journal.field("image.path", config.image.path)
+    elif choice < 0.5 or not config.parameters:
+        param = Parameter(name=f"p{rng.randrange(10 ** 6)}", type="integer", value=1, min_value=0, max_value=9)
+        config.parameters.append(param)
+        journal.add_parameter(param)
+    elif choice < 0.75:
+        index = rng.randrange(len(config.parameters))
+        param = config.parameters[index]
+        param.value = rng.randrange(10)
+        journal.set_parameter(index, param)
+    elif choice < 0.8:
+        index = rng.randrange(len(config.parameters))
+        config.parameters.pop(index)
+        journal.delete_parameter(index)
+    elif choice < 0.85 or not config.others:
+        group = DataGroup(f"数据组{rng.randrange(1000)}")
+        config.others.append(group)
+        journal.add_group(group)
+    elif choice < 0.88:
+        index = rng.randrange(len(config.others))
+        config.others[index].friendly_name = f"数据组{rng.randrange(1000)}"
+        journal.rename_group(index, config.others[index].friendly_name)
+    elif choice < 0.9:
+        index = rng.randrange(len(config.others))
+        config.others.pop(index)
+        journal.delete_group(index)
+    else:
+        group = rng.randrange(len(config.others))
+        items = config.others[group].data
+        if not items or rng.random() < 0.4:
+            item = DataItem(f"数据项{rng.randrange(1000)}", "data.value")
+            items.append(item)
+            journal.add_item(group, item)
+        elif rng.random() < 0.7:
+            index = rng.randrange(len(items))
+            items[index].path = f"data.list[{rng.randrange(10)}]"
+            journal.set_item(group, index, items[index])
+        else:
+            index = rng.randrange(len(items))
+            items.pop(index)
+            journal.delete_item(group, index)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recovery.journal")
+        config = Config()
+        # 关闭压缩，测量重放全部操作的耗时
+        journal = Journal(path, compact_every=count + 1)
+        journal.start()
+        journal.reset(None)
+
+        latencies = []
+        for _ in range(count):
+            begin = time.perf_counter()
+            edit(config, journal, rng)
+            latencies.append(time.perf_counter() - begin)
+        record = sum(latencies)
+        latencies.sort()
+        start = time.perf_counter()
+        journal.flush()
+        drain = time.perf_counter() - start
+        journal.close()
+
+        start = time.perf_counter()
+        recovery = replay(path)
+        seconds = time.perf_counter() - start
+        assert serialize.dumps_canonical(recovery.config.to_dict()) == serialize.dumps_canonical(config.to_dict())
+
+        print(f"{count} 次编辑（含模型修改）: {record * 1000:.1f} ms，平均 {record / count * 1e6:.2f} µs，"
+              f"p99 {latencies[int(count * 0.99)] * 1e6:.1f} µs，最长 {latencies[-1] * 1e6:.0f} µs")
+        print(f"等待后台写入完成: {drain * 1000:.1f} ms，日志 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        print(f"重放 {recovery.operations} 条操作: {seconds * 1000:.1f} ms "
+              f"（参数 {len(config.parameters)}，数据组 {len(config.others)}）")
+
+        # 压缩时在编辑线程中只复制列表与节点字段的引用，序列化在后台线程中进行
+        path = os.path.join(tmp, "compact.journal")
+        journal = Journal(path)
+        journal.start()
+        start = time.perf_counter()
+        journal.write_snapshot(config)
+        record = time.perf_counter() - start
+        start = time.perf_counter()
+        journal.flush()
+        drain = time.perf_counter() - start
+        journal.close()
+        recovery = replay(path)
+        assert serialize.dumps_canonical(recovery.config.to_dict()) == serialize.dumps_canonical(config.to_dict())
+        print(f"压缩（写入快照）: 记录 {record * 1000:.1f} ms，后台写入 {drain * 1000:.1f} ms，"
+              f"日志 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""按需打开大配置文件的基准测试
+
+在临时目录中生成约 50 MB 的配置（2 万个带枚举值的参数、大量数据项与一个内嵌图标），
+分别测量完整读取（apicore.load）与按需打开的耗时。按需打开的可交互时间包括建立索引、
+读取基本信息与图标，以及编辑器打开文件时的变更跟踪初始化；之后首次查看参数与响应配置时
+才解析对应的部分。最后确认按需读取的结果与完整读取相同。
+
+用法: python benchmarks/bench_lazy.py [参数数量，默认 20000]
+"""
+
+import base64
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import apicore
+from apicore import Config, DataGroup, DataItem, Parameter, serialize
+from apicore.blobs import BlobStore
+from apicore.lazy import LazyConfig
+from apicore.live import DATA_GROUP, PARAMETER
+from apicore.snapshot import ChangeTracker
+
+
+def generate(count, rng):
+    parameters = []
+    for i in range(count):
+        values = [f"value-{i}-{j}" for j in range(rng.randrange(20, 34))]
+        parameters.append(Parameter(name=f"param_{i}", type="enum", value=values,
+                                    friendly_value=[f"选项 {value}" for value in values],
+                                    friendly_name=f"参数 {i}"))
+    others = [DataGroup(f"数据组 {i}", [DataItem(f"数据项 {j}", f"data.items[{j}].value", type="string")
+                                        for j in range(50)])
+              for i in range(200)]
+    icon = "data:image/png;base64," + base64.b64encode(rng.randbytes(12 * 1024 * 1024)).decode("ascii")
+    return Config(friendly_name="大型配置", intro="基准测试", icon=icon, link="https://example.com/api",
+                  parameters=parameters, others=others)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.api.json")
+        apicore.dump(generate(count, rng), path)
+        size = os.path.getsize(path)
+        print(f"配置文件: {size / 1024 / 1024:.1f} MB，参数 {count}")
+
+        start = time.perf_counter()
+        full = apicore.load(path)
+        seconds = time.perf_counter() - start
+        print(f"完整读取: {seconds * 1000:.1f} ms")
+
+        # 按编辑器打开文件的步骤：建立索引，图标放入存储，初始化变更跟踪
+        start = time.perf_counter()
+        lazy = LazyConfig(path)
+        config = lazy.config
+        config.icon = BlobStore().put(config.icon)
+        tracker = ChangeTracker()
+        tracker.reset(config, path, deferred=lazy.pending)
+        interactive = time.perf_counter() - start
+        print(f"按需打开（可交互）: {interactive * 1000:.1f} ms"
+              f"{'' if interactive < 0.2 else '，超过 200 ms'}")
+
+        for kind, name in ((PARAMETER, "参数"), (DATA_GROUP, "数据组")):
+            section = lazy.size(kind)
+            start = time.perf_counter()
+            items = lazy.load(kind)
+            if kind == PARAMETER:
+                config.parameters = items
+            else:
+                config.others = items
+            tracker.load(kind, items)
+            seconds = time.perf_counter() - start
+            print(f"首次查看{name}: {seconds * 1000:.1f} ms（{section / 1024 / 1024:.1f} MB，{len(items)} 项）")
+        lazy.close()
+
+        assert not tracker.dirty
+        assert serialize.dumps_canonical(config.to_dict()) == serialize.dumps_canonical(full.to_dict())
+
+
+if __name__ == "__main__":
+    main()
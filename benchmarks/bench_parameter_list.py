@@ -0,0 +1,98 @@
+"""参数列表基准测试
+
+在编辑器中打开含有 100、1 万、10 万个参数的配置，分别测量添加、修改与删除一个参数的延迟
+（包括列表的更新与重新绘制、编辑日志、撤销历史与变更跟踪），并与此前每次修改后清空并重建
+整个 QListWidget 的做法对比。请求预览在编辑停顿后才生成，单独列出其耗时。
+使用 Qt 的 offscreen 平台，不显示窗口，也不弹出提示框。
+
+用法: python benchmarks/bench_parameter_list.py [参数数量 ...，默认 100 10000 100000]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 编辑日志与工作区索引写入临时目录
+os.environ["HOME"] = tempfile.mkdtemp()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from PyQt5.QtWidgets import QApplication, QListWidget, QListWidgetItem, QMessageBox
+
+from apicore import Config, Parameter
+
+REPEAT = 20
+
+
+def generate(count):
+    parameters = [Parameter(name=f"param_{i}", type="integer", value=1, min_value=0, max_value=9,
+                            friendly_name=f"参数 {i}")
+                  for i in range(count)]
+    return Config(friendly_name="参数列表", link="https://example.com/api", parameters=parameters)
+
+
+def measure(app, action):
+    # 包括处理完事件、重新绘制列表的时间
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        action()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+
+def rebuild(widget, parameters):
+    # 此前的 update_parameters_list
+    widget.clear()
+    for i, param in enumerate(parameters):
+        widget.addItem(QListWidgetItem(f"{i + 1}. {param.friendly_name} ({param.type})"))
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 10000, 100000]
+    app = QApplication(sys.argv)
+    # 删除时确认，修改与删除后的提示框不显示
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    import apicore_editor
+    apicore_editor.QMessageBoxEx.information = lambda *args, **kwargs: None
+
+    editor = apicore_editor.APICoreEditor()
+    editor.show()
+    editor.tabs.setCurrentWidget(editor.parameters_tab)
+    widget = QListWidget()
+    widget.show()
+    print(f"{'参数':>8} {'添加':>10} {'修改':>10} {'删除':>10} {'请求预览':>10} {'重建 QListWidget':>18}")
+    for count in counts:
+        editor.fill_forms_from_config(generate(count))
+        app.processEvents()
+        middle = count // 2
+
+        add = measure(app, editor.add_parameter)
+
+        def update():
+            editor.select_parameter(middle)
+            editor.param_friendly_name_edit.setText(f"参数 {time.perf_counter()}")
+            editor.update_parameter()
+        update_ms = measure(app, update)
+
+        def delete():
+            editor.select_parameter(middle)
+            editor.delete_parameter()
+        delete_ms = measure(app, delete)
+
+        preview_ms = measure(app, editor.update_request_preview)
+        rebuild_ms = measure(app, lambda: rebuild(widget, editor.parameters))
+        print(f"{count:>8} {add:>8.2f}ms {update_ms:>8.2f}ms {delete_ms:>8.2f}ms {preview_ms:>8.2f}ms "
+              f"{rebuild_ms:>16.2f}ms")
+
+    editor.journal.close(remove=True)
+
+
+if __name__ == "__main__":
+    main()
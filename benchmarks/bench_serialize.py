@@ -0,0 +1,65 @@
+"""JSON 后端基准测试
+
+生成带 base64 图标和大量参数的合成配置，比较标准库 json 与 orjson 后端在
+保存（格式化输出）、打开（解析）与变更比较（键排序的紧凑输出）上的耗时，并确认两者输出逐字节相同。
+
+用法: python benchmarks/bench_serialize.py
+"""
+
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apicore import Config, DataGroup, DataItem, Parameter
+from apicore.serialize import BACKENDS
+
+SIZES = (10, 1000, 20000)
+ICON_SIZE = 512 * 1024
+REPEAT = 5
+
+
+def make_config(count):
+    params = [Parameter(name=f"p{i}", type="enum", friendly_name=f"参数{i}",
+                        value=["Mahiro", "Mihari", "Momiji"], friendly_value=["自宅警备员", "究极妹控", "平板姬"])
+              for i in range(count)]
+    groups = [DataGroup(f"数据组{i}", [DataItem(f"数据项{j}", f"data.list[*].f{j}", "list", True) for j in range(5)])
+              for i in range(max(1, count // 20))]
+    icon = "data:image/png;base64," + base64.b64encode(os.urandom(ICON_SIZE)).decode("ascii")
+    return Config(friendly_name="Bench", intro="合成配置", icon=icon, link="https://example.com/api",
+                  parameters=params, others=groups)
+
+
+def best(func):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    if "orjson" not in BACKENDS:
+        print("未安装 orjson，只能测试标准库后端")
+    header = f"{'参数数量':>8} {'大小':>8} {'后端':>8} {'保存':>10} {'打开':>10} {'比较':>10}"
+    print(header)
+    for count in SIZES:
+        document = make_config(count).to_dict()
+        outputs = {}
+        for name, backend in BACKENDS.items():
+            text = backend.dumps(document)
+            outputs[name] = text
+            data = text.encode("utf-8")
+            save = best(lambda: backend.dumps(document))
+            load = best(lambda: backend.loads(data))
+            compare = best(lambda: backend.dumps_canonical(document))
+            print(f"{count:>8} {len(data) / 1024:>6.0f}KB {name:>8} {save * 1000:>8.2f}ms "
+                  f"{load * 1000:>8.2f}ms {compare * 1000:>8.2f}ms")
+        assert len(set(outputs.values())) == 1, "后端输出不一致"
+
+
+if __name__ == "__main__":
+    main()
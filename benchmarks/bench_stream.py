@@ -0,0 +1,98 @@
+"""流式提取基准测试
+
+生成一个大型的分页响应样例，使用示例配置中的路径进行流式提取，报告吞吐量（MB/s），
+并用 tracemalloc 测量峰值内存，与 json.load 整体解析进行对比。
+
+用法: python benchmarks/bench_stream.py [大小MB，默认 64]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apicore import jsonpath, load
+from apicore.stream import extract
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example.api.json")
+
+
+def write_sample(path, size_mb):
+    # 图像列表之外是大量与路径无关的分页数据，流式提取时会被跳过
+    target = size_mb * 1024 * 1024
+    page = json.dumps({"id": 0, "title": "page" * 8, "items": [{"k": i, "v": "x" * 40} for i in range(20)]})
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"pages": [')
+        written = 0
+        first = True
+        while written < target * 0.9:
+            if not first:
+                f.write(",")
+            f.write(page)
+            written += len(page) + 1
+            first = False
+        f.write('], "data": {"image": {"raw": [')
+        count = max(1, int(target * 0.1) // 60)
+        f.write(",".join(f'"https://img.example.com/{i:08d}.jpg"' for i in range(count)))
+        f.write('], "data": [' + ",".join(f'"2025-01-{i % 28 + 1:02d}"' for i in range(count)))
+        f.write('], "h": [' + ",".join(str(1080) for _ in range(count)))
+        f.write('], "w": [' + ",".join(str(1920) for _ in range(count)))
+        f.write('], "intro": "bench", "tags": ["a", "b"]}, '
+                '"author": {"name": "n", "sex": "f", "age": 1}}}')
+
+
+def expressions_from_example():
+    config = load(EXAMPLE)
+    expressions = [config.image.path]
+    for group in config.others:
+        expressions.extend(item.path for item in group.data)
+    return expressions
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    expressions = expressions_from_example()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.json")
+        write_sample(path, size_mb)
+        file_mb = os.path.getsize(path) / 1024 / 1024
+
+        start = time.perf_counter()
+        found = extract(path, expressions)
+        seconds = time.perf_counter() - start
+        print(f"样例大小: {file_mb:.1f} MB，匹配图像 {len(found[expressions[0]])} 个")
+        print(f"流式提取:   {seconds:7.2f} s  {file_mb / seconds:8.1f} MB/s")
+
+        def full_load():
+            with open(path, "rb") as f:
+                document = json.load(f)
+            return {e: jsonpath.evaluate(e, document) for e in expressions}
+
+        start = time.perf_counter()
+        expected = full_load()
+        seconds = time.perf_counter() - start
+        print(f"json.load:  {seconds:7.2f} s  {file_mb / seconds:8.1f} MB/s")
+        assert expected == found
+
+        # tracemalloc 会显著拖慢执行，峰值内存单独测量
+        _, _, stream_peak = measure(lambda: extract(path, expressions))
+        _, _, load_peak = measure(full_load)
+        print(f"峰值内存: 流式 {stream_peak / 1024 / 1024:.1f} MB，json.load {load_peak / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
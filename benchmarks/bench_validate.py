@@ -0,0 +1,79 @@
+"""验证引擎基准测试
+
+分别按参数数量和数据项数量生成合成配置，测量 apicore.check 的耗时。
+每个元素的平均耗时保持稳定即说明验证随规模线性增长。
+
+用法: python benchmarks/bench_validate.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apicore import Config, DataGroup, DataItem, Parameter, check
+
+SIZES = (100, 1000, 10000, 100000)
+
+
+def make_parameters(count):
+    # 五种参数类型轮流出现，其中一部分故意带有错误
+    params = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            params.append(Parameter(name=f"p{i}", type="integer", friendly_name=f"整数{i}",
+                                    value=i % 200, min_value=0, max_value=100))
+        elif kind == 1:
+            params.append(Parameter(name=f"p{i}", type="boolean", friendly_name=f"布尔{i}", value=True))
+        elif kind == 2:
+            params.append(Parameter(name=f"p{i}", type="list", friendly_name=f"列表{i}",
+                                    value=["a", "b"], split_str=","))
+        elif kind == 3:
+            params.append(Parameter(name=f"p{i}", type="string", friendly_name="", value="x"))
+        else:
+            params.append(Parameter(name=f"p{i}", type="enum", friendly_name=f"枚举{i}",
+                                    value=["a", "b", "c"], friendly_value=["A", "B"]))
+    return params
+
+
+def make_groups(item_count, items_per_group=10):
+    groups = []
+    for g in range(0, item_count, items_per_group):
+        items = [DataItem(friendly_name=f"项{i}", path=f"data.list[*].f{i}" if i % 7 else "",
+                          type="list", one_to_one_mapping=True)
+                 for i in range(g, min(g + items_per_group, item_count))]
+        groups.append(DataGroup(friendly_name=f"组{g}", data=items))
+    return groups
+
+
+def measure(config, repeat=3):
+    best = float("inf")
+    issues = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        issues = check(config)
+        best = min(best, time.perf_counter() - start)
+    return best, len(issues)
+
+
+def main():
+    base = dict(friendly_name="bench", link="https://example.com", func="GET")
+
+    print(f"{'参数数量':>10} {'耗时(ms)':>10} {'每参数(us)':>12} {'问题数':>8}")
+    for size in SIZES:
+        seconds, issue_count = measure(Config(parameters=make_parameters(size), **base))
+        print(f"{size:>10} {seconds * 1000:>10.2f} {seconds / size * 1e6:>12.3f} {issue_count:>8}")
+
+    print()
+    print(f"{'数据项数量':>10} {'耗时(ms)':>10} {'每数据项(us)':>12} {'问题数':>8}")
+    for size in SIZES:
+        config = Config(others=make_groups(size), **base)
+        config.image.path = "data.list[*].url"
+        seconds, issue_count = measure(config)
+        print(f"{size:>10} {seconds * 1000:>10.2f} {seconds / size * 1e6:>12.3f} {issue_count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
 import sys
 import os
 import base64
-from io import BytesIO
-from PIL import Image
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QFileDialog, 
                             QTextEdit, QMessageBox)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 与 benchmarks 相同，从仓库根目录导入 apicore 与编辑器
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,69 @@
+"""图像下载
+
+在本地模拟服务器（apicore.stub）上运行：从列表形式的样例响应中提取图像地址并下载，检查缓存的
+内容与服务器返回的相同，且每个主机的并发请求数不超过上限。
+"""
+
+import asyncio
+import json
+import os
+
+from apicore import Config, ImageSpec
+from apicore.fetch import fetch_images
+from apicore.simulate import IMAGE, run_samples
+from apicore.stub import StubServer
+
+COUNT = 12
+PER_HOST = 3
+
+
+def image_urls(config, sample):
+    # 与编辑器相同：取图像路径提取到的地址并去重
+    urls = []
+    for result in run_samples(config, [sample]):
+        if result.section == IMAGE and not result.error:
+            urls.extend(value for value in result.values if isinstance(value, str))
+    return list(dict.fromkeys(urls))
+
+
+def test_fetch_list_response(tmp_path):
+    image = tmp_path / "image.jpg"
+    image.write_bytes(os.urandom(64 * 1024))
+    config = Config(image=ImageSpec(content_type="URL", path="data.images[*].url", is_list=True))
+
+    async def main():
+        # 每个响应带延迟，使请求在服务器上重叠
+        async with StubServer(str(image), delay=0.05) as server:
+            sample = tmp_path / "response.json"
+            # 重复的地址只下载一次
+            images = [{"url": f"{server.base_url}/images/{i % COUNT}.jpg"} for i in range(COUNT + 4)]
+            sample.write_text(json.dumps({"data": {"images": images}}), encoding="utf-8")
+            urls = image_urls(config, str(sample))
+            report = await fetch_images(urls, str(tmp_path / "cache"), workers=8, per_host=PER_HOST)
+            return server, urls, report
+
+    server, urls, report = asyncio.run(main())
+    assert len(urls) == COUNT
+    assert [result.url for result in report.results] == urls
+    assert report.count(False) == 0, [result.error for result in report.results if not result.ok]
+    for result in report.results:
+        with open(result.path, "rb") as f:
+            assert f.read() == server.body
+    assert server.requests == COUNT
+    assert 1 < server.max_active <= PER_HOST
+    # 中断或完成的下载都不会留下临时文件
+    assert not [name for name in os.listdir(tmp_path / "cache") if name.endswith(".part")]
+
+
+def test_fetch_errors_are_reported(tmp_path):
+    image = tmp_path / "image.jpg"
+    image.write_bytes(b"missing")
+
+    async def main():
+        async with StubServer(str(image), status=404) as server:
+            return await fetch_images([f"{server.base_url}/a.jpg", 42], str(tmp_path / "cache"))
+
+    report = asyncio.run(main())
+    assert [result.ok for result in report.results] == [False, False]
+    assert report.results[0].error == "HTTP 404"
+    assert os.listdir(tmp_path / "cache") == []
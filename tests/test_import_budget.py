@@ -0,0 +1,22 @@
+"""编辑器启动时的导入耗时
+
+在新的解释器进程中导入 apicore_editor，导入总耗时超出预算时失败，防止新增的顶层导入拖慢启动。
+"""
+
+import os
+
+import pytest
+
+from apicore.importtime import profile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 当前约 130 ms；numpy、PIL 等重新改为在顶层导入时约 340 ms
+BUDGET_MS = 250
+
+
+def test_editor_import_within_budget():
+    pytest.importorskip("PyQt5.QtWidgets")
+    report = profile("apicore_editor", repeat=3, cwd=ROOT)
+    slowest = ", ".join(f"{entry.name} {entry.cumulative_ms:.1f} ms" for entry in report.slowest(5))
+    assert report.total_ms <= BUDGET_MS, f"导入 apicore_editor 用时 {report.total_ms:.1f} ms（最慢: {slowest}）"